@@ -0,0 +1,82 @@
+"""
+Compare the row-wise (.apply) and vectorized money/percent cleaning in
+otc_rb_contracts on a synthetic contract table.
+
+Cells mimic OverTheCap's formatting ('$32,700,000', '15.8%', dashes for
+missing values); an all-positions contract history is several thousand rows.
+
+    python -m benchmarks.bench_otc_clean --rows 5000 --repeat 5
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_pfr_parse import best_of
+from src.scrapers.otc_rb_contracts import (
+    _clean_money,
+    _clean_pct,
+    clean_money_series,
+    clean_pct_series,
+)
+
+MONEY_COLS = [
+    "total_value",
+    "apy",
+    "guaranteed",
+    "inflated_value",
+    "inflated_apy",
+    "inflated_guaranteed",
+]
+
+
+def synthetic_contracts(rows: int, seed: int = 0) -> pd.DataFrame:
+    """A contract table with OTC-formatted money/percent cells (~5% missing)."""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for col in MONEY_COLS:
+        values = [f"${v:,}" for v in rng.integers(500_000, 60_000_000, rows)]
+        data[col] = np.where(rng.random(rows) < 0.05, "-", values)
+    pct = [f"{v:.1f}%" for v in rng.uniform(0.1, 20.0, rows)]
+    data["apy_cap_pct"] = np.where(rng.random(rows) < 0.05, "—", pct)
+    return pd.DataFrame(data, dtype=object)
+
+
+def clean_apply(df: pd.DataFrame) -> pd.DataFrame:
+    out = df.copy()
+    for col in MONEY_COLS:
+        out[col] = out[col].apply(_clean_money)
+    out["apy_cap_pct"] = out["apy_cap_pct"].apply(_clean_pct)
+    return out
+
+
+def clean_vectorized(df: pd.DataFrame) -> pd.DataFrame:
+    out = df.copy()
+    for col in MONEY_COLS:
+        out[col] = clean_money_series(out[col])
+    out["apy_cap_pct"] = clean_pct_series(out["apy_cap_pct"])
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    df = synthetic_contracts(args.rows)
+    pd.testing.assert_frame_equal(
+        clean_apply(df).astype(float), clean_vectorized(df), check_dtype=False
+    )
+
+    slow = best_of(lambda: clean_apply(df), args.repeat)
+    fast = best_of(lambda: clean_vectorized(df), args.repeat)
+    print(
+        f"{args.rows} rows: apply {slow * 1000:.1f} ms, vectorized {fast * 1000:.1f} ms "
+        f"({slow / fast:.1f}x faster)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Compare the BeautifulSoup and lxml paths of pfr_rushing.parse_rushing_table
+on the saved PFR pages in tests/fixtures/pfr.
+
+Each fixture's player rows are repeated to reach a realistic table size
+(a full season is ~350 rows) and the page is padded with unrelated markup,
+as real PFR pages carry many other tables and scripts.
+
+    python -m benchmarks.bench_pfr_parse --rows 350 --repeat 5
+"""
+
+import argparse
+import glob
+import os
+import re
+import time
+
+from src.scrapers.pfr_rushing import parse_rushing_table
+
+FIXTURE_DIR = os.path.join("tests", "fixtures", "pfr")
+
+ROW_RE = re.compile(r"<tr><th scope=\"row\".*?</tr>\n", re.S)
+FILLER = '<div class="filler"><p>Lorem <b>ipsum</b> dolor sit amet.</p></div>\n'
+
+
+def scale_page(html: str, rows: int, filler: int = 2000) -> str:
+    """Repeat the fixture's player rows up to `rows` and pad the page."""
+    found = ROW_RE.findall(html)
+    body = "".join(found[i % len(found)] for i in range(rows))
+    first = html.index(found[0])
+    last = html.index(found[-1]) + len(found[-1])
+    return html[:first] + body + html[last:] + FILLER * filler
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=350)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html"))):
+        html = scale_page(open(path, encoding="utf-8").read(), args.rows)
+        name = os.path.basename(path)
+
+        fast = best_of(lambda: parse_rushing_table(html, 0, engine="lxml"), args.repeat)
+        try:
+            slow = best_of(lambda: parse_rushing_table(html, 0), args.repeat)
+        except RuntimeError:
+            print(f"{name}: lxml {fast * 1000:.1f} ms (bs4 cannot see commented tables)")
+            continue
+        print(
+            f"{name}: bs4 {slow * 1000:.1f} ms, lxml {fast * 1000:.1f} ms "
+            f"({slow / fast:.1f}x faster)"
+        )
+
+
+if __name__ == "__main__":
+    main()
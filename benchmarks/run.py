@@ -0,0 +1,294 @@
+"""
+Benchmark the fetch/parse/load/merge/filter hot paths on synthetic inputs.
+
+Every benchmark builds its input at 1x, 10x and 100x the size of the real
+data (32 teams x 24 seasons of ESPN files, ~350 PFR rows per season, ~600
+OTC RB contracts, ~8,400 rushing rows, ~1,500 RB70 rows), times the call
+(best of --repeat) and appends the run to a JSON history. A result slower
+than --threshold times the median of the last --window runs of the same
+benchmark and scale is flagged as a regression.
+
+    python -m benchmarks.run
+    python -m benchmarks.run --scales 1,10 --only parse --repeat 3
+    python -m benchmarks.run --fail-on-regression      # exit 1 on regression
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_otc_clean import synthetic_contracts
+from benchmarks.bench_pfr_parse import FIXTURE_DIR, best_of, scale_page
+
+HISTORY_FILE = os.path.join("benchmarks", "history.json")
+
+# Rough size of the real inputs (the 1x scale).
+TEAMS = 32
+SEASONS = 24
+PFR_ROWS = 350
+OTC_ROWS = 600
+RUSHING_ROWS = SEASONS * PFR_ROWS
+RB70_ROWS = 1500
+
+# A benchmark gets (scale, scratch dir) and returns the call to time.
+Setup = Callable[[int, str], Callable[[], Any]]
+
+
+def _names(n: int, rng: np.random.Generator) -> np.ndarray:
+    """n player names drawn from a pool of n / 4 distinct players."""
+    pool = np.array([f"Player{i} Back{i % 97}" for i in range(max(1, n // 4))], dtype=object)
+    return rng.choice(pool, n)
+
+
+def synthetic_rushing(rows: int, seed: int = 0) -> pd.DataFrame:
+    """A combined rushing table shaped like rushing_cleaned.csv."""
+    rng = np.random.default_rng(seed)
+    att = rng.integers(1, 380, rows)
+    yds = (att * rng.uniform(2.5, 6.0, rows)).astype(int)
+    return pd.DataFrame(
+        {
+            "Player": _names(rows, rng),
+            "Team": rng.choice(["DAL", "NYG", "PHI", "WAS", "SF", "KC"], rows),
+            "Pos": rng.choice(["RB", "RB", "RB", "WR", "QB", "FB"], rows),
+            "Age": rng.integers(21, 35, rows),
+            "G": rng.integers(1, 18, rows),
+            "GS": rng.integers(0, 18, rows),
+            "rAtt": att,
+            "rYds": yds,
+            "rTD": rng.integers(0, 20, rows),
+            "r1D": rng.integers(0, 100, rows),
+            "rLng": rng.integers(1, 90, rows),
+            "rY/A": (yds / att).round(1),
+            "rY/g": rng.uniform(0, 120, rows).round(1),
+            "Fmb": rng.integers(0, 8, rows),
+            "Year": rng.integers(2001, 2025, rows),
+        }
+    )
+
+
+def _stats_payload() -> Dict[str, Any]:
+    path = os.path.join(os.path.dirname(FIXTURE_DIR), "espn", "statistics.json")
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def bench_extract_yards(scale: int, tmp: str) -> Callable[[], Any]:
+    from src.api.espn_nfl import _extract_yards_from_stats
+
+    payloads = [_stats_payload() for _ in range(TEAMS * SEASONS * scale)]
+    return lambda: [_extract_yards_from_stats(p) for p in payloads]
+
+
+def _bench_parse(engine: str) -> Setup:
+    def setup(scale: int, tmp: str) -> Callable[[], Any]:
+        from src.scrapers.pfr_rushing import parse_rushing_table
+
+        with open(os.path.join(FIXTURE_DIR, "rushing_2023.html"), encoding="utf-8") as f:
+            html = scale_page(f.read(), PFR_ROWS * scale)
+        return lambda: parse_rushing_table(html, 2023, engine=engine)
+
+    return setup
+
+
+def bench_otc_parse(scale: int, tmp: str) -> Callable[[], Any]:
+    from src.scrapers.otc_rb_contracts import parse_otc_contracts_html
+
+    df = synthetic_contracts(OTC_ROWS * scale)
+    rng = np.random.default_rng(1)
+    df.insert(0, "Player", _names(len(df), rng))
+    df.insert(1, "Team", "Cowboys")
+    df.insert(2, "Year Signed", rng.integers(2005, 2025, len(df)))
+    df.insert(3, "Years", rng.integers(1, 6, len(df)))
+    html = df.rename(
+        columns={
+            "total_value": "Value",
+            "apy": "APY",
+            "guaranteed": "Guaranteed",
+            "apy_cap_pct": "APY as % Of Cap At Signing",
+            "inflated_value": "Inflated Value",
+            "inflated_apy": "Inflated APY",
+            "inflated_guaranteed": "Inflated Guaranteed",
+        }
+    ).to_html(index=False)
+    return lambda: parse_otc_contracts_html(html)
+
+
+def bench_load_espn(scale: int, tmp: str) -> Callable[[], Any]:
+    from src.analysis.espn_team_data import load_all_espn_team_stats
+
+    rng = np.random.default_rng(2)
+    for i in range(SEASONS * scale):
+        season = 1000 + i
+        teams = [
+            {
+                "id": str(t),
+                "name": f"Team {t}",
+                "abbrev": f"T{t}",
+                "season": season,
+                "record": {"wins": int(w), "losses": 17 - int(w)},
+                "stats": {
+                    "offense_rushing_yards": float(rng.integers(1200, 3000)),
+                    "offense_passing_yards": float(rng.integers(2500, 5000)),
+                },
+            }
+            for t, w in zip(range(1, TEAMS + 1), rng.integers(0, 18, TEAMS))
+        ]
+        path = os.path.join(tmp, f"espn_team_stats_{season}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(teams, f)
+    return lambda: load_all_espn_team_stats(data_dir=tmp, use_cache=False)
+
+
+def bench_load_rushing(scale: int, tmp: str) -> Callable[[], Any]:
+    from src.analysis.rushing_data import HISTORICAL_FILE, R2024_FILE, load_all_rushing
+
+    df = synthetic_rushing(RUSHING_ROWS * scale)
+    last = df["Year"] == 2024
+    df[~last].to_csv(os.path.join(tmp, os.path.basename(HISTORICAL_FILE)), index=False)
+    df[last].to_csv(os.path.join(tmp, os.path.basename(R2024_FILE)), index=False)
+    return lambda: load_all_rushing(data_dir=tmp, use_cache=False)
+
+
+def bench_filter_rb70(scale: int, tmp: str) -> Callable[[], Any]:
+    from prep_rushing_all import filter_rb_70_plus
+
+    df = synthetic_rushing(RUSHING_ROWS * scale)
+    return lambda: filter_rb_70_plus(df)
+
+
+def bench_merge_final(scale: int, tmp: str) -> Callable[[], Any]:
+    from prep_final_merge import merge_final
+
+    rb70 = synthetic_rushing(RB70_ROWS * scale, seed=3)
+    otc = synthetic_contracts(OTC_ROWS * scale)
+    rng = np.random.default_rng(4)
+    otc.insert(0, "player", rng.choice(rb70["Player"].unique(), len(otc)))
+    otc["year_signed"] = rng.integers(2005, 2025, len(otc))
+    otc["years"] = rng.integers(1, 6, len(otc))
+    return lambda: merge_final(rb70, otc)
+
+
+BENCHMARKS: Dict[str, Setup] = {
+    "fetch.extract_yards_from_stats": bench_extract_yards,
+    "parse.rushing_table_bs4": _bench_parse("bs4"),
+    "parse.rushing_table_lxml": _bench_parse("lxml"),
+    "parse.otc_contracts": bench_otc_parse,
+    "load.espn_team_stats": bench_load_espn,
+    "load.rushing": bench_load_rushing,
+    "filter.rb_70_plus": bench_filter_rb70,
+    "merge.final": bench_merge_final,
+}
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path: str) -> List[Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def find_regressions(
+    history: List[Dict[str, Any]],
+    results: Dict[str, float],
+    threshold: float = 1.25,
+    window: int = 5,
+) -> Dict[str, Dict[str, float]]:
+    """
+    {key: {"seconds", "baseline", "ratio"}} for each result slower than
+    `threshold` x the median of its last `window` recorded runs.
+    """
+    flagged: Dict[str, Dict[str, float]] = {}
+    for key, seconds in results.items():
+        past = [run["results"][key] for run in history if key in run.get("results", {})]
+        if not past:
+            continue
+        baseline = statistics.median(past[-window:])
+        if baseline > 0 and seconds > threshold * baseline:
+            flagged[key] = {"seconds": seconds, "baseline": baseline, "ratio": seconds / baseline}
+    return flagged
+
+
+def run_benchmarks(
+    names: List[str], scales: List[int], repeat: int = 5
+) -> Dict[str, float]:
+    """Best-of-`repeat` seconds for each "<name>@<scale>x"."""
+    results: Dict[str, float] = {}
+    for name in names:
+        for scale in scales:
+            with tempfile.TemporaryDirectory() as tmp:
+                fn = BENCHMARKS[name](scale, tmp)
+                key = f"{name}@{scale}x"
+                results[key] = best_of(fn, repeat)
+            print(f"{key:<42} {results[key] * 1000:10.2f} ms")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", default="1,10,100", help="Comma-separated size multipliers")
+    parser.add_argument("--only", default="", help="Run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--history", default=HISTORY_FILE, help="JSON history file")
+    parser.add_argument("--no-save", action="store_true", help="Do not append to the history")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Regression ratio")
+    parser.add_argument("--window", type=int, default=5, help="Past runs in the baseline")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    names = [n for n in BENCHMARKS if args.only in n]
+    scales = [int(s) for s in args.scales.split(",") if s.strip()]
+    if not names:
+        parser.error(f"No benchmark matches {args.only!r}")
+
+    results = run_benchmarks(names, scales, args.repeat)
+
+    history = load_history(args.history)
+    regressions = find_regressions(history, results, args.threshold, args.window)
+    for key, r in regressions.items():
+        print(
+            f"[WARN] Regression {key}: {r['seconds'] * 1000:.2f} ms vs "
+            f"{r['baseline'] * 1000:.2f} ms baseline ({r['ratio']:.2f}x)"
+        )
+
+    if not args.no_save:
+        history.append(
+            {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "commit": _git_commit(),
+                "python": platform.python_version(),
+                "pandas": pd.__version__,
+                "repeat": args.repeat,
+                "results": results,
+            }
+        )
+        os.makedirs(os.path.dirname(os.path.abspath(args.history)), exist_ok=True)
+        with open(args.history, "w", encoding="utf-8") as f:
+            json.dump(history, f, indent=2)
+        print(f"Appended run to {args.history}")
+
+    if regressions and args.fail_on_regression:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,11 @@
+import argparse
 import os
+from typing import Optional
+
 import pandas as pd
 
+from src.analysis.names import NameIndex, normalize_names
+
 DATA_DIR = "data"
 
 RB70_FILE = os.path.join(DATA_DIR, "rb70_stats_with_contract.csv")
@@ -9,27 +14,26 @@ OTC_FILE = os.path.join(DATA_DIR, "otc_rb_contracts_rb70.csv")
 OUT_FINAL = os.path.join(DATA_DIR, "rb_analysis_master.csv")
 
 
-def normalize_name(s: str) -> str:
-    """Make player names lowercase stripped strings."""
-    if s is None:
-        return ""
-    return str(s).strip().lower()
-
-
-def load_rb70():
-    df = pd.read_csv(RB70_FILE)
+def load_rb70(df: Optional[pd.DataFrame] = None):
+    if df is None:
+        df = pd.read_csv(RB70_FILE)
+    else:
+        df = df.copy()
     df.columns = [c.strip() for c in df.columns]
 
     if "Player" not in df.columns:
         raise KeyError("The RB70 dataset must contain a 'Player' column.")
 
-    df["player_norm"] = df["Player"].apply(normalize_name)
+    df["player_norm"] = normalize_names(df["Player"])
 
     return df
 
 
-def load_otc():
-    df = pd.read_csv(OTC_FILE)
+def load_otc(df: Optional[pd.DataFrame] = None):
+    if df is None:
+        df = pd.read_csv(OTC_FILE)
+    else:
+        df = df.copy()
     df.columns = [c.strip() for c in df.columns]
 
     candidate = [c for c in df.columns if c.lower() == "player"]
@@ -37,7 +41,11 @@ def load_otc():
         raise KeyError("The OTC file must contain a 'Player' column.")
     player_col = candidate[0]
 
-    df["player_norm"] = df[player_col].apply(normalize_name)
+    # Rows tagged by the fuzzy OTC filter join on the matched PFR name.
+    if "pfr_player" in df.columns:
+        df["player_norm"] = normalize_names(df["pfr_player"].fillna(df[player_col]))
+    else:
+        df["player_norm"] = normalize_names(df[player_col])
 
     money_cols = ["apy", "guaranteed", "total_value"]
     for c in money_cols:
@@ -47,24 +55,111 @@ def load_otc():
     return df
 
 
-def merge_final():
-    df_rb = load_rb70()
-    df_otc = load_otc()
-
-    merged = df_rb.merge(
-        df_otc,
-        how="left",
-        on="player_norm",
-        suffixes=("", "_contract")
+def assign_contracts(df_rb: pd.DataFrame, df_otc: pd.DataFrame, key: str = "player_id"):
+    """
+    Attach to each player-season the contract in force that year: the
+    latest one with year_signed <= Year < year_signed + years (a missing
+    `years` is treated as open-ended). Done as sorted as-of joins per
+    player: seasons whose latest-signed contract has expired are joined
+    again against the contracts signed before it, so an earlier contract
+    still running (e.g. under a short extension) is found. The result has
+    exactly one row per row of df_rb, in the original order; seasons with
+    no contract in force get NA contract columns.
+    """
+    rb = df_rb.reset_index(drop=True)
+    rb["_row"] = range(len(rb))
+
+    usable = rb[key].notna() & rb["Year"].notna()
+    left = rb[usable].copy()
+    left["_year"] = left["Year"].astype("int64")
+    left_cols = list(left.columns)
+
+    right = df_otc[df_otc[key].notna() & df_otc["year_signed"].notna()].copy()
+    right["_signed"] = right["year_signed"].astype("int64")
+    # Private copy of the term: df_rb may have its own `years` column, which
+    # would shadow the contract's after the merge.
+    right["_term"] = right["years"] if "years" in right.columns else pd.NA
+    right = right.sort_values("_signed", kind="stable")
+
+    done = []
+    pending = left.assign(_cap=left["_year"])
+    while True:
+        matched = pd.merge_asof(
+            pending.sort_values("_cap", kind="stable"),
+            right,
+            left_on="_cap",
+            right_on="_signed",
+            by=key,
+            direction="backward",
+            suffixes=("", "_contract"),
+        )
+        term = pd.to_numeric(matched["_term"], errors="coerce")
+        expired = (matched["_year"] >= matched["_signed"] + term).fillna(False).astype(bool)
+        done.append(matched[~expired])
+        # Retry expired matches against contracts signed before the expired one.
+        pending = matched.loc[expired, left_cols].assign(
+            _cap=matched.loc[expired, "_signed"].astype("int64") - 1
+        )
+        if pending.empty:
+            break
+
+    matched = pd.concat(done, ignore_index=True)
+    out = pd.concat([matched, rb[~usable]], ignore_index=True)
+    out = out.sort_values("_row", kind="stable").drop(
+        columns=["_row", "_year", "_cap", "_signed", "_term"]
     )
-
-    merged.drop(columns=["player_norm"], inplace=True, errors="ignore")
+    return out.reset_index(drop=True)
+
+
+def merge_final(
+    rb70: Optional[pd.DataFrame] = None,
+    otc: Optional[pd.DataFrame] = None,
+    index: Optional[NameIndex] = None,
+    by_season: bool = False,
+):
+    """
+    Left-join contracts onto RB70 rows by player_id (see src.analysis.names).
+    Inputs default to the CSVs on disk; pass `index` to reuse one built
+    earlier (e.g. by filter_otc_for_rb70).
+
+    By default every contract of a player is joined to every season of that
+    player. With `by_season`, each season only gets the contract in force
+    that year (assign_contracts), so the output has one row per RB70 row.
+    """
+    df_rb = load_rb70(rb70)
+    df_otc = load_otc(otc)
+
+    if index is None:
+        index = NameIndex(df_rb["player_norm"])
+    df_rb["player_id"] = index.ids_for_keys(df_rb["player_norm"])
+    df_otc["player_id"] = index.ids_for_keys(df_otc["player_norm"])
+    df_otc = df_otc[df_otc["player_id"].notna()].drop(columns=["player_norm"])
+
+    if by_season:
+        merged = assign_contracts(df_rb, df_otc)
+    else:
+        merged = df_rb.merge(
+            df_otc,
+            how="left",
+            on="player_id",
+            suffixes=("", "_contract")
+        )
+
+    merged.drop(columns=["player_norm", "player_id"], inplace=True, errors="ignore")
 
     return merged
 
 
 def main():
-    merged = merge_final()
+    parser = argparse.ArgumentParser(description="Merge RB70 stats with OTC contracts.")
+    parser.add_argument(
+        "--by-season",
+        action="store_true",
+        help="Join each player-season only to the contract in force that year",
+    )
+    args = parser.parse_args()
+
+    merged = merge_final(by_season=args.by_season)
     print(f"Final merged shape: {merged.shape}")
 
     merged.to_csv(OUT_FINAL, index=False)
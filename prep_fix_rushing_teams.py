@@ -1,6 +1,10 @@
+import argparse
 import os
 import pandas as pd
 
+from prep_rushing_all import stream_rb_70_plus
+from src.analysis.names import normalize_names
+
 DATA_DIR = "data"
 
 HIST = os.path.join(DATA_DIR, "rushing_cleaned.csv")
@@ -9,12 +13,6 @@ OUT_RB70 = os.path.join(DATA_DIR, "rb_rushing_2001_2024_rb70.csv")
 OUT_NAMES = os.path.join(DATA_DIR, "rb_rushing_2001_2024_rb70_names.csv")
 
 
-def normalize_name(s: str) -> str:
-    if s is None:
-        return ""
-    return str(s).strip().lower()
-
-
 def detect_attempts_column(df):
     """Return which column stores rushing attempts."""
     for c in ["rAtt", "Att", "ATT"]:
@@ -23,9 +21,9 @@ def detect_attempts_column(df):
     raise KeyError("No rushing attempts column found (rAtt or Att).")
 
 
-def load_and_combine():
-    df_hist = pd.read_csv(HIST)
-    df_2024 = pd.read_csv(R2024)
+def load_and_combine(df_hist=None, df_2024=None):
+    df_hist = pd.read_csv(HIST) if df_hist is None else df_hist.copy()
+    df_2024 = pd.read_csv(R2024) if df_2024 is None else df_2024.copy()
 
     for df in (df_hist, df_2024):
         df.drop(columns=[c for c in df.columns if c.startswith("Unnamed")], inplace=True)
@@ -38,7 +36,7 @@ def load_and_combine():
 
     df = pd.concat([df_hist, df_2024], ignore_index=True)
 
-    df["player_norm"] = df["Player"].apply(normalize_name)
+    df["player_norm"] = normalize_names(df["Player"])
     df["Team"] = df["Team"].astype(str).str.upper().str.strip()
 
     df["Year"] = pd.to_numeric(df["Year"], errors="coerce").astype("Int64")
@@ -66,7 +64,49 @@ def filter_rb70(df):
     return df, names
 
 
+def normalize_chunk(df):
+    """Per-chunk version of the cleanup in load_and_combine."""
+    df = df.copy()
+    df["player_norm"] = normalize_names(df["Player"])
+    df["Team"] = df["Team"].astype(str).str.upper().str.strip()
+    df["Year"] = pd.to_numeric(df["Year"], errors="coerce").astype("Int64")
+    return df
+
+
+def stream_rb70(chunksize=50_000):
+    """Chunked load_and_combine + filter_rb70 with bounded memory."""
+    for path, label in ((HIST, "rushing_cleaned.csv"), (R2024, "rb_rushing_2024.csv")):
+        if "Team" not in [c.strip() for c in pd.read_csv(path, nrows=0).columns]:
+            raise KeyError(f"Team column missing from {label}")
+
+    return stream_rb_70_plus(
+        sources=(HIST, R2024),
+        out_filtered=OUT_RB70,
+        out_names=OUT_NAMES,
+        chunksize=chunksize,
+        transform=normalize_chunk,
+    )
+
+
 def main():
+    parser = argparse.ArgumentParser(
+        description="Combine rushing data with normalized teams and filter to RB70."
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Process the CSVs in chunks with bounded memory",
+    )
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    args = parser.parse_args()
+
+    if args.stream:
+        print("Streaming rushing datasets through the RB70 filter...")
+        n_rows, n_names = stream_rb70(args.chunksize)
+        print(f"Saved RB70 dataset: {OUT_RB70} ({n_rows} rows)")
+        print(f"Saved RB70 names list: {OUT_NAMES} ({n_names} rows)")
+        return
+
     print("Loading rushing datasets...")
     df = load_and_combine()
     print(f"Combined shape: {df.shape}")
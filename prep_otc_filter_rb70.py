@@ -1,65 +1,163 @@
+import argparse
 import os
-from typing import Set
+from typing import Optional, Set
 
 import pandas as pd
 
+from src.analysis.name_match import match_names
+from src.analysis.names import NameIndex, normalize_names
+
 DATA_DIR = "data"
 
 NAMES_FILE = os.path.join(DATA_DIR, "rb_rushing_2001_2024_rb70_names.csv")
 OTC_RAW_FILE = os.path.join(DATA_DIR, "otc_rb_contracts_raw.csv")
 
 OTC_FILTERED_FILE = os.path.join(DATA_DIR, "otc_rb_contracts_rb70.csv")
+OTC_MATCHES_FILE = os.path.join(DATA_DIR, "otc_pfr_name_matches.csv")
+
 
+def _load_names_df(df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    if df is None:
+        if not os.path.exists(NAMES_FILE):
+            raise FileNotFoundError(f"Missing {NAMES_FILE}")
+        df = pd.read_csv(NAMES_FILE)
+    return df
 
-def _normalize_name(s: str) -> str:
-    if s is None:
-        return ""
-    return str(s).strip().lower()
 
+def _player_column(df: pd.DataFrame) -> str:
+    candidate_cols = [c for c in df.columns if c.lower() == "player"]
+    if not candidate_cols:
+        raise KeyError("Could not find a 'player' column in OverTheCap data.")
+    return candidate_cols[0]
 
-def load_rb70_name_set() -> Set[str]:
-    if not os.path.exists(NAMES_FILE):
-        raise FileNotFoundError(f"Missing {NAMES_FILE}")
 
-    df = pd.read_csv(NAMES_FILE)
+def load_rb70_name_set(df: Optional[pd.DataFrame] = None) -> Set[str]:
+    df = _load_names_df(df)
+
     if "Player" not in df.columns:
         raise KeyError(f"'Player' column not found in {NAMES_FILE}")
 
-    names = {_normalize_name(p) for p in df["Player"].dropna().unique()}
+    names = set(normalize_names(pd.Series(df["Player"].dropna().unique())))
     print(f"Loaded {len(names)} unique RB names from {NAMES_FILE}")
     return names
 
 
-def filter_otc_for_rb70() -> pd.DataFrame:
-    if not os.path.exists(OTC_RAW_FILE):
-        raise FileNotFoundError(f"Missing {OTC_RAW_FILE}")
-
-    names = load_rb70_name_set()
-
-    df = pd.read_csv(OTC_RAW_FILE)
-
-    candidate_cols = [c for c in df.columns if c.lower() == "player"]
-    if not candidate_cols:
-        raise KeyError("Could not find a 'player' column in OverTheCap data.")
-    player_col = candidate_cols[0]
-
-    df["player_norm"] = df[player_col].apply(_normalize_name)
+def filter_otc_for_rb70(
+    names_df: Optional[pd.DataFrame] = None,
+    otc_df: Optional[pd.DataFrame] = None,
+    index: Optional[NameIndex] = None,
+    matches: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
+    """
+    Keep OverTheCap contracts for players in the RB70 names list. Both
+    inputs are read from disk unless passed in; `index` (a NameIndex over
+    the RB70 names) replaces the names list if given.
+
+    With `matches` (from match_otc_to_rb70), fuzzy-matched players are kept
+    too, and a `pfr_player` column holds the matched PFR name so that
+    merge_final can join on it. Matches are applied per (name, year_signed),
+    so a contract outside the season window of a same-name player is dropped.
+    """
+    if otc_df is None:
+        if not os.path.exists(OTC_RAW_FILE):
+            raise FileNotFoundError(f"Missing {OTC_RAW_FILE}")
+        otc_df = pd.read_csv(OTC_RAW_FILE)
+
+    if matches is not None:
+        df = otc_df.copy()
+        keys = normalize_names(df[_player_column(df)])
+        by_year = (
+            "query_year" in matches.columns
+            and "year_signed" in df.columns
+            and bool(matches["query_year"].notna().any())
+        )
+        if by_year:
+            years = pd.to_numeric(df["year_signed"], errors="coerce")
+            match_years = pd.to_numeric(matches["query_year"], errors="coerce")
+            # NaN != NaN, so contracts without a year are looked up by name
+            # alone, among the matches made without a year.
+            dated = match_years.notna()
+            to_ref = dict(
+                zip(
+                    zip(matches["query_key"][dated], match_years[dated].astype("int64")),
+                    matches["ref_name"][dated],
+                )
+            )
+            undated = dict(zip(matches["query_key"][~dated], matches["ref_name"][~dated]))
+            df["pfr_player"] = [
+                to_ref.get((k, int(y))) if pd.notna(y) else undated.get(k)
+                for k, y in zip(keys, years)
+            ]
+        else:
+            to_ref = dict(zip(matches["query_key"], matches["ref_name"]))
+            df["pfr_player"] = keys.map(to_ref)
+        df_filtered = df[df["pfr_player"].notna()].copy()
+        print(f"Filtered OverTheCap contracts (fuzzy): {len(df)} -> {len(df_filtered)} rows")
+        return df_filtered
+
+    if index is None:
+        index = NameIndex(load_rb70_name_set(names_df))
+
+    df = otc_df.copy()
+    player_col = _player_column(df)
 
     before = len(df)
-    df_filtered = df[df["player_norm"].isin(names)].copy()
+    df_filtered = df[index.ids(df[player_col]).notna()].copy()
     after = len(df_filtered)
 
     print(f"Filtered OverTheCap contracts: {before} -> {after} rows")
 
-    df_filtered.drop(columns=["player_norm"], inplace=True)
-
     return df_filtered
 
 
+def match_otc_to_rb70(
+    names_df: Optional[pd.DataFrame] = None,
+    otc_df: Optional[pd.DataFrame] = None,
+    window: int = 3,
+    threshold: float = 0.5,
+) -> pd.DataFrame:
+    """
+    Fuzzy OTC -> PFR name match table (see src.analysis.name_match),
+    blocked by last-name prefix and by contract year vs. RB70 seasons.
+    """
+    names_df = _load_names_df(names_df)
+    if otc_df is None:
+        otc_df = pd.read_csv(OTC_RAW_FILE)
+
+    year_col = "year_signed" if "year_signed" in otc_df.columns else None
+    return match_names(
+        otc_df,
+        names_df,
+        query_name=_player_column(otc_df),
+        ref_name="Player",
+        query_year=year_col,
+        ref_year="Year" if "Year" in names_df.columns else None,
+        window=window,
+        threshold=threshold,
+    )
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Filter OverTheCap contracts to RB70 players.")
+    parser.add_argument(
+        "--fuzzy",
+        action="store_true",
+        help=f"Also keep near-miss name matches; writes the match table to {OTC_MATCHES_FILE}",
+    )
+    parser.add_argument("--threshold", type=float, default=0.5, help="Min trigram similarity")
+    parser.add_argument("--window", type=int, default=3, help="Season window (years)")
+    args = parser.parse_args()
+
     os.makedirs(DATA_DIR, exist_ok=True)
 
-    df_filtered = filter_otc_for_rb70()
+    matches = None
+    if args.fuzzy:
+        matches = match_otc_to_rb70(window=args.window, threshold=args.threshold)
+        matches.to_csv(OTC_MATCHES_FILE, index=False)
+        n_fuzzy = int((~matches["exact"]).sum())
+        print(f"Saved {len(matches)} name matches ({n_fuzzy} fuzzy) to {OTC_MATCHES_FILE}")
+
+    df_filtered = filter_otc_for_rb70(matches=matches)
     df_filtered.to_csv(OTC_FILTERED_FILE, index=False)
     print(f"Saved filtered RB70 contracts to {OTC_FILTERED_FILE}")
 
@@ -1,36 +1,15 @@
 import os
 import pandas as pd
 
+from src.scrapers.pfr_rushing import normalize_rushing_export
+
 RAW_PATH = "data/rb_rushing_2024_raw.csv"
 OUT_PATH = "data/rb_rushing_2024.csv"
 
 
-def main():
-    if not os.path.exists(RAW_PATH):
-        raise FileNotFoundError(
-            f"Expected raw 2024 file at {RAW_PATH}. "
-            "Make sure you saved your pasted table there."
-        )
-
-    df = pd.read_csv(RAW_PATH)
-
-    df = df.dropna(subset=["Player"])
-    df = df[df["Player"] != "Player"]
-    df = df[df["Rk"].astype(str) != "Rk"]
-
-    df = df.rename(
-        columns={
-            "Att": "rAtt",
-            "Yds": "rYds",
-            "TD": "rTD",
-            "1D": "r1D",
-            "Lng": "rLng",
-            "Y/A": "rY/A",
-            "Y/G": "rY/g",
-        }
-    )
-
-    df["Year"] = 2024
+def normalize_2024(df: pd.DataFrame) -> pd.DataFrame:
+    """Clean the pasted PFR 2024 table into the rushing_cleaned.csv schema."""
+    df = normalize_rushing_export(df, 2024)
     cols = [
         "Player",
         "Age",
@@ -46,7 +25,17 @@ def main():
         "Fmb",
         "Year",
     ]
-    df = df[cols]
+    return df[cols]
+
+
+def main():
+    if not os.path.exists(RAW_PATH):
+        raise FileNotFoundError(
+            f"Expected raw 2024 file at {RAW_PATH}. "
+            "Make sure you saved your pasted table there."
+        )
+
+    df = normalize_2024(pd.read_csv(RAW_PATH))
 
     os.makedirs("data", exist_ok=True)
     df.to_csv(OUT_PATH, index=False)
@@ -1,8 +1,17 @@
+import argparse
 import os
-from typing import Tuple
+from contextlib import ExitStack
+from typing import Callable, List, Optional, Sequence, Tuple
 
 import pandas as pd
 
+from src.analysis.rushing_data import (
+    apply_rushing_schema,
+    concat_rushing,
+    iter_rushing_csv,
+    read_rushing_csv,
+)
+
 DATA_DIR = "data"
 HISTORICAL_FILE = os.path.join(DATA_DIR, "rushing_cleaned.csv")   # 2001–2023
 R2024_FILE = os.path.join(DATA_DIR, "rb_rushing_2024.csv")        # 2024
@@ -12,14 +21,6 @@ OUT_FILTERED = os.path.join(DATA_DIR, "rb_rushing_2001_2024_rb70.csv")
 OUT_NAMES = os.path.join(DATA_DIR, "rb_rushing_2001_2024_rb70_names.csv")
 
 
-def _load_csv(path: str) -> pd.DataFrame:
-    """Load a CSV and drop any Unnamed index columns."""
-    df = pd.read_csv(path)
-    df = df.loc[:, ~df.columns.str.startswith("Unnamed")]
-    df.columns = [c.strip() for c in df.columns]  # strip spaces
-    return df
-
-
 def _detect_attempts_column(df: pd.DataFrame) -> str:
     """
     Detect the rushing attempts column name.
@@ -32,34 +33,41 @@ def _detect_attempts_column(df: pd.DataFrame) -> str:
     raise KeyError("Could not find a rushing attempts column ('rAtt' or 'Att').")
 
 
-def load_and_merge_rushing() -> pd.DataFrame:
+def load_and_merge_rushing(
+    df_hist: Optional[pd.DataFrame] = None, df_2024: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
     """
     Load rushing_cleaned.csv (2001–2023) and rb_rushing_2024.csv,
-    merge into a single DataFrame, and standardize basic types.
+    merge into a single DataFrame, and standardize basic types
+    (RUSHING_SCHEMA dtypes, applied while parsing).
+
+    Either table can be passed in already loaded (e.g. by run_pipeline.py)
+    instead of being read from disk.
     """
-    if not os.path.exists(HISTORICAL_FILE):
-        raise FileNotFoundError(f"Missing {HISTORICAL_FILE}")
-    if not os.path.exists(R2024_FILE):
-        raise FileNotFoundError(f"Missing {R2024_FILE}")
+    if df_hist is None:
+        if not os.path.exists(HISTORICAL_FILE):
+            raise FileNotFoundError(f"Missing {HISTORICAL_FILE}")
+        df_hist = read_rushing_csv(HISTORICAL_FILE)
+    else:
+        df_hist = apply_rushing_schema(df_hist.copy())
 
-    df_hist = _load_csv(HISTORICAL_FILE)
-    df_2024 = _load_csv(R2024_FILE)
+    if df_2024 is None:
+        if not os.path.exists(R2024_FILE):
+            raise FileNotFoundError(f"Missing {R2024_FILE}")
+        df_2024 = read_rushing_csv(R2024_FILE)
+    else:
+        df_2024 = apply_rushing_schema(df_2024.copy())
 
     # Concatenate
-    full = pd.concat([df_hist, df_2024], ignore_index=True)
+    return concat_rushing([df_hist, df_2024])
 
-    # Ensure Year is numeric
-    if "Year" in full.columns:
-        full["Year"] = pd.to_numeric(full["Year"], errors="coerce").astype("Int64")
 
-    # Standardize obvious numeric columns if present
-    numeric_cols = ["Age", "G", "GS", "rAtt", "Att",
-                    "rYds", "rTD", "r1D", "rLng", "rY/A", "rY/g", "Fmb"]
-    for col in numeric_cols:
-        if col in full.columns:
-            full[col] = pd.to_numeric(full[col], errors="coerce")
-
-    return full
+def _rb70_mask(df: pd.DataFrame, att_col: str) -> pd.Series:
+    """RBs (if a Pos column exists) with >= 70 rushing attempts."""
+    mask = (df[att_col] >= 70).fillna(False)
+    if "Pos" in df.columns:
+        mask &= (df["Pos"] == "RB").fillna(False)
+    return mask.astype(bool)
 
 
 def filter_rb_70_plus(full: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
@@ -70,15 +78,8 @@ def filter_rb_70_plus(full: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
 
     If 'Pos' is not present, we assume the dataset is already RB-only.
     """
-    df = full.copy()
-
-    # Filter by position if available
-    if "Pos" in df.columns:
-        df = df[df["Pos"] == "RB"]
-
-    # Filter by attempts (>= 70)
-    att_col = _detect_attempts_column(df)
-    df = df[df[att_col] >= 70]
+    # Boolean indexing already returns a new frame; no need to copy `full`.
+    df = full[_rb70_mask(full, _detect_attempts_column(full))]
 
     # Build names list for OverTheCap (Player + Year)
     if "Year" in df.columns:
@@ -102,9 +103,95 @@ def filter_rb_70_plus(full: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
     return df, names_df
 
 
+def stream_rb_70_plus(
+    sources: Sequence[str] = (HISTORICAL_FILE, R2024_FILE),
+    out_filtered: str = OUT_FILTERED,
+    out_names: str = OUT_NAMES,
+    out_full: Optional[str] = None,
+    chunksize: int = 50_000,
+    transform: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+) -> Tuple[int, int]:
+    """
+    Streaming version of load_and_merge_rushing + filter_rb_70_plus.
+
+    Reads each source in chunks, applies the Pos == "RB" and >= 70 attempts
+    predicates per chunk and appends matches to `out_filtered` as it goes;
+    only the (Player, Year) names set is held until the end. Every chunk is
+    aligned to the union of the source headers, so the output matches the
+    in-memory concat. `transform` (if given) runs on each chunk before
+    filtering. Returns (filtered rows, names rows).
+    """
+    for path in sources:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Missing {path}")
+
+    columns: List[str] = []
+    for path in sources:
+        for c in pd.read_csv(path, nrows=0).columns:
+            c = c.strip()
+            if not c.startswith("Unnamed") and c not in columns:
+                columns.append(c)
+    att_col = _detect_attempts_column(pd.DataFrame(columns=columns))
+    key_cols = ["Player", "Year"] if "Year" in columns else ["Player"]
+
+    names = set()
+    n_filtered = 0
+    first = True
+
+    with ExitStack() as stack:
+        f_out = stack.enter_context(open(out_filtered, "w", newline="", encoding="utf-8"))
+        f_full = (
+            stack.enter_context(open(out_full, "w", newline="", encoding="utf-8"))
+            if out_full
+            else None
+        )
+
+        for path in sources:
+            for chunk in iter_rushing_csv(path, chunksize):
+                chunk = chunk.reindex(columns=columns)
+                if transform is not None:
+                    chunk = transform(chunk)
+
+                kept = chunk[_rb70_mask(chunk, att_col)]
+
+                if f_full is not None:
+                    chunk.to_csv(f_full, header=first, index=False)
+                kept.to_csv(f_out, header=first, index=False)
+                first = False
+                n_filtered += len(kept)
+
+                names.update(
+                    kept[key_cols].dropna().astype(object).itertuples(index=False, name=None)
+                )
+
+    names_df = pd.DataFrame(sorted(names, key=lambda t: t[::-1]), columns=key_cols)
+    names_df.to_csv(out_names, index=False)
+
+    return n_filtered, len(names_df)
+
+
 def main():
+    parser = argparse.ArgumentParser(
+        description="Combine 2001–2024 rushing data and filter to RBs with >= 70 attempts."
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Process the CSVs in chunks with bounded memory",
+    )
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    args = parser.parse_args()
+
     os.makedirs(DATA_DIR, exist_ok=True)
 
+    if args.stream:
+        print("Streaming rushing data (2001–2024) through the RB >= 70 filter...")
+        n_rows, n_names = stream_rb_70_plus(out_full=OUT_FULL, chunksize=args.chunksize)
+        print(f"Saved full merged dataset to {OUT_FULL}")
+        print(f"Saved filtered RB >=70 dataset to {OUT_FILTERED} ({n_rows} rows)")
+        print(f"Saved OverTheCap names list to {OUT_NAMES} ({n_names} rows)")
+        return
+
     print("Loading and merging rushing data (2001–2024)...")
     full = load_and_merge_rushing()
     print(f"Combined shape: {full.shape}")
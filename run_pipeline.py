@@ -0,0 +1,304 @@
+"""
+Run the prep_*.py stages as one pipeline.
+
+Stage order (by declared inputs/outputs):
+  rushing_2024  -> rushing_all (or fix_teams) -> otc_filter -> final_merge
+
+Each stage lists the files it reads and writes. A stage is skipped when
+the content hashes of its inputs and outputs match the last successful run
+(recorded in data/.pipeline_state.json). Stages whose dependencies are
+done run in parallel, and DataFrames produced during the run are handed to
+downstream stages in memory instead of being re-read from CSV. Outputs are
+still written to CSV so later runs (and the individual scripts) see them.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+import prep_final_merge
+import prep_fix_rushing_teams
+import prep_otc_filter_rb70
+import prep_rushing_2024
+import prep_rushing_all
+from src import instrument
+from src.analysis.names import NameIndex
+
+DATA_DIR = "data"
+STATE_FILE = os.path.join(DATA_DIR, ".pipeline_state.json")
+
+Frames = Dict[str, pd.DataFrame]
+
+
+@dataclass
+class Stage:
+    name: str
+    inputs: List[str]
+    outputs: List[str]
+    # Gets the in-memory frames produced earlier in this run (keyed by path;
+    # anything missing should be read from disk) and returns {path: frame}
+    # for each of `outputs`.
+    run: Callable[[Frames], Frames]
+
+
+def file_hash(path: str) -> Optional[str]:
+    if not os.path.exists(path):
+        return None
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _rushing_2024(frames: Frames) -> Frames:
+    df = prep_rushing_2024.normalize_2024(pd.read_csv(prep_rushing_2024.RAW_PATH))
+    return {prep_rushing_2024.OUT_PATH: df}
+
+
+def _rushing_all(frames: Frames) -> Frames:
+    full = prep_rushing_all.load_and_merge_rushing(
+        frames.get(prep_rushing_all.HISTORICAL_FILE),
+        frames.get(prep_rushing_all.R2024_FILE),
+    )
+    filtered, names = prep_rushing_all.filter_rb_70_plus(full)
+    return {
+        prep_rushing_all.OUT_FULL: full,
+        prep_rushing_all.OUT_FILTERED: filtered,
+        prep_rushing_all.OUT_NAMES: names,
+    }
+
+
+def _fix_teams(frames: Frames) -> Frames:
+    df = prep_fix_rushing_teams.load_and_combine(
+        frames.get(prep_fix_rushing_teams.HIST),
+        frames.get(prep_fix_rushing_teams.R2024),
+    )
+    rb70, names = prep_fix_rushing_teams.filter_rb70(df)
+    return {
+        prep_fix_rushing_teams.OUT_RB70: rb70,
+        prep_fix_rushing_teams.OUT_NAMES: names,
+    }
+
+
+_name_index_lock = threading.Lock()
+_name_index: Dict[str, NameIndex] = {}
+
+
+def _rb70_name_index(frames: Frames) -> NameIndex:
+    """
+    One NameIndex over the RB70 names list, shared by otc_filter and
+    final_merge. It is rebuilt only when the names file changes.
+    """
+    path = prep_otc_filter_rb70.NAMES_FILE
+    key = file_hash(path) or ""
+    with _name_index_lock:
+        if key not in _name_index:
+            names = prep_otc_filter_rb70.load_rb70_name_set(frames.get(path))
+            _name_index.clear()
+            _name_index[key] = NameIndex(names)
+        return _name_index[key]
+
+
+def _otc_filter(frames: Frames) -> Frames:
+    df = prep_otc_filter_rb70.filter_otc_for_rb70(
+        frames.get(prep_otc_filter_rb70.NAMES_FILE),
+        frames.get(prep_otc_filter_rb70.OTC_RAW_FILE),
+        index=_rb70_name_index(frames),
+    )
+    return {prep_otc_filter_rb70.OTC_FILTERED_FILE: df}
+
+
+def _final_merge(frames: Frames) -> Frames:
+    merged = prep_final_merge.merge_final(
+        frames.get(prep_final_merge.RB70_FILE),
+        frames.get(prep_final_merge.OTC_FILE),
+        index=_rb70_name_index(frames),
+    )
+    return {prep_final_merge.OUT_FINAL: merged}
+
+
+def build_stages(variant: str = "rushing-all") -> List[Stage]:
+    """The pipeline; `variant` picks prep_rushing_all or prep_fix_rushing_teams."""
+    if variant == "fix-teams":
+        rushing = Stage(
+            "fix_teams",
+            [prep_fix_rushing_teams.HIST, prep_fix_rushing_teams.R2024],
+            [prep_fix_rushing_teams.OUT_RB70, prep_fix_rushing_teams.OUT_NAMES],
+            _fix_teams,
+        )
+    else:
+        rushing = Stage(
+            "rushing_all",
+            [prep_rushing_all.HISTORICAL_FILE, prep_rushing_all.R2024_FILE],
+            [
+                prep_rushing_all.OUT_FULL,
+                prep_rushing_all.OUT_FILTERED,
+                prep_rushing_all.OUT_NAMES,
+            ],
+            _rushing_all,
+        )
+
+    return [
+        Stage(
+            "rushing_2024",
+            [prep_rushing_2024.RAW_PATH],
+            [prep_rushing_2024.OUT_PATH],
+            _rushing_2024,
+        ),
+        rushing,
+        Stage(
+            "otc_filter",
+            [prep_otc_filter_rb70.NAMES_FILE, prep_otc_filter_rb70.OTC_RAW_FILE],
+            [prep_otc_filter_rb70.OTC_FILTERED_FILE],
+            _otc_filter,
+        ),
+        Stage(
+            "final_merge",
+            [prep_final_merge.RB70_FILE, prep_final_merge.OTC_FILE],
+            [prep_final_merge.OUT_FINAL],
+            _final_merge,
+        ),
+    ]
+
+
+def _norm(path: str) -> str:
+    return os.path.normpath(path)
+
+
+def _load_state(path: str) -> Dict[str, Dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def run_pipeline(
+    stages: List[Stage],
+    jobs: int = 4,
+    force: bool = False,
+    state_file: str = STATE_FILE,
+) -> Dict[str, str]:
+    """
+    Run `stages` in dependency order; returns {stage name: "ran" | "skipped"}.
+    """
+    producer = {_norm(out): s.name for s in stages for out in s.outputs}
+    for s in stages:
+        for out in s.outputs:
+            if producer[_norm(out)] != s.name:
+                raise ValueError(f"{out} is written by more than one stage")
+
+    deps = {
+        s.name: {producer[_norm(i)] for i in s.inputs if _norm(i) in producer} - {s.name}
+        for s in stages
+    }
+    by_name = {s.name: s for s in stages}
+
+    state = _load_state(state_file)
+    memory: Frames = {}
+    status: Dict[str, str] = {}
+
+    def run_stage(stage: Stage) -> str:
+        input_hashes = {i: file_hash(i) for i in stage.inputs}
+        output_hashes = {o: file_hash(o) for o in stage.outputs}
+        prev = state.get(stage.name, {})
+
+        up_to_date = (
+            not force
+            and all(h is not None for h in output_hashes.values())
+            and prev.get("inputs") == input_hashes
+            and prev.get("outputs") == output_hashes
+        )
+        if up_to_date:
+            print(f"[{stage.name}] inputs unchanged, skipping")
+            return "skipped"
+
+        missing = [i for i, h in input_hashes.items() if h is None]
+        if missing and not force and all(h is not None for h in output_hashes.values()):
+            print(f"[{stage.name}] missing {missing}; keeping existing outputs")
+            return "skipped"
+        if missing:
+            raise FileNotFoundError(f"[{stage.name}] missing inputs: {missing}")
+
+        print(f"[{stage.name}] running...")
+        available = {i: memory[_norm(i)] for i in stage.inputs if _norm(i) in memory}
+        with instrument.stage(stage.name):
+            results = stage.run(available)
+
+            for out in stage.outputs:
+                df = results[out]
+                os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+                with instrument.stage(f"write {os.path.basename(out)}"):
+                    df.to_csv(out, index=False)
+                memory[_norm(out)] = df
+                print(f"[{stage.name}] wrote {out} {df.shape}")
+
+        state[stage.name] = {
+            "inputs": input_hashes,
+            "outputs": {o: file_hash(o) for o in stage.outputs},
+        }
+        return "ran"
+
+    pending = set(by_name)
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            running = {}
+            while pending or running:
+                for name in sorted(pending):
+                    if deps[name] <= set(status):
+                        running[pool.submit(run_stage, by_name[name])] = name
+                        pending.discard(name)
+                if not running:
+                    raise ValueError(f"Dependency cycle among stages: {sorted(pending)}")
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    name = running.pop(fut)
+                    status[name] = fut.result()
+    finally:
+        # Record whatever finished, so a rerun after a failure resumes there.
+        os.makedirs(os.path.dirname(state_file) or ".", exist_ok=True)
+        with open(state_file, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+
+    return status
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the prep_* pipeline.")
+    parser.add_argument(
+        "--variant",
+        choices=("rushing-all", "fix-teams"),
+        default="rushing-all",
+        help="Which script builds the RB70 table",
+    )
+    parser.add_argument("--jobs", type=int, default=4, help="Stages run in parallel")
+    parser.add_argument("--force", action="store_true", help="Rerun every stage")
+    parser.add_argument(
+        "--timing-report",
+        type=str,
+        default="",
+        help="Write per-stage wall time / peak RSS here (e.g. data/pipeline_timing.json)",
+    )
+    args = parser.parse_args()
+
+    recorder = instrument.enable() if args.timing_report else None
+    try:
+        status = run_pipeline(build_stages(args.variant), jobs=args.jobs, force=args.force)
+    finally:
+        if recorder is not None:
+            recorder.write_report(args.timing_report)
+    for name, result in status.items():
+        print(f"{name}: {result}")
+
+
+if __name__ == "__main__":
+    main()
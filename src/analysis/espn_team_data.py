@@ -9,87 +9,306 @@ Each JSON is a list of dicts, one per team, with keys like:
   - id, name, abbrev, season
   - record: {"wins": ..., "losses": ...}
   - stats: {"offense_rushing_yards": ..., "offense_passing_yards": ...}
+
+Season files written with --format jsonl (espn_team_stats_YYYY.jsonl, one
+team per line) are read line by line; if a season has both, the .jsonl wins.
+
+Seasons fetched with --all-stats also have data/espn_team_stats_YYYY.parquet
+with one column per ESPN stat (e.g. rushing_rushingAttempts); those columns
+can be pulled in through `stat_columns` without touching the JSON.
+
+Per-game box scores from src/api/espn_games.py live in a Parquet dataset
+partitioned by season and week (data/espn_games/season=YYYY/week=W/);
+load_espn_games reads only the partitions and columns asked for.
 """
 
+import hashlib
 import json
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from glob import glob
-from typing import Dict, List, Any
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple
 
 import pandas as pd
 
+from src import instrument
+from src.storage import cached_frame, iter_json_lines, read_frame
+
 DATA_DIR = "data"
 PATTERN = os.path.join(DATA_DIR, "espn_team_stats_*.json")
+JSONL_PATTERN = os.path.join(DATA_DIR, "espn_team_stats_*.jsonl")
+
+CACHE_DIRNAME = ".cache"
+COLUMNS_PATTERN = os.path.join(DATA_DIR, "espn_team_stats_*.parquet")
 
-YEAR_RE = re.compile(r"espn_team_stats_(\d{4})\.json$")
+FLAT_COLUMNS = [
+    "team_id",
+    "team_name",
+    "team_abbrev",
+    "season",
+    "wins",
+    "losses",
+    "offense_rushing_yards",
+    "offense_passing_yards",
+]
+
+YEAR_RE = re.compile(r"espn_team_stats_(\d{4})\.jsonl?$")
+
+GAMES_DIR = os.path.join(DATA_DIR, "espn_games")
+SEASON_PART_RE = re.compile(r"^season=(\d{4})$")
+WEEK_PART_RE = re.compile(r"^week=(\d+)$")
+PARTITION_COLUMNS = ("Year", "week")
+
+
+def _iter_teams(path: str) -> Iterator[Dict[str, Any]]:
+    """Team entries of a season file; .jsonl files are streamed line by line."""
+    if path.endswith(".jsonl"):
+        yield from iter_json_lines(path)
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        yield from json.load(f)
+
+
+def _flatten_team(team: Dict[str, Any]) -> Dict[str, Any]:
+    flat: Dict[str, Any] = {}
+
+    flat["team_id"] = team.get("id")
+    flat["team_name"] = team.get("name")
+    flat["team_abbrev"] = team.get("abbrev")
+    flat["season"] = team.get("season")
+
+    rec = team.get("record") or {}
+    flat["wins"] = rec.get("wins")
+    flat["losses"] = rec.get("losses")
+
+    stats = team.get("stats") or {}
+    flat["offense_rushing_yards"] = stats.get("offense_rushing_yards")
+    flat["offense_passing_yards"] = stats.get("offense_passing_yards")
+
+    return flat
 
 
 def _load_one_json(path: str) -> List[Dict[str, Any]]:
     """
-    Load a single espn_team_stats_YYYY.json file and return a list of flat dicts.
+    Load a single espn_team_stats_YYYY.json(l) file and return a list of flat
+    dicts. In .jsonl files a team may appear more than once (appended by a
+    refresh); its last line wins.
     """
-    with open(path, "r", encoding="utf-8") as f:
-        raw = json.load(f)
-    rows: List[Dict[str, Any]] = []
+    if not path.endswith(".jsonl"):
+        return [_flatten_team(team) for team in _iter_teams(path)]
 
-    for team in raw:
-        flat: Dict[str, Any] = {}
+    rows: Dict[Any, Dict[str, Any]] = {}
+    for i, team in enumerate(_iter_teams(path)):
+        rows[team.get("id", i)] = _flatten_team(team)
+    return list(rows.values())
 
-        flat["team_id"] = team.get("id")
-        flat["team_name"] = team.get("name")
-        flat["team_abbrev"] = team.get("abbrev")
-        flat["season"] = team.get("season")
 
-        rec = team.get("record") or {}
-        flat["wins"] = rec.get("wins")
-        flat["losses"] = rec.get("losses")
+def season_files(data_dir: str = DATA_DIR) -> List[str]:
+    """
+    espn_team_stats_YYYY.json / .jsonl files in `data_dir`, one per season
+    (the .jsonl when both exist), sorted by name.
+    """
+    files = glob(os.path.join(data_dir, os.path.basename(PATTERN)))
+    files += glob(os.path.join(data_dir, os.path.basename(JSONL_PATTERN)))
+    by_season: Dict[str, str] = {}
+    for path in sorted(files):
+        m = YEAR_RE.search(os.path.basename(path))
+        key = m.group(1) if m else path
+        if key not in by_season or path.endswith(".jsonl"):
+            by_season[key] = path
+    return sorted(by_season.values())
 
-        stats = team.get("stats") or {}
-        flat["offense_rushing_yards"] = stats.get("offense_rushing_yards")
-        flat["offense_passing_yards"] = stats.get("offense_passing_yards")
 
-        rows.append(flat)
+def load_espn_stat_columns(columns: List[str], data_dir: str = DATA_DIR) -> pd.DataFrame:
+    """
+    Read only `columns` (plus team_id / Year) from every
+    espn_team_stats_YYYY.parquet. Seasons that lack a column get NA.
+    """
+    pattern = os.path.join(data_dir, os.path.basename(COLUMNS_PATTERN))
+    files = sorted(glob(pattern))
+    if not files:
+        raise FileNotFoundError(
+            f"No files matched {pattern} (fetch with --all-stats first)"
+        )
+
+    wanted = ["team_id", "season"] + [c for c in columns if c not in ("team_id", "season")]
+    df = pd.concat([read_frame(path, wanted) for path in files], ignore_index=True)
 
-    return rows
+    df["team_id"] = df["team_id"].astype(str)
+    df["season"] = pd.to_numeric(df["season"], errors="coerce").astype("Int64")
+    return df.rename(columns={"season": "Year"})
 
 
-def load_all_espn_team_stats() -> pd.DataFrame:
+def _load_one_frame(path: str) -> pd.DataFrame:
+    """
+    One season file as a typed DataFrame chunk (season filled in from the
+    file name where missing). Top-level so it can run in a process pool.
     """
-    Load all espn_team_stats_YYYY.json files into a single DataFrame.
+    m = YEAR_RE.search(os.path.basename(path))
+    file_year = int(m.group(1)) if m else None
+
+    df = pd.DataFrame(_load_one_json(path), columns=FLAT_COLUMNS)
+
+    season = pd.to_numeric(df["season"], errors="coerce")
+    if file_year is not None:
+        season = season.where(season.fillna(0) != 0, file_year)
+    df["season"] = season.astype("Int64")
+    for col in ["wins", "losses", "offense_rushing_yards", "offense_passing_yards"]:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+
+    return df
+
+
+def _load_frames(files: List[str], workers: int, executor: str) -> List[pd.DataFrame]:
+    if workers <= 1 or len(files) <= 1:
+        return [_load_one_frame(path) for path in files]
+
+    pool_cls = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+    with pool_cls(max_workers=workers) as pool:
+        return list(pool.map(_load_one_frame, files))
+
+
+def _build_espn_team_stats(
+    files: List[str],
+    stat_columns: Optional[List[str]],
+    data_dir: str,
+    workers: int = 0,
+    executor: str = "thread",
+) -> pd.DataFrame:
+    df = pd.concat(_load_frames(files, workers, executor), ignore_index=True)
+
+    df["games"] = df["wins"] + df["losses"]
+    df["win_pct"] = df["wins"] / df["games"]
+
+    df = df.rename(columns={"season": "Year"})
+
+    if stat_columns:
+        extra = load_espn_stat_columns(stat_columns, data_dir)
+        df["team_id"] = df["team_id"].astype(str)
+        df = df.merge(extra, on=["team_id", "Year"], how="left")
+
+    return df
+
+
+@instrument.timed()
+def load_all_espn_team_stats(
+    stat_columns: Optional[List[str]] = None,
+    data_dir: str = DATA_DIR,
+    use_cache: bool = True,
+    workers: int = 0,
+    executor: str = "thread",
+) -> pd.DataFrame:
+    """
+    Load all espn_team_stats_YYYY.json(l) files into a single DataFrame.
 
     Returns DataFrame with columns such as:
       team_id, team_name, team_abbrev, season (as Year),
       wins, losses,
       offense_rushing_yards, offense_passing_yards
+    plus any `stat_columns` requested from the per-season .parquet files.
+
+    With `use_cache`, the result is kept as a Parquet snapshot under
+    data/.cache and reused until a source file is added, removed or changed.
+
+    With `workers` > 1, files are parsed in parallel on a thread pool
+    (`executor="process"` for a process pool) and concatenated once.
     """
-    files = sorted(glob(PATTERN))
+    files = season_files(data_dir)
     if not files:
-        raise FileNotFoundError(f"No files matched {PATTERN}")
+        pattern = os.path.join(data_dir, os.path.basename(PATTERN))
+        raise FileNotFoundError(f"No files matched {pattern}(l)")
 
-    all_rows: List[Dict[str, Any]] = []
-    for path in files:
-        m = YEAR_RE.search(os.path.basename(path))
-        file_year = int(m.group(1)) if m else None
+    def build() -> pd.DataFrame:
+        return _build_espn_team_stats(files, stat_columns, data_dir, workers, executor)
 
-        rows = _load_one_json(path)
-        for r in rows:
-            if not r.get("season") and file_year is not None:
-                r["season"] = file_year
-            all_rows.append(r)
+    if not use_cache:
+        return build()
 
-    df = pd.DataFrame(all_rows)
+    sources = list(files)
+    name = "espn_team_stats"
+    if stat_columns:
+        sources += sorted(glob(os.path.join(data_dir, os.path.basename(COLUMNS_PATTERN))))
+        key = ",".join(stat_columns).encode("utf-8")
+        name += "_" + hashlib.sha1(key).hexdigest()[:12]
 
-    df["season"] = pd.to_numeric(df["season"], errors="coerce").astype("Int64")
-    for col in ["wins", "losses", "offense_rushing_yards", "offense_passing_yards"]:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce")
+    return cached_frame(name, sources, build, os.path.join(data_dir, CACHE_DIRNAME))
 
-    df["games"] = df["wins"] + df["losses"]
-    df["win_pct"] = df["wins"] / df["games"]
 
-    df = df.rename(columns={"season": "Year"})
+def game_partitions(
+    games_dir: str = GAMES_DIR,
+    seasons: Optional[Iterable[int]] = None,
+    weeks: Optional[Iterable[int]] = None,
+) -> List[Tuple[int, int, str]]:
+    """
+    (season, week, path) of every partition file in the games dataset that
+    matches `seasons` / `weeks` (None = all). Pruning is done on directory
+    names, so skipped partitions are never opened.
+    """
+    season_set = None if seasons is None else set(seasons)
+    week_set = None if weeks is None else set(weeks)
+    found: List[Tuple[int, int, str]] = []
+    if not os.path.isdir(games_dir):
+        return found
+
+    for season_name in os.listdir(games_dir):
+        m = SEASON_PART_RE.match(season_name)
+        if not m or (season_set is not None and int(m.group(1)) not in season_set):
+            continue
+        season_dir = os.path.join(games_dir, season_name)
+        for week_name in os.listdir(season_dir):
+            w = WEEK_PART_RE.match(week_name)
+            if not w or (week_set is not None and int(w.group(1)) not in week_set):
+                continue
+            for path in sorted(glob(os.path.join(season_dir, week_name, "*.parquet"))):
+                found.append((int(m.group(1)), int(w.group(1)), path))
+    return sorted(found)
+
+
+def _load_game_partition(
+    season: int, week: int, path: str, columns: Optional[List[str]]
+) -> pd.DataFrame:
+    # Year and week come from the partition path, not the file.
+    if columns is not None:
+        columns = [c for c in columns if c not in PARTITION_COLUMNS]
+    df = read_frame(path, columns)
+    df.insert(0, "week", week)
+    df.insert(0, "Year", season)
+    return df
+
+
+def load_espn_games(
+    seasons: Optional[Iterable[int]] = None,
+    weeks: Optional[Iterable[int]] = None,
+    columns: Optional[List[str]] = None,
+    games_dir: str = GAMES_DIR,
+    workers: int = 0,
+) -> pd.DataFrame:
+    """
+    Per-game team rows (one per team per game) for the requested `seasons`
+    and `weeks`, with Year and week taken from the partition path. Only
+    `columns` are read if given (e.g. ["team_id", "result",
+    "rushing_rushingAttempts"]); partitions lacking one get NA. With
+    `workers` > 1, partitions are read on a thread pool.
+    """
+    parts = game_partitions(games_dir, seasons, weeks)
+    if not parts:
+        raise FileNotFoundError(
+            f"No game partitions under {games_dir} for seasons={seasons} weeks={weeks}"
+        )
+
+    def load(part: Tuple[int, int, str]) -> pd.DataFrame:
+        return _load_game_partition(*part, columns)
+
+    if workers > 1 and len(parts) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            frames = list(pool.map(load, parts))
+    else:
+        frames = [load(part) for part in parts]
 
+    df = pd.concat(frames, ignore_index=True)
+    df["Year"] = df["Year"].astype("Int64")
+    df["week"] = df["week"].astype("Int64")
     return df
 
 
@@ -0,0 +1,119 @@
+"""
+Fuzzy player-name linkage between OverTheCap and Pro-Football-Reference.
+
+Exact joins on normalized names (src.analysis.names) miss players whose
+names are spelled differently on the two sites ("Mark Ingram" / "Mark
+Ingram II" is handled by normalization, "Ty Montgomery" / "Tyler
+Montgomery" is not). Here each query name is only compared with reference
+names in the same block:
+  - same first letters of the last name (`prefix_len`), and
+  - reference seasons within `window` years of the contract year.
+Within a block names are scored by trigram (Jaccard) similarity, so the
+work grows with block size rather than with len(query) * len(reference).
+"""
+
+from collections import defaultdict
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+import pandas as pd
+
+from src.analysis.names import normalize_names
+
+MATCH_COLUMNS = [
+    "query_name", "query_key", "query_year", "ref_name", "ref_key", "score", "exact"
+]
+
+
+def trigrams(key: str) -> FrozenSet[str]:
+    padded = f"  {key} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def block_key(key: str, prefix_len: int = 3) -> str:
+    parts = key.split()
+    return parts[-1][:prefix_len] if parts else ""
+
+
+def _similarity(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def match_names(
+    query: pd.DataFrame,
+    reference: pd.DataFrame,
+    query_name: str = "player",
+    ref_name: str = "Player",
+    query_year: Optional[str] = "year_signed",
+    ref_year: Optional[str] = "Year",
+    window: int = 3,
+    threshold: float = 0.5,
+    prefix_len: int = 3,
+) -> pd.DataFrame:
+    """
+    Best reference match for every distinct (query name, query year).
+
+    Returns one row per matched pair with MATCH_COLUMNS; `exact` is True
+    where the normalized names are identical (score 1.0). The season window
+    applies to exact matches too, so a same-name player from another era is
+    not linked. Pairs whose best score is below `threshold` are left out.
+    Year columns that are None or missing disable the window (query_year is
+    then NA).
+    """
+    ref = pd.DataFrame({"name": reference[ref_name], "key": normalize_names(reference[ref_name])})
+    use_years = bool(
+        query_year and ref_year and query_year in query.columns and ref_year in reference.columns
+    )
+    ref["year"] = pd.to_numeric(reference[ref_year], errors="coerce") if use_years else pd.NA
+    ref = ref[ref["key"] != ""]
+
+    # One entry per reference player: display name and season span.
+    spans = ref.groupby("key", sort=False).agg(
+        name=("name", "first"), first=("year", "min"), last=("year", "max")
+    )
+    ref_grams = {k: trigrams(k) for k in spans.index}
+    first_year = spans["first"].to_dict()
+    last_year = spans["last"].to_dict()
+
+    blocks: Dict[str, List[str]] = defaultdict(list)
+    for key in spans.index:
+        blocks[block_key(key, prefix_len)].append(key)
+
+    q = pd.DataFrame({"name": query[query_name], "key": normalize_names(query[query_name])})
+    q["year"] = pd.to_numeric(query[query_year], errors="coerce") if use_years else pd.NA
+    q = q[q["key"] != ""].drop_duplicates(["key", "year"])
+
+    def in_window(cand: str, year: object) -> bool:
+        if not use_years or pd.isna(year):
+            return True
+        first, last = first_year[cand], last_year[cand]
+        return pd.isna(first) or first - window <= year <= last + window
+
+    best: Dict[Tuple[str, object], Tuple[float, str, object]] = {}
+    for name, key, year in q.itertuples(index=False, name=None):
+        if key in ref_grams and in_window(key, year):
+            best[(key, year)] = (1.0, key, name)
+            continue
+
+        grams = trigrams(key)
+        for cand in blocks.get(block_key(key, prefix_len), ()):
+            if not in_window(cand, year):
+                continue
+            score = _similarity(grams, ref_grams[cand])
+            if score >= threshold and score > best.get((key, year), (0.0,))[0]:
+                best[(key, year)] = (score, cand, name)
+
+    rows = [
+        {
+            "query_name": name,
+            "query_key": key,
+            "query_year": year,
+            "ref_name": spans.at[cand, "name"],
+            "ref_key": cand,
+            "score": round(score, 4),
+            "exact": key == cand,
+        }
+        for (key, year), (score, cand, name) in best.items()
+    ]
+    return pd.DataFrame(rows, columns=MATCH_COLUMNS)
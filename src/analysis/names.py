@@ -0,0 +1,98 @@
+"""
+Player-name normalization and a reusable name -> player_id index.
+
+Used to join Pro-Football-Reference rushing rows with OverTheCap contracts.
+Normalization is vectorized and only runs once per distinct raw name:
+  "Kenneth Walker III" -> "kenneth walker"
+  "A.J. Dillon"        -> "aj dillon"
+  "Le'Veon Bell"       -> "leveon bell"
+  "Clyde Edwards-Helaire" -> "clyde edwards helaire"
+  "José Núñez Jr."     -> "jose nunez"
+"""
+
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+SUFFIX_RE = r"\s+(?:jr|sr|ii|iii|iv|v)$"
+PUNCT_RE = r"[.'`’,]"
+
+
+def _normalize_unique(names: pd.Series) -> pd.Series:
+    """Normalize a Series of distinct, non-null names (vectorized)."""
+    s = names.astype(str)
+    s = s.str.normalize("NFKD").str.encode("ascii", "ignore").str.decode("ascii")
+    s = s.str.lower()
+    s = s.str.replace(PUNCT_RE, "", regex=True)
+    s = s.str.replace("-", " ", regex=False)
+    s = s.str.replace(r"\s+", " ", regex=True).str.strip()
+    s = s.str.replace(SUFFIX_RE, "", regex=True)
+    return s
+
+
+def normalize_names(names: pd.Series) -> pd.Series:
+    """
+    Join keys for a Series of player names (missing names become "").
+    Each distinct name is normalized once, then mapped back onto the rows.
+    """
+    codes, uniques = pd.factorize(names, use_na_sentinel=True)
+    keys = _normalize_unique(pd.Series(uniques, dtype=object)).to_numpy(dtype=object)
+    out = np.where(codes >= 0, keys[codes] if len(keys) else "", "")
+    return pd.Series(out, index=names.index, dtype=object)
+
+
+def normalize_name(s: Optional[str]) -> str:
+    """Join key for a single player name."""
+    if s is None:
+        return ""
+    return normalize_names(pd.Series([s])).iloc[0]
+
+
+class NameIndex:
+    """
+    Maps normalized name keys to integer player ids.
+
+    Build it once from the reference names (e.g. the RB70 list) and reuse it
+    to tag any other table with `ids()`; raw names already seen are not
+    normalized again.
+    """
+
+    def __init__(self, keys: Iterable[str]) -> None:
+        unique = sorted({k for k in keys if k})
+        self._ids: Dict[str, int] = {k: i for i, k in enumerate(unique)}
+        self._raw_keys: Dict[str, str] = {}
+
+    @classmethod
+    def from_names(cls, *name_series: pd.Series) -> "NameIndex":
+        keys = pd.concat([normalize_names(s) for s in name_series], ignore_index=True)
+        return cls(keys.unique())
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._ids
+
+    def keys(self, names: pd.Series) -> pd.Series:
+        """Normalized keys for `names`, memoized per distinct raw name."""
+        codes, uniques = pd.factorize(names, use_na_sentinel=True)
+        todo = [u for u in uniques if u not in self._raw_keys]
+        if todo:
+            fresh = _normalize_unique(pd.Series(todo, dtype=object))
+            self._raw_keys.update(zip(todo, fresh))
+        keys = np.array([self._raw_keys[u] for u in uniques] + [""], dtype=object)
+        return pd.Series(keys[codes], index=names.index, dtype=object)
+
+    def ids(self, names: pd.Series) -> pd.Series:
+        """player_id for each name (Int64; <NA> if the player is not indexed)."""
+        return self.ids_for_keys(self.keys(names))
+
+    def ids_for_keys(self, keys: pd.Series) -> pd.Series:
+        """Like ids(), for names that are already normalized."""
+        return keys.map(self._ids).astype("Int64")
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {"player_key": list(self._ids), "player_id": list(self._ids.values())}
+        )
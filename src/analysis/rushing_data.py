@@ -6,19 +6,115 @@ Assumes:
 - data/rb_rushing_2024.csv       (your cleaned 2024 table)
 """
 
+import json
 import os
-from typing import List
+from typing import Dict, Iterator, List
 
 import pandas as pd
 
+from src import instrument
+from src.storage import cached_frame
+
 DATA_DIR = "data"
+CACHE_DIRNAME = ".cache"
 HISTORICAL_FILE = os.path.join(DATA_DIR, "rushing_cleaned.csv")
 R2024_FILE = os.path.join(DATA_DIR, "rb_rushing_2024.csv")
 
 
+# Declared dtypes for the rushing tables. Counts use the smallest nullable
+# integer type that holds them, rates are float32 and the repeated string
+# columns are categorical.
+RUSHING_SCHEMA: Dict[str, str] = {
+    "Player": "category",
+    "Team": "category",
+    "Pos": "category",
+    "Age": "Int8",
+    "G": "Int8",
+    "GS": "Int8",
+    "rAtt": "Int16",
+    "Att": "Int16",
+    "rYds": "Int16",
+    "rTD": "Int8",
+    "r1D": "Int16",
+    "rLng": "Int16",
+    "rY/A": "float32",
+    "rY/g": "float32",
+    "Fmb": "Int8",
+    "Year": "Int16",
+}
+
+CATEGORY_COLUMNS = [c for c, t in RUSHING_SCHEMA.items() if t == "category"]
+
+
+def apply_rushing_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cast an already-loaded rushing table to RUSHING_SCHEMA. Unparseable
+    numbers become NA; integer columns that turn out to hold fractions or
+    out-of-range values are kept as float64 rather than truncated.
+    """
+    for col, dtype in RUSHING_SCHEMA.items():
+        if col not in df.columns:
+            continue
+        if dtype == "category":
+            df[col] = df[col].astype("category")
+            continue
+        values = pd.to_numeric(df[col], errors="coerce")
+        try:
+            df[col] = values.astype(dtype)
+        except (TypeError, ValueError, OverflowError):
+            df[col] = values.astype("float64")
+    return df
+
+
+def read_rushing_csv(path: str) -> pd.DataFrame:
+    """
+    Read a rushing CSV straight into RUSHING_SCHEMA dtypes (dtype= / usecols=
+    at parse time; 'Unnamed: ...' index columns are never read). Falls back
+    to apply_rushing_schema for files with stray text in numeric columns.
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = [c for c in header if not c.startswith("Unnamed")]
+    dtype = {c: RUSHING_SCHEMA[c.strip()] for c in usecols if c.strip() in RUSHING_SCHEMA}
+
+    try:
+        df = pd.read_csv(path, usecols=usecols, dtype=dtype)
+    except (TypeError, ValueError, OverflowError):
+        cats = {c: t for c, t in dtype.items() if t == "category"}
+        df = pd.read_csv(path, usecols=usecols, dtype=cats)
+        df.columns = [c.strip() for c in df.columns]
+        return apply_rushing_schema(df)
+
+    df.columns = [c.strip() for c in df.columns]
+    return df
+
+
+def iter_rushing_csv(path: str, chunksize: int = 50_000) -> Iterator[pd.DataFrame]:
+    """
+    Stream a rushing CSV in typed chunks of `chunksize` rows, so memory
+    stays bounded by the chunk size rather than the file size.
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = [c for c in header if not c.startswith("Unnamed")]
+    cats = {c: "category" for c in usecols if RUSHING_SCHEMA.get(c.strip()) == "category"}
+
+    for chunk in pd.read_csv(path, usecols=usecols, dtype=cats, chunksize=chunksize):
+        chunk.columns = [c.strip() for c in chunk.columns]
+        yield apply_rushing_schema(chunk)
+
+
+def concat_rushing(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate typed rushing tables, re-unifying categorical columns."""
+    full = pd.concat(frames, ignore_index=True)
+    for col in CATEGORY_COLUMNS:
+        if col in full.columns and not isinstance(full[col].dtype, pd.CategoricalDtype):
+            full[col] = full[col].astype("category")
+    return full
+
+
 def _load_single(path: str) -> pd.DataFrame:
     """
-    Load a single CSV, drop any 'Unnamed: ...' index columns, return DataFrame.
+    Load a single CSV without dtypes, drop any 'Unnamed: ...' index columns,
+    return DataFrame. Used as the baseline in rushing_memory_report.
     """
     df = pd.read_csv(path)
 
@@ -29,36 +125,81 @@ def _load_single(path: str) -> pd.DataFrame:
     return df
 
 
-def load_all_rushing() -> pd.DataFrame:
-    """
-    Load rushing_cleaned (2001–2023) + 2024 file into a single DataFrame.
+def _build_all_rushing(paths: List[str]) -> pd.DataFrame:
+    return concat_rushing([read_rushing_csv(p) for p in paths])
 
-    Returns:
-        DataFrame with columns like:
-        Player, Age, G, GS, rAtt, rYds, rTD, r1D, rLng, rY/A, rY/g, Fmb, Year
+
+def rushing_memory_report(data_dir: str = DATA_DIR) -> pd.DataFrame:
+    """
+    Per-column memory of the combined rushing table loaded the old way
+    (object strings + float64) vs. with RUSHING_SCHEMA, in bytes.
     """
-    frames: List[pd.DataFrame] = []
+    paths = _rushing_paths(data_dir)
+
+    baseline = pd.concat([_load_single(p) for p in paths], ignore_index=True)
+    for col in RUSHING_SCHEMA:
+        if col in baseline.columns and RUSHING_SCHEMA[col] != "category":
+            baseline[col] = pd.to_numeric(baseline[col], errors="coerce")
+    typed = _build_all_rushing(paths)
 
-    if os.path.exists(HISTORICAL_FILE):
-        frames.append(_load_single(HISTORICAL_FILE))
+    report = pd.DataFrame(
+        {
+            "baseline_bytes": baseline.memory_usage(deep=True, index=False),
+            "typed_bytes": typed.memory_usage(deep=True, index=False),
+        }
+    )
+    report.loc["TOTAL"] = report.sum()
+    report["saved_bytes"] = report["baseline_bytes"] - report["typed_bytes"]
+    return report
+
+
+def _rushing_paths(data_dir: str) -> List[str]:
+    historical = os.path.join(data_dir, os.path.basename(HISTORICAL_FILE))
+    r2024 = os.path.join(data_dir, os.path.basename(R2024_FILE))
+
+    paths: List[str] = []
+
+    if os.path.exists(historical):
+        paths.append(historical)
     else:
-        raise FileNotFoundError(f"Missing {HISTORICAL_FILE}")
+        raise FileNotFoundError(f"Missing {historical}")
 
-    if os.path.exists(R2024_FILE):
-        frames.append(_load_single(R2024_FILE))
+    if os.path.exists(r2024):
+        paths.append(r2024)
     else:
-        print(f"[WARN] {R2024_FILE} not found; loading only 2001–2023.")
+        print(f"[WARN] {r2024} not found; loading only 2001–2023.")
 
-    full = pd.concat(frames, ignore_index=True)
+    return paths
 
-    if "Year" in full.columns:
-        full["Year"] = pd.to_numeric(full["Year"], errors="coerce").astype("Int64")
 
-    for col in ["Age", "G", "GS", "rAtt", "rYds", "rTD", "r1D", "rLng", "rY/A", "rY/g", "Fmb"]:
-        if col in full.columns:
-            full[col] = pd.to_numeric(full[col], errors="coerce")
+@instrument.timed()
+def load_all_rushing(data_dir: str = DATA_DIR, use_cache: bool = True) -> pd.DataFrame:
+    """
+    Load rushing_cleaned (2001–2023) + 2024 file into a single DataFrame.
 
-    return full
+    Columns are typed per RUSHING_SCHEMA (small nullable ints, float32,
+    categorical Player/Team/Pos).
+
+    With `use_cache`, the result is kept as a Parquet snapshot under
+    data/.cache and reused until either CSV (mtime or size) or the schema
+    changes.
+
+    Returns:
+        DataFrame with columns like:
+        Player, Age, G, GS, rAtt, rYds, rTD, r1D, rLng, rY/A, rY/g, Fmb, Year
+    """
+    paths = _rushing_paths(data_dir)
+
+    if not use_cache:
+        return _build_all_rushing(paths)
+
+    return cached_frame(
+        "rushing_all",
+        paths,
+        lambda: _build_all_rushing(paths),
+        os.path.join(data_dir, CACHE_DIRNAME),
+        key=json.dumps(RUSHING_SCHEMA, sort_keys=True),
+    )
 
 
 if __name__ == "__main__":
@@ -67,3 +208,9 @@ if __name__ == "__main__":
     print()
     print("Shape:", df.shape)
     print("Years:", df["Year"].dropna().unique())
+    print()
+    report = rushing_memory_report()
+    print(report)
+    saved = report.loc["TOTAL", "saved_bytes"]
+    print(f"Typed schema saves {saved:,} bytes "
+          f"({saved / report.loc['TOTAL', 'baseline_bytes']:.0%})")
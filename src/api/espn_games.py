@@ -0,0 +1,351 @@
+"""
+Per-game (weekly) ESPN team box scores.
+
+For each regular-season week the scoreboard lists the games; each team's
+box score in a completed game comes from the competitor statistics
+endpoint, in the same splits/categories shape as the season statistics
+(so src.api.espn_nfl.extract_all_stats flattens it). Rows are one team per
+game and are written as a Parquet dataset partitioned by season and week:
+
+    data/espn_games/season=2023/week=1/part-0.parquet
+    data/espn_games/season=2023/week=2/part-0.parquet
+    ...
+
+A season is ~17x the rows of the season-level files (and ~550 requests),
+so requests run concurrently under one semaphore and token bucket, but
+only a few weeks (--weeks-in-flight) are open at a time: each week's box
+scores follow its scoreboard and its partition is written before the next
+week starts, so memory stays at a few weeks' rows. Partitions of completed
+seasons that are already on disk and error-free are skipped unless --force
+is given.
+Read them back with src.analysis.espn_team_data.load_espn_games.
+
+    python -m src.api.espn_games --seasons 2015-2024 --out-dir data/espn_games
+"""
+
+import argparse
+import asyncio
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+import requests
+
+from src import instrument
+from src.api.espn_nfl import (
+    _get,
+    _offense_yards,
+    current_season,
+    extract_all_stats,
+    paces_requests,
+    parse_seasons,
+)
+from src.api.http import TokenBucket, make_session
+from src.storage import read_frame, write_frame
+
+SCOREBOARD_URL = (
+    "https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard"
+    "?dates={season}&seasontype=2&week={week}&limit=100"
+)
+COMPETITOR_STATS_URL = (
+    "https://sports.core.api.espn.com/v2/sports/football/leagues/nfl"
+    "/events/{event_id}/competitions/{event_id}/competitors/{team_id}/statistics"
+)
+
+DATASET_DIR = os.path.join("data", "espn_games")
+
+# Leading columns of every partition; the <category>_<stat> columns follow.
+GAME_COLUMNS = [
+    "event_id",
+    "date",
+    "team_id",
+    "team_abbrev",
+    "home_away",
+    "opponent_id",
+    "opponent_abbrev",
+    "points",
+    "opponent_points",
+    "result",
+    "offense_rushing_yards",
+    "offense_passing_yards",
+    "stats_error",
+]
+INT_COLUMNS = ["points", "opponent_points"]
+STRING_COLUMNS = [
+    "event_id", "date", "team_id", "team_abbrev", "home_away",
+    "opponent_id", "opponent_abbrev", "result", "stats_error",
+]
+
+
+def regular_season_weeks(season: int) -> List[int]:
+    """Weeks 1-18 from 2021 (17-game seasons), 1-17 before."""
+    return list(range(1, 19 if season >= 2021 else 18))
+
+
+def partition_path(out_dir: str, season: int, week: int) -> str:
+    return os.path.join(out_dir, f"season={season}", f"week={week}", "part-0.parquet")
+
+
+def _points(competitor: Dict[str, Any]) -> Optional[int]:
+    score = competitor.get("score")
+    if isinstance(score, dict):  # core API shape
+        score = score.get("value")
+    try:
+        return int(float(score))
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_scoreboard(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    One row per team per completed game on a scoreboard payload (game and
+    opponent columns only; box-score stats are fetched separately).
+    Games not yet final are left out.
+    """
+    rows: List[Dict[str, Any]] = []
+    for event in payload.get("events") or []:
+        for comp in event.get("competitions") or []:
+            status = (comp.get("status") or event.get("status") or {}).get("type") or {}
+            competitors = comp.get("competitors") or []
+            if not status.get("completed") or len(competitors) != 2:
+                continue
+            for me, opp in (competitors, competitors[::-1]):
+                pts, opp_pts = _points(me), _points(opp)
+                result = None
+                if pts is not None and opp_pts is not None:
+                    result = "W" if pts > opp_pts else "L" if pts < opp_pts else "T"
+                rows.append(
+                    {
+                        "event_id": str(comp.get("id") or event.get("id")),
+                        "date": event.get("date") or comp.get("date"),
+                        "team_id": str(me.get("id") or (me.get("team") or {}).get("id")),
+                        "team_abbrev": (me.get("team") or {}).get("abbreviation"),
+                        "home_away": me.get("homeAway"),
+                        "opponent_id": str(opp.get("id") or (opp.get("team") or {}).get("id")),
+                        "opponent_abbrev": (opp.get("team") or {}).get("abbreviation"),
+                        "points": pts,
+                        "opponent_points": opp_pts,
+                        "result": result,
+                    }
+                )
+    return rows
+
+
+def get_week_games(
+    season: int, week: int, session: Optional[requests.Session] = None
+) -> List[Dict[str, Any]]:
+    resp = _get(SCOREBOARD_URL.format(season=season, week=week), session)
+    resp.raise_for_status()
+    return parse_scoreboard(resp.json())
+
+
+def get_game_stats(
+    event_id: str, team_id: str, session: Optional[requests.Session] = None
+) -> Dict[str, float]:
+    """Offense yards plus every <category>_<stat> of one team's box score."""
+    url = COMPETITOR_STATS_URL.format(event_id=event_id, team_id=team_id)
+    resp = _get(url, session)
+    resp.raise_for_status()
+    payload = resp.json()
+    return {**_offense_yards(payload), **extract_all_stats(payload)}
+
+
+def week_frame(rows: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Typed frame for one week: GAME_COLUMNS, then stat columns as float64."""
+    df = pd.DataFrame(rows)
+    stat_cols = sorted(c for c in df.columns if c not in GAME_COLUMNS)
+    df = df.reindex(columns=GAME_COLUMNS + stat_cols)
+    for col in STRING_COLUMNS:
+        df[col] = df[col].astype("string")
+    for col in INT_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+    num_cols = ["offense_rushing_yards", "offense_passing_yards"] + stat_cols
+    df[num_cols] = df[num_cols].apply(pd.to_numeric, errors="coerce").astype("float64")
+    return df
+
+
+def week_is_complete(path: str) -> bool:
+    """True if the partition exists and every box score in it was fetched."""
+    if not os.path.exists(path):
+        return False
+    try:
+        return bool(read_frame(path, ["stats_error"])["stats_error"].isna().all())
+    except Exception:
+        return False
+
+
+async def _fetch_week_async(
+    season: int,
+    week: int,
+    sem: asyncio.Semaphore,
+    bucket: Optional[TokenBucket],
+    session: Optional[requests.Session],
+) -> List[Dict[str, Any]]:
+    """Scoreboard for one week, then every team's box score concurrently."""
+
+    async def call(fn, *args):
+        async with sem:
+            if bucket is not None:
+                await bucket.acquire()
+            return await asyncio.to_thread(fn, *args, session)
+
+    games = await call(get_week_games, season, week)
+    stats = await asyncio.gather(
+        *(call(get_game_stats, g["event_id"], g["team_id"]) for g in games),
+        return_exceptions=True,
+    )
+    for game, found in zip(games, stats):
+        if isinstance(found, Exception):
+            game["stats_error"] = str(found)
+        else:
+            game.update(found)
+    return games
+
+
+async def fetch_games_async(
+    seasons: List[int],
+    out_dir: str = DATASET_DIR,
+    weeks: Optional[List[int]] = None,
+    concurrency: int = 8,
+    rate: float = 10.0,
+    session: Optional[requests.Session] = None,
+    force: bool = False,
+    weeks_in_flight: int = 2,
+) -> Dict[Tuple[int, int], int]:
+    """
+    Fetch every (season, week), at most `weeks_in_flight` weeks at a time
+    (their requests share `concurrency` slots), and write each week's
+    partition as soon as it is complete. `weeks` defaults to the regular
+    season.
+    Returns {(season, week): rows written}; weeks whose scoreboard fails
+    are skipped with a warning, weeks already complete on disk (completed
+    seasons only, unless `force`) are not refetched. A session that paces
+    itself (see paces_requests) is not throttled again here.
+    """
+    sem = asyncio.Semaphore(max(1, concurrency))
+    open_weeks = asyncio.Semaphore(max(1, weeks_in_flight))
+    bucket = None if paces_requests(session) else TokenBucket(rate)
+    this_season = current_season()
+
+    todo: List[Tuple[int, int]] = []
+    for season in seasons:
+        for week in weeks or regular_season_weeks(season):
+            path = partition_path(out_dir, season, week)
+            if not force and season < this_season and week_is_complete(path):
+                continue
+            todo.append((season, week))
+    print(f"Fetching {len(todo)} season-weeks (concurrency={concurrency}, rate={rate}/s)...")
+
+    written: Dict[Tuple[int, int], int] = {}
+
+    async def one(season: int, week: int) -> None:
+        async with open_weeks:
+            try:
+                rows = await _fetch_week_async(season, week, sem, bucket, session)
+            except Exception as e:
+                print(f"[WARN] {season} week {week} scoreboard failed: {e}")
+                return
+            if not rows:
+                print(f"[WARN] No completed games for {season} week {week}")
+                return
+            path = partition_path(out_dir, season, week)
+            await asyncio.to_thread(write_frame, week_frame(rows), path)
+            written[(season, week)] = len(rows)
+            print(f"Saved {len(rows)} team-games to {path}")
+
+    await asyncio.gather(*(one(s, w) for s, w in todo))
+    return dict(sorted(written.items()))
+
+
+def fetch_games(
+    seasons: List[int],
+    out_dir: str = DATASET_DIR,
+    weeks: Optional[List[int]] = None,
+    concurrency: int = 8,
+    rate: float = 10.0,
+    session: Optional[requests.Session] = None,
+    force: bool = False,
+    weeks_in_flight: int = 2,
+) -> Dict[Tuple[int, int], int]:
+    session = session or make_session(pool_size=max(concurrency, 1), retries=3, rate=rate)
+    return asyncio.run(
+        fetch_games_async(
+            seasons, out_dir, weeks, concurrency, rate, session, force, weeks_in_flight
+        )
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Fetch per-game ESPN team box scores into a season/week Parquet dataset."
+    )
+    parser.add_argument(
+        "--seasons", required=True, help="Seasons to fetch, e.g. 2015-2024 or 2022,2024"
+    )
+    parser.add_argument(
+        "--weeks", default="", help="Weeks to fetch, e.g. 1-4 (default: the regular season)"
+    )
+    parser.add_argument(
+        "--out-dir",
+        default=DATASET_DIR,
+        help="Dataset directory (season=YYYY/week=W/part-0.parquet)",
+    )
+    parser.add_argument("--concurrency", type=int, default=8, help="Max requests in flight")
+    parser.add_argument(
+        "--weeks-in-flight",
+        type=int,
+        default=2,
+        help="Weeks fetched at once; bounds how many weeks' rows are held in memory",
+    )
+    parser.add_argument(
+        "--rate", type=float, default=10.0, help="Requests per second to start at (adaptive)"
+    )
+    parser.add_argument(
+        "--max-rate",
+        type=float,
+        default=0.0,
+        help="Upper bound for the adaptive request rate (default 2 x --rate)",
+    )
+    parser.add_argument(
+        "--retries", type=int, default=3, help="Retries per request on 429/5xx/connection errors"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Refetch weeks of completed seasons that are already on disk",
+    )
+    parser.add_argument(
+        "--timing-report",
+        type=str,
+        default="",
+        help="Write per-request timings here (e.g. data/games_timing.json)",
+    )
+    args = parser.parse_args()
+
+    recorder = instrument.enable() if args.timing_report else None
+    session = make_session(
+        pool_size=max(args.concurrency, 1),
+        retries=args.retries,
+        rate=args.rate,
+        max_rate=args.max_rate or None,
+    )
+    try:
+        with instrument.stage("espn_games"):
+            written = fetch_games(
+                parse_seasons(args.seasons),
+                args.out_dir,
+                parse_seasons(args.weeks) if args.weeks else None,
+                args.concurrency,
+                args.rate,
+                session,
+                args.force,
+                args.weeks_in_flight,
+            )
+        print(f"Wrote {len(written)} partitions ({sum(written.values())} team-games).")
+    finally:
+        if recorder is not None:
+            recorder.write_report(args.timing_report)
+
+
+if __name__ == "__main__":
+    main()
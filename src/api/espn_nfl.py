@@ -1,10 +1,26 @@
 import argparse
+import asyncio
+import datetime as dt
 import json
+import os
+import re
 import time
-from typing import Any, Dict, List, Tuple
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
+import pandas as pd
 import requests
 
+from src import instrument
+from src.api.http import (
+    ResilientAdapter,
+    TokenBucket,
+    atomic_write,
+    make_session,
+    resolve_url,
+)
+from src.storage import JsonLinesWriter, iter_json_lines, read_frame, write_frame
+
 # ESPN endpoints
 TEAM_LIST_URL = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/teams"
 TEAM_RECORD_URL = (
@@ -15,10 +31,38 @@ TEAM_STATS_URL = (
     "https://sports.core.api.espn.com/v2/sports/football/leagues/nfl"
     "/seasons/{season}/types/2/teams/{team_id}/statistics"
 )
+# League-wide regular-season standings: every team's record in one call.
+STANDINGS_URL = (
+    "https://site.api.espn.com/apis/v2/sports/football/nfl/standings"
+    "?season={season}&seasontype=2"
+)
+
+SEASON_IN_URL_RE = re.compile(r"(?:/seasons/|[?&]season=)(\d{4})(?:/|&|$)")
+
+
+def current_season(today: Optional[dt.date] = None) -> int:
+    """
+    The NFL season that is in progress (or next up) on `today`.
+    Season YYYY runs from September YYYY through the Super Bowl in February
+    YYYY+1, so it is only final from March YYYY+1 on.
+    """
+    today = today or dt.date.today()
+    return today.year if today.month >= 3 else today.year - 1
+
 
+def is_completed_season_url(url: str, today: Optional[dt.date] = None) -> bool:
+    """True for record/statistics URLs of seasons that can no longer change."""
+    m = SEASON_IN_URL_RE.search(url)
+    return bool(m) and int(m.group(1)) < current_season(today)
 
-def list_teams() -> List[Dict[str, str]]:
-    resp = requests.get(TEAM_LIST_URL, timeout=30)
+
+def _get(url: str, session: Optional[requests.Session] = None) -> requests.Response:
+    """GET through the shared session if one is given, else a one-off request."""
+    return (session or requests).get(resolve_url(url), timeout=30)
+
+
+def list_teams(session: Optional[requests.Session] = None) -> List[Dict[str, str]]:
+    resp = _get(TEAM_LIST_URL, session)
     resp.raise_for_status()
     data = resp.json()
 
@@ -38,15 +82,15 @@ def list_teams() -> List[Dict[str, str]]:
     return teams
 
 
-def get_record(team_id: str, season: int) -> Dict[str, int]:
+def get_record(
+    team_id: str, season: int, session: Optional[requests.Session] = None
+) -> Dict[str, int]:
 
     url = TEAM_RECORD_URL.format(season=season, team_id=team_id)
-    resp = requests.get(url, timeout=30)
+    resp = _get(url, session)
     resp.raise_for_status()
     d = resp.json()
 
-    wins = losses = None
-
     # Typical shape:
     # {
     #   "items": [
@@ -59,63 +103,179 @@ def get_record(team_id: str, season: int) -> Dict[str, int]:
     #     }
     #   ]
     # }
-    for item in d.get("items", []):
-        for stat in item.get("stats", []):
-            name = stat.get("name")
-            val = stat.get("value")
-            if name == "wins":
-                try:
-                    wins = int(val)
-                except Exception:
-                    wins = None
-            elif name == "losses":
-                try:
-                    losses = int(val)
-                except Exception:
-                    losses = None
-
-    return {"wins": wins, "losses": losses}
+    stats = [stat for item in d.get("items", []) for stat in item.get("stats", [])]
+    return _wins_losses(stats)
 
 
-def _extract_yards_from_stats(payload: Any) -> Tuple[float, float]:
+def _wins_losses(stats: List[Dict[str, Any]]) -> Dict[str, Optional[int]]:
+    """{"wins", "losses"} from a list of {"name", "value"} stat entries."""
+    wins = losses = None
+    for stat in stats:
+        name = stat.get("name")
+        val = stat.get("value")
+        if name == "wins":
+            try:
+                wins = int(val)
+            except Exception:
+                wins = None
+        elif name == "losses":
+            try:
+                losses = int(val)
+            except Exception:
+                losses = None
 
-    rushing = None
-    passing = None
+    return {"wins": wins, "losses": losses}
 
-    def walk(obj: Any) -> None:
-        nonlocal rushing, passing
 
+def parse_standings(payload: Dict[str, Any]) -> Dict[str, Dict[str, Optional[int]]]:
+    """
+    {team_id: {"wins", "losses"}} from a standings document. Teams sit in
+    children[*] (conferences, possibly with nested divisions) under
+    standings.entries[*] = {"team": {"id"}, "stats": [{"name", "value"}]}.
+    """
+    records: Dict[str, Dict[str, Optional[int]]] = {}
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        for entry in (node.get("standings") or {}).get("entries", []):
+            tid = (entry.get("team") or {}).get("id")
+            if tid is not None:
+                records[str(tid)] = _wins_losses(entry.get("stats", []))
+        stack.extend(node.get("children", []))
+    return records
+
+
+def get_season_records(
+    season: int, session: Optional[requests.Session] = None
+) -> Dict[str, Dict[str, Optional[int]]]:
+    """
+    Every team's record for `season` from one standings call. Returns {} if
+    the call fails; callers then fall back to per-team get_record().
+    """
+    try:
+        resp = _get(STANDINGS_URL.format(season=season), session)
+        resp.raise_for_status()
+        return parse_standings(resp.json())
+    except Exception as e:
+        print(f"[WARN] Standings for {season} unavailable ({e}); using per-team records")
+        return {}
+
+
+# Stat names ESPN uses for team yards, most preferred first. Gross
+# passingYards comes first: it is what offense_passing_yards has always held.
+RUSHING_YARDS_NAMES = ("rushingYards", "rushingYardsNet", "teamRushingYards")
+PASSING_YARDS_NAMES = ("passingYards", "netPassingYards", "teamPassingYards")
+
+
+def _scan_stats(
+    payload: Any, groups: Dict[str, Sequence[str]]
+) -> Dict[str, Optional[float]]:
+    """
+    Find numeric stat values for each key in `groups`, where each key maps
+    to the stat names that may hold it (most preferred first).
+
+    Looks in splits.categories[*].stats[*] first, which is where ESPN puts
+    team stats, and only walks the whole payload (iteratively) if some key
+    was not found there. Either pass stops as soon as every key has its
+    most preferred name.
+    """
+    lookup: Dict[str, List[Tuple[str, int]]] = {}
+    for key, names in groups.items():
+        for rank, name in enumerate(names):
+            lookup.setdefault(name, []).append((key, rank))
+
+    best: Dict[str, Tuple[int, float]] = {}
+    pending = set(groups)
+
+    def offer(obj: Dict[str, Any]) -> bool:
+        """Record obj if it is a wanted stat; True once nothing is pending."""
+        hits = lookup.get(obj.get("name"))
+        value = obj.get("value")
+        if hits and isinstance(value, (int, float)) and not isinstance(value, bool):
+            for key, rank in hits:
+                if key not in best or rank < best[key][0]:
+                    best[key] = (rank, float(value))
+                    if rank == 0:
+                        pending.discard(key)
+        return not pending
+
+    def result() -> Dict[str, Optional[float]]:
+        return {key: best[key][1] if key in best else None for key in groups}
+
+    splits = payload.get("splits") if isinstance(payload, dict) else None
+    categories = splits.get("categories") if isinstance(splits, dict) else None
+    for category in categories if isinstance(categories, list) else []:
+        stats = category.get("stats") if isinstance(category, dict) else None
+        for stat in stats if isinstance(stats, list) else []:
+            if isinstance(stat, dict) and offer(stat):
+                return result()
+
+    if len(best) == len(groups):
+        return result()
+
+    # Fallback: depth-first walk of the whole payload, in document order.
+    stack: List[Any] = [payload]
+    while stack:
+        obj = stack.pop()
         if isinstance(obj, dict):
-            name = obj.get("name")
-            value = obj.get("value")
+            if offer(obj):
+                break
+            stack.extend(reversed(list(obj.values())))
+        elif isinstance(obj, list):
+            stack.extend(reversed(obj))
 
-            # These names are based on how ESPN typically labels team stats.
-            if name in ("rushingYards", "rushingYardsNet", "teamRushingYards"):
-                if isinstance(value, (int, float)):
-                    rushing = float(value)
+    return result()
 
-            if name in ("netPassingYards", "passingYards", "teamPassingYards"):
-                if isinstance(value, (int, float)):
-                    passing = float(value)
 
-            for v in obj.values():
-                walk(v)
+def extract_stats(payload: Any, names: Iterable[str]) -> Dict[str, Optional[float]]:
+    """
+    Values for several named stats (e.g. "rushingAttempts",
+    "rushingTouchdowns", "rushingFirstDowns") in one pass over an ESPN
+    statistics payload. Missing stats come back as None.
+    """
+    return _scan_stats(payload, {name: (name,) for name in names})
 
-        elif isinstance(obj, list):
-            for v in obj:
-                walk(v)
 
-    walk(payload)
-    return rushing, passing
+def _extract_yards_from_stats(payload: Any) -> Tuple[float, float]:
 
+    found = _scan_stats(
+        payload,
+        {"rushing": RUSHING_YARDS_NAMES, "passing": PASSING_YARDS_NAMES},
+    )
+    return found["rushing"], found["passing"]
+
+
+def extract_all_stats(payload: Any) -> Dict[str, float]:
+    """
+    Every numeric stat in splits.categories[*].stats[*], flattened to
+    {"<category>_<stat name>": value}, e.g. "rushing_rushingAttempts".
+    """
+    out: Dict[str, float] = {}
+    splits = payload.get("splits") if isinstance(payload, dict) else None
+    categories = splits.get("categories") if isinstance(splits, dict) else None
+    for category in categories if isinstance(categories, list) else []:
+        if not isinstance(category, dict):
+            continue
+        prefix = category.get("name") or "stats"
+        for stat in category.get("stats") or []:
+            if not isinstance(stat, dict) or not stat.get("name"):
+                continue
+            value = stat.get("value")
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                out[f"{prefix}_{stat['name']}"] = float(value)
+    return out
 
-def get_offense_yards(team_id: str, season: int) -> Dict[str, float]:
 
+def get_stats_payload(
+    team_id: str, season: int, session: Optional[requests.Session] = None
+) -> Any:
     url = TEAM_STATS_URL.format(season=season, team_id=team_id)
-    resp = requests.get(url, timeout=30)
+    resp = _get(url, session)
     resp.raise_for_status()
-    stats_json = resp.json()
+    return resp.json()
+
 
+def _offense_yards(stats_json: Any) -> Dict[str, float]:
     rushing, passing = _extract_yards_from_stats(stats_json)
 
     return {
@@ -124,11 +284,24 @@ def get_offense_yards(team_id: str, season: int) -> Dict[str, float]:
     }
 
 
-def get_team_summary(team: Dict[str, str], season: int) -> Dict[str, Any]:
- 
-    tid = team["id"]
-    out: Dict[str, Any] = {
-        "id": tid,
+def get_offense_yards(
+    team_id: str, season: int, session: Optional[requests.Session] = None
+) -> Dict[str, float]:
+
+    return _offense_yards(get_stats_payload(team_id, season, session))
+
+
+def get_all_stats(
+    team_id: str, season: int, session: Optional[requests.Session] = None
+) -> Tuple[Dict[str, float], Dict[str, float]]:
+    """Offense yards plus every stat in the payload, from a single request."""
+    stats_json = get_stats_payload(team_id, season, session)
+    return _offense_yards(stats_json), extract_all_stats(stats_json)
+
+
+def _empty_summary(team: Dict[str, str], season: int) -> Dict[str, Any]:
+    return {
+        "id": team["id"],
         "name": team["name"],
         "abbrev": team["abbrev"],
         "season": season,
@@ -136,15 +309,39 @@ def get_team_summary(team: Dict[str, str], season: int) -> Dict[str, Any]:
         "stats": {},
     }
 
+
+def get_team_summary(
+    team: Dict[str, str],
+    season: int,
+    session: Optional[requests.Session] = None,
+    all_stats: bool = False,
+    record: Optional[Dict[str, Optional[int]]] = None,
+) -> Dict[str, Any]:
+    """
+    With `all_stats`, the result also carries "all_stats" (see
+    extract_all_stats); save_season_file stores that part as a columnar file.
+    A `record` already known (e.g. from get_season_records) skips the
+    per-team record call.
+    """
+
+    tid = team["id"]
+    out = _empty_summary(team, season)
+
     # Record (wins/losses)
-    try:
-        out["record"] = get_record(tid, season)
-    except Exception as e:
-        out["record"] = {"wins": None, "losses": None, "error": str(e)}
+    if record is not None:
+        out["record"] = record
+    else:
+        try:
+            out["record"] = get_record(tid, season, session)
+        except Exception as e:
+            out["record"] = {"wins": None, "losses": None, "error": str(e)}
 
     # Offense yards
     try:
-        yards = get_offense_yards(tid, season)
+        if all_stats:
+            yards, out["all_stats"] = get_all_stats(tid, season, session)
+        else:
+            yards = get_offense_yards(tid, season, session)
         out["stats"].update(yards)
     except Exception as e:
         out["stats"]["error"] = str(e)
@@ -152,41 +349,571 @@ def get_team_summary(team: Dict[str, str], season: int) -> Dict[str, Any]:
     return out
 
 
-def fetch_league_team_stats(season: int, throttle: float = 0.3) -> List[Dict[str, Any]]:
+def paces_requests(session: Optional[requests.Session]) -> bool:
+    """True if `session` rate-limits itself (a ResilientAdapter with a rate)."""
+    if session is None:
+        return False
+    return any(
+        isinstance(a, ResilientAdapter) and a.rate for a in getattr(session, "adapters", {}).values()
+    )
+
 
-    teams = list_teams()
-    all_stats: List[Dict[str, Any]] = []
+def fetch_league_team_stats(
+    season: int,
+    throttle: Optional[float] = None,
+    session: Optional[requests.Session] = None,
+    teams: Optional[List[Dict[str, str]]] = None,
+    all_stats: bool = False,
+    standings: bool = True,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Record and offense yards for every team in `season`. With `standings`,
+    records come from one league-wide standings call and only teams missing
+    from it get a per-team record call. `on_result` is called with each
+    team's summary as soon as it is ready (e.g. to stream it to disk).
+    """
+    if teams is None:
+        teams = list_teams(session)
+    records = get_season_records(season, session) if standings else {}
+    all_stats_rows: List[Dict[str, Any]] = []
+
+    # Fixed pause between teams, unless the session's adaptive rate does the pacing.
+    if throttle is None:
+        throttle = 0.0 if paces_requests(session) else 0.3
 
     for t in teams:
         if not t.get("id"):
             continue
 
         print(f"Fetching {t['abbrev']} ({t['id']}) for {season}...")
-        all_stats.append(get_team_summary(t, season))
+        summary = get_team_summary(
+            t, season, session, all_stats=all_stats, record=records.get(str(t["id"]))
+        )
+        all_stats_rows.append(summary)
+        if on_result is not None:
+            on_result(summary)
 
         # Be a bit gentle with ESPN's servers
         if throttle > 0:
             time.sleep(throttle)
 
-    return all_stats
+    return all_stats_rows
+
+
+async def _get_team_summary_async(
+    team: Dict[str, str],
+    season: int,
+    sem: asyncio.Semaphore,
+    bucket: Optional[TokenBucket],
+    session: Optional[requests.Session] = None,
+    all_stats: bool = False,
+    record: Optional[Dict[str, Optional[int]]] = None,
+) -> Dict[str, Any]:
+    """
+    Same result as get_team_summary, but the record and statistics calls
+    run concurrently. Each HTTP call holds a semaphore slot and a token
+    (no bucket: the session paces itself).
+    """
+    tid = team["id"]
+    out = _empty_summary(team, season)
+
+    async def call(fn):
+        async with sem:
+            if bucket is not None:
+                await bucket.acquire()
+            return await asyncio.to_thread(fn, tid, season, session)
+
+    async def known():
+        return record
+
+    record, yards = await asyncio.gather(
+        known() if record is not None else call(get_record),
+        call(get_all_stats if all_stats else get_offense_yards),
+        return_exceptions=True,
+    )
+
+    if isinstance(record, Exception):
+        out["record"] = {"wins": None, "losses": None, "error": str(record)}
+    else:
+        out["record"] = record
+
+    if isinstance(yards, Exception):
+        out["stats"]["error"] = str(yards)
+    elif all_stats:
+        out["stats"].update(yards[0])
+        out["all_stats"] = yards[1]
+    else:
+        out["stats"].update(yards)
+
+    return out
+
+
+async def fetch_league_team_stats_async(
+    season: int,
+    concurrency: int = 8,
+    rate: float = 10.0,
+    burst: float | None = None,
+    session: Optional[requests.Session] = None,
+    teams: Optional[List[Dict[str, str]]] = None,
+    all_stats: bool = False,
+    standings: bool = True,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Concurrent version of fetch_league_team_stats.
+
+    At most `concurrency` requests are in flight at once and requests are
+    started at no more than `rate` per second (token bucket, `burst` tokens
+    deep). If the session paces itself (see paces_requests), its adaptive
+    rate is left to do that alone, so it can climb up to its max rate.
+    Results come back in the same team order as the serial version;
+    `on_result` sees them in completion order.
+    """
+    if teams is None:
+        teams = await asyncio.to_thread(list_teams, session)
+    teams = [t for t in teams if t.get("id")]
+
+    sem = asyncio.Semaphore(max(1, concurrency))
+    bucket = None if paces_requests(session) else TokenBucket(rate, burst)
+
+    records: Dict[str, Dict[str, Optional[int]]] = {}
+    if standings:
+        if bucket is not None:
+            await bucket.acquire()
+        records = await asyncio.to_thread(get_season_records, season, session)
+
+    async def one(team: Dict[str, str]) -> Dict[str, Any]:
+        summary = await _get_team_summary_async(
+            team, season, sem, bucket, session, all_stats, records.get(str(team["id"]))
+        )
+        if on_result is not None:
+            on_result(summary)
+        return summary
+
+    print(f"Fetching {len(teams)} teams for {season} (concurrency={concurrency}, rate={rate}/s)...")
+    return list(await asyncio.gather(*(one(t) for t in teams)))
+
+
+def parse_seasons(spec: str) -> List[int]:
+    """
+    Parse "2000-2024", "2019,2021,2023" or a mix like "2000-2005,2010".
+    """
+    seasons: List[int] = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = (int(x) for x in part.split("-", 1))
+            if end < start:
+                raise ValueError(f"Bad season range: {part}")
+            seasons.extend(range(start, end + 1))
+        else:
+            seasons.append(int(part))
+    if not seasons:
+        raise ValueError(f"No seasons in {spec!r}")
+    return sorted(set(seasons))
+
+
+def season_output_path(out_dir: str, season: int, fmt: str = "json") -> str:
+    """data/espn_team_stats_YYYY.json, or .jsonl for fmt="jsonl"."""
+    return os.path.join(out_dir, f"espn_team_stats_{season}.{fmt}")
+
+
+def season_columns_path(json_path: str) -> str:
+    """espn_team_stats_YYYY.json(l) -> espn_team_stats_YYYY.parquet"""
+    return os.path.splitext(json_path)[0] + ".parquet"
+
+
+def is_jsonl(path: str) -> bool:
+    return path.lower().endswith(".jsonl")
+
+
+def _json_row(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """A summary as stored in the JSON file ("all_stats" goes to Parquet)."""
+    return {k: v for k, v in entry.items() if k != "all_stats"}
+
+
+@contextmanager
+def season_stream(
+    path: str, append: bool = False
+) -> Iterator[Optional[Callable[[Dict[str, Any]], None]]]:
+    """
+    For a .jsonl season file, yield an on_result callback that appends and
+    flushes each summary as it arrives; for .json files, yield None.
+    """
+    if not is_jsonl(path):
+        yield None
+        return
+    with JsonLinesWriter(path, append=append) as writer:
+        yield lambda entry: writer.write(_json_row(entry))
+
+
+def save_season_columns(path: str, data: List[Dict[str, Any]]) -> None:
+    """
+    Write the "all_stats" part of get_team_summary results as one row per
+    team (team_id, season, <category>_<stat>...). Rows already in the file
+    for teams not in `data` are kept, so incremental refreshes can patch it.
+    """
+    rows = [
+        {"team_id": str(e["id"]), "season": e.get("season"), **e["all_stats"]}
+        for e in data
+        if "all_stats" in e
+    ]
+    if not rows:
+        return
+
+    df = pd.DataFrame(rows)
+    if os.path.exists(path):
+        old = read_frame(path)
+        df = pd.concat([old[~old["team_id"].isin(df["team_id"])], df], ignore_index=True)
+
+    stat_cols = sorted(c for c in df.columns if c not in ("team_id", "season"))
+    df = df[["team_id", "season"] + stat_cols]
+    df["team_id"] = df["team_id"].astype(str)
+    df["season"] = pd.to_numeric(df["season"], errors="coerce").astype("Int64")
+    df[stat_cols] = df[stat_cols].astype("float64")
+
+    write_frame(df, path)
+
+
+def save_season_file(path: str, data: List[Dict[str, Any]]) -> None:
+    """
+    Write a season file atomically, so a crash never leaves it truncated.
+    "all_stats" entries go to the .parquet next to it instead of the JSON.
+    A .jsonl path is written as JSON Lines (one team per line), which also
+    compacts any lines streamed to it earlier.
+    """
+    rows = [_json_row(e) for e in data]
+    if is_jsonl(path):
+        body = "".join(json.dumps(r) + "\n" for r in rows)
+    else:
+        body = json.dumps(rows, indent=2)
+    atomic_write(path, body.encode("utf-8"))
+    save_season_columns(season_columns_path(path), data)
+
+
+def load_season_file(path: str) -> List[Dict[str, Any]]:
+    """
+    Existing season file contents, or [] if there is none yet. For .jsonl
+    files the last line per team wins, so partially streamed or appended
+    files read back as one entry per team.
+    """
+    if not os.path.exists(path):
+        return []
+    if is_jsonl(path):
+        by_id: Dict[str, Dict[str, Any]] = {}
+        for i, entry in enumerate(iter_json_lines(path)):
+            by_id[str(entry.get("id", f"line{i}"))] = entry
+        return list(by_id.values())
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def needs_refetch(entry: Dict[str, Any]) -> bool:
+    """
+    True if a stored get_team_summary result is incomplete: an error was
+    recorded, or wins/losses/yards are missing.
+    """
+    record = entry.get("record") or {}
+    stats = entry.get("stats") or {}
+    if "error" in record or "error" in stats:
+        return True
+    if record.get("wins") is None or record.get("losses") is None:
+        return True
+    return (
+        stats.get("offense_rushing_yards") is None
+        or stats.get("offense_passing_yards") is None
+    )
+
+
+def _fetch_teams(
+    season: int,
+    teams: List[Dict[str, str]],
+    mode: str,
+    concurrency: int,
+    rate: float,
+    session: Optional[requests.Session],
+    all_stats: bool = False,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> List[Dict[str, Any]]:
+    if mode == "async":
+        return asyncio.run(
+            fetch_league_team_stats_async(
+                season,
+                concurrency,
+                rate,
+                session=session,
+                teams=teams,
+                all_stats=all_stats,
+                on_result=on_result,
+            )
+        )
+    return fetch_league_team_stats(
+        season, session=session, teams=teams, all_stats=all_stats, on_result=on_result
+    )
+
+
+def refresh_season(
+    season: int,
+    path: str,
+    teams: List[Dict[str, str]],
+    mode: str = "serial",
+    concurrency: int = 8,
+    rate: float = 10.0,
+    session: Optional[requests.Session] = None,
+    all_stats: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Incremental refresh of one season file: refetch only teams that are
+    missing from it or whose entry needs_refetch(), merge them back in team
+    order and rewrite the file atomically. For .jsonl files each refetched
+    team is also appended as it arrives, so an interrupted refresh keeps
+    its progress. With `all_stats`, teams missing from the season's
+    .parquet columns file are refetched too, so it gets backfilled.
+    """
+    existing = {str(e.get("id")): e for e in load_season_file(path)}
+
+    have_columns = None
+    if all_stats:
+        columns_path = season_columns_path(path)
+        have_columns = set()
+        if os.path.exists(columns_path):
+            have_columns = set(read_frame(columns_path, ["team_id"])["team_id"].astype(str))
+
+    def stale(tid: str) -> bool:
+        if tid not in existing or needs_refetch(existing[tid]):
+            return True
+        return have_columns is not None and tid not in have_columns
+
+    todo = [t for t in teams if t.get("id") and stale(str(t["id"]))]
+    print(f"{season}: {len(todo)} of {len(teams)} teams need fetching")
+
+    if todo:
+        with season_stream(path, append=True) as on_result:
+            fetched = _fetch_teams(
+                season, todo, mode, concurrency, rate, session, all_stats, on_result
+            )
+        for entry in fetched:
+            existing[str(entry["id"])] = entry
+
+    order = [t["id"] for t in teams if t.get("id")]
+    known = set(order)
+    merged = [existing[tid] for tid in order if tid in existing]
+    merged += [e for tid, e in existing.items() if tid not in known]
+
+    save_season_file(path, merged)
+    return merged
+
+
+def fetch_seasons(
+    seasons: List[int],
+    out_dir: str = "data",
+    mode: str = "serial",
+    concurrency: int = 8,
+    rate: float = 10.0,
+    session: Optional[requests.Session] = None,
+    incremental: bool = False,
+    all_stats: bool = False,
+    fmt: str = "json",
+) -> List[str]:
+    """
+    Backfill several seasons with one pooled session and a single team-list
+    call. Writes data/espn_team_stats_YYYY.json per season (.jsonl with
+    fmt="jsonl", streamed team by team) and returns the written paths. With
+    `incremental`, existing files are only patched (see refresh_season).
+    With `all_stats`, every stat in the payload is also written to
+    espn_team_stats_YYYY.parquet.
+    """
+    session = session or make_session(pool_size=max(concurrency, 1), retries=3, rate=rate)
+    os.makedirs(out_dir, exist_ok=True)
+
+    teams = list_teams(session)
+    paths: List[str] = []
+
+    for season in seasons:
+        path = season_output_path(out_dir, season, fmt)
+        with instrument.stage(f"season {season}"):
+            if incremental:
+                data = refresh_season(
+                    season, path, teams, mode, concurrency, rate, session, all_stats
+                )
+            else:
+                with season_stream(path) as on_result:
+                    data = _fetch_teams(
+                        season, teams, mode, concurrency, rate, session, all_stats, on_result
+                    )
+                save_season_file(path, data)
+        print(f"Saved {len(data)} team records to {path}")
+        paths.append(path)
+
+    return paths
 
 
 def main() -> None:
     parser = argparse.ArgumentParser()
-    parser.add_argument("--season", type=int, required=True, help="NFL season year")
+    which = parser.add_mutually_exclusive_group(required=True)
+    which.add_argument("--season", type=int, help="NFL season year")
+    which.add_argument(
+        "--seasons",
+        type=str,
+        help="Season range to backfill, e.g. 2000-2024 (writes one file per season)",
+    )
     parser.add_argument(
         "--save",
         type=str,
         default="",
         help="Path to save JSON output (e.g., data/espn_team_stats_2024.json)",
     )
+    parser.add_argument(
+        "--out-dir",
+        type=str,
+        default="data",
+        help="Output directory for --seasons (espn_team_stats_YYYY.json)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("json", "jsonl"),
+        default="json",
+        help="Season file format for --out-dir; jsonl appends and flushes each "
+        "team as it is fetched (a --save path ending in .jsonl does the same)",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=("serial", "async"),
+        default="serial",
+        help="serial: one team at a time; async: concurrent requests",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Max requests in flight (async mode)",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=10.0,
+        help="Requests per second to start at; adapts between 0.5 and --max-rate "
+        "as ESPN answers with errors or successes",
+    )
+    parser.add_argument(
+        "--max-rate",
+        type=float,
+        default=0.0,
+        help="Upper bound for the adaptive request rate (default 2 x --rate)",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=3,
+        help="Retries per request on 429/5xx/connection errors (jittered "
+        "exponential backoff, Retry-After honoured)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default="",
+        help="Cache responses on disk here (e.g. data/http_cache); "
+        "completed seasons are then never refetched",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=3600.0,
+        help="Seconds before a cached current-season response is revalidated",
+    )
+    parser.add_argument(
+        "--incremental",
+        "--resume",
+        action="store_true",
+        help="Only refetch teams missing from, or errored/null in, the existing "
+        "output file(s) and merge them back",
+    )
+    parser.add_argument(
+        "--all-stats",
+        action="store_true",
+        help="Also keep every stat in the /statistics payload, written as "
+        "espn_team_stats_YYYY.parquet next to the JSON",
+    )
+    parser.add_argument(
+        "--timing-report",
+        type=str,
+        default="",
+        help="Record per-request latency/bytes/status and per-season timings "
+        "and write them here (e.g. data/timing.json, plus _http/_stages CSVs)",
+    )
     args = parser.parse_args()
 
-    data = fetch_league_team_stats(args.season)
+    recorder = instrument.enable() if args.timing_report else None
+    try:
+        with instrument.stage("espn_nfl"):
+            _run(args)
+    finally:
+        if recorder is not None:
+            recorder.write_report(args.timing_report)
+
+
+def _run(args: argparse.Namespace) -> None:
+    session = make_session(
+        pool_size=max(args.concurrency, 1),
+        cache_dir=args.cache_dir,
+        ttl=args.cache_ttl,
+        is_immutable=is_completed_season_url,
+        retries=args.retries,
+        rate=args.rate,
+        max_rate=args.max_rate or None,
+    )
+
+    if args.seasons:
+        fetch_seasons(
+            parse_seasons(args.seasons),
+            out_dir=args.out_dir,
+            mode=args.mode,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            session=session,
+            incremental=args.incremental,
+            all_stats=args.all_stats,
+            fmt=args.format,
+        )
+        return
+
+    if args.incremental:
+        path = args.save or season_output_path(args.out_dir, args.season, args.format)
+        data = refresh_season(
+            args.season,
+            path,
+            list_teams(session),
+            args.mode,
+            args.concurrency,
+            args.rate,
+            session,
+            args.all_stats,
+        )
+        print(f"Saved {len(data)} team records to {path}")
+        return
+
+    with season_stream(args.save) as on_result:
+        if args.mode == "async":
+            data = asyncio.run(
+                fetch_league_team_stats_async(
+                    args.season,
+                    args.concurrency,
+                    args.rate,
+                    session=session,
+                    all_stats=args.all_stats,
+                    on_result=on_result,
+                )
+            )
+        else:
+            data = fetch_league_team_stats(
+                args.season, session=session, all_stats=args.all_stats, on_result=on_result
+            )
 
     if args.save:
-        with open(args.save, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+        save_season_file(args.save, data)
         print(f"Saved {len(data)} team records to {args.save}")
     else:
         # Just preview the first couple of teams
@@ -0,0 +1,465 @@
+"""
+Shared HTTP helpers for the ESPN / OverTheCap fetchers.
+"""
+
+import asyncio
+import email.utils
+import hashlib
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from src import instrument
+
+
+# Hosts the fetchers talk to -> environment variable that, when set,
+# replaces scheme://host for that service (e.g. ESPN_BASE_URL=
+# http://127.0.0.1:8765 to use the stand-in server in src/api/standin.py).
+BASE_URL_ENV = {
+    "site.api.espn.com": "ESPN_BASE_URL",
+    "sports.core.api.espn.com": "ESPN_BASE_URL",
+    "overthecap.com": "OTC_BASE_URL",
+    "www.pro-football-reference.com": "PFR_BASE_URL",
+}
+
+
+def resolve_url(url: str) -> str:
+    """`url` with its host swapped for the service's *_BASE_URL override, if set."""
+    parts = urlsplit(url)
+    base = os.environ.get(BASE_URL_ENV.get(parts.netloc, ""), "")
+    if not base:
+        return url
+    out = base.rstrip("/") + parts.path
+    return f"{out}?{parts.query}" if parts.query else out
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter.
+
+    `rate` tokens are added per second up to `capacity`; every request
+    takes one token. Bursts up to `capacity` go out immediately, after
+    that requests are spaced at 1 / rate seconds.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self._sync_lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def _take(self) -> float:
+        """Take a token if one is available, else return seconds to wait."""
+        self._refill()
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return 0.0
+        return (1.0 - self._tokens) / self.rate
+
+    async def acquire(self) -> None:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            wait = self._take()
+            while wait > 0:
+                await asyncio.sleep(wait)
+                wait = self._take()
+
+    def acquire_sync(self) -> None:
+        """Blocking acquire for worker threads."""
+        with self._sync_lock:
+            wait = self._take()
+            while wait > 0:
+                time.sleep(wait)
+                wait = self._take()
+
+    def set_rate(self, rate: float) -> None:
+        """Change the refill rate; tokens earned so far are kept."""
+        self._refill()
+        self.rate = float(rate)
+
+
+def atomic_write(path: str, data: bytes) -> None:
+    """Write `data` to `path` via a temp file + rename in the same directory."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+class ResponseCache:
+    """
+    On-disk cache of GET response bodies.
+
+    Layout under `cache_dir`:
+      meta/<sha256(url)>.json     url, etag, last_modified, fetched_at, body hash
+      bodies/<sha256(body)>       raw body, shared by identical payloads
+    Writes go through a temp file + rename, so concurrent threads never see
+    a half-written entry.
+    """
+
+    def __init__(self, cache_dir: str) -> None:
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def _hash(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def _meta_path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, "meta", self._hash(url.encode("utf-8")) + ".json")
+
+    def _body_path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, "bodies", digest)
+
+    def load(self, url: str) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        try:
+            with open(self._meta_path(url), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(self._body_path(meta["body"]), "rb") as f:
+                body = f.read()
+        except (OSError, ValueError, KeyError):
+            return None
+        return meta, body
+
+    def store(self, url: str, resp: requests.Response) -> Dict[str, Any]:
+        body = resp.content
+        digest = self._hash(body)
+        body_path = self._body_path(digest)
+        if not os.path.exists(body_path):
+            atomic_write(body_path, body)
+
+        meta = {
+            "url": url,
+            "body": digest,
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "content_type": resp.headers.get("Content-Type"),
+            "fetched_at": time.time(),
+        }
+        self._write_meta(url, meta)
+        return meta
+
+    def touch(self, url: str, meta: Dict[str, Any]) -> None:
+        """Mark an entry as freshly revalidated (after a 304)."""
+        meta = dict(meta, fetched_at=time.time())
+        self._write_meta(url, meta)
+
+    def _write_meta(self, url: str, meta: Dict[str, Any]) -> None:
+        atomic_write(self._meta_path(url), json.dumps(meta).encode("utf-8"))
+
+
+def _cached_response(url: str, meta: Dict[str, Any], body: bytes) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.url = url
+    resp._content = body
+    resp.encoding = "utf-8"
+    resp.headers = CaseInsensitiveDict()
+    if meta.get("content_type"):
+        resp.headers["Content-Type"] = meta["content_type"]
+    resp.from_cache = True
+    return resp
+
+
+class CachedSession(requests.Session):
+    """
+    requests.Session with a persistent response cache for GETs.
+
+    - URLs for which `is_immutable(url)` is true (e.g. completed seasons)
+      are served from disk with no network call once cached.
+    - Other URLs are served from disk for `ttl` seconds, then revalidated
+      with If-None-Match / If-Modified-Since; a 304 keeps the cached body.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        ttl: float = 3600.0,
+        is_immutable: Optional[Callable[[str], bool]] = None,
+    ) -> None:
+        super().__init__()
+        self.cache = ResponseCache(cache_dir)
+        self.ttl = ttl
+        self.is_immutable = is_immutable or (lambda url: False)
+
+    def request(self, method, url, *args, **kwargs):
+        if str(method).upper() != "GET":
+            return super().request(method, url, *args, **kwargs)
+
+        full_url = requests.Request("GET", url, params=kwargs.get("params")).prepare().url
+        entry = self.cache.load(full_url)
+
+        if entry is not None:
+            meta, body = entry
+            fresh = time.time() - meta.get("fetched_at", 0) < self.ttl
+            if fresh or self.is_immutable(full_url):
+                return _cached_response(full_url, meta, body)
+
+            headers = dict(kwargs.pop("headers", None) or {})
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+            kwargs["headers"] = headers
+
+        resp = super().request(method, url, *args, **kwargs)
+
+        if resp.status_code == 304 and entry is not None:
+            meta, body = entry
+            self.cache.touch(full_url, meta)
+            return _cached_response(full_url, meta, body)
+
+        if resp.status_code == 200:
+            self.cache.store(full_url, resp)
+        resp.from_cache = False
+        return resp
+
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRY_METHODS = frozenset({"GET", "HEAD"})
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised instead of sending a request to a host whose circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Per-host breaker: after `threshold` consecutive failures the circuit
+    opens and requests fail fast for `reset_after` seconds. Then a single
+    trial request is let through (half-open); its outcome closes or
+    re-opens the circuit.
+    """
+
+    def __init__(self, threshold: int = 5, reset_after: float = 30.0) -> None:
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.reset_after or self._trial:
+                return False
+            self._trial = True
+            return True
+
+    def record(self, ok: bool) -> None:
+        with self._lock:
+            self._trial = False
+            if ok:
+                self.failures = 0
+                self.opened_at = None
+                return
+            self.failures += 1
+            if self.opened_at is not None or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+class AdaptiveRate:
+    """
+    AIMD request rate for one host: +`step` requests/s after every success
+    (up to `max_rate`), halved after a 429/5xx/connection error (down to
+    `min_rate`). Requests wait on a TokenBucket running at the current rate.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        min_rate: float = 0.5,
+        max_rate: Optional[float] = None,
+        step: float = 0.5,
+    ) -> None:
+        self.min_rate = min(min_rate, rate)
+        self.max_rate = max_rate or 2 * rate
+        self.step = step
+        self.bucket = TokenBucket(rate, capacity=1.0)
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self.bucket.rate
+
+    def wait(self) -> None:
+        self.bucket.acquire_sync()
+
+    def record(self, ok: bool) -> None:
+        with self._lock:
+            if ok:
+                rate = min(self.max_rate, self.rate + self.step)
+            else:
+                rate = max(self.min_rate, self.rate / 2)
+            if rate != self.rate:
+                self.bucket.set_rate(rate)
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Retry-After as seconds; accepts delta-seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class ResilientAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that retries idempotent requests on 429/5xx and connection
+    errors with jittered exponential backoff (Retry-After wins when sent),
+    paces each host with an AdaptiveRate (if `rate` is given) and fails fast
+    through a per-host CircuitBreaker while a host is down. After the last
+    attempt the final response is returned (or the error re-raised), so
+    callers still see it via raise_for_status().
+    """
+
+    def __init__(
+        self,
+        retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        rate: Optional[float] = None,
+        max_rate: Optional[float] = None,
+        breaker_threshold: int = 5,
+        breaker_reset: float = 30.0,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.rate = rate
+        self.max_rate = max_rate
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset = breaker_reset
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.limiters: Dict[str, AdaptiveRate] = {}
+        self.sleep = time.sleep
+        self._lock = threading.Lock()
+
+    def _host_state(self, host: str) -> Tuple[CircuitBreaker, Optional[AdaptiveRate]]:
+        with self._lock:
+            if host not in self.breakers:
+                self.breakers[host] = CircuitBreaker(self.breaker_threshold, self.breaker_reset)
+                if self.rate:
+                    self.limiters[host] = AdaptiveRate(self.rate, max_rate=self.max_rate)
+            return self.breakers[host], self.limiters.get(host)
+
+    def _delay(self, attempt: int, resp: Optional[requests.Response]) -> float:
+        if resp is not None:
+            after = retry_after_seconds(resp.headers.get("Retry-After"))
+            if after is not None:
+                return min(after, self.max_backoff)
+        # "Full jitter": uniform in [0, backoff * 2^attempt].
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def send(self, request, **kwargs):
+        host = urlsplit(request.url).netloc
+        breaker, limiter = self._host_state(host)
+        attempts = 1 + (self.retries if request.method in RETRY_METHODS else 0)
+
+        for attempt in range(attempts):
+            if not breaker.allow():
+                raise CircuitOpenError(f"Circuit open for {host}; not sending {request.url}")
+            if limiter is not None:
+                limiter.wait()
+
+            resp, error = None, None
+            try:
+                resp = super().send(request, **kwargs)
+                ok = resp.status_code not in RETRY_STATUSES
+            except (requests.ConnectionError, requests.Timeout) as e:
+                ok, error = False, e
+            except BaseException:
+                # Anything else (InvalidURL, KeyboardInterrupt, ...) is not
+                # retried, but still counts so a half-open trial slot is freed.
+                breaker.record(False)
+                raise
+
+            breaker.record(ok)
+            if limiter is not None:
+                limiter.record(ok)
+            last = attempt == attempts - 1
+            if error is not None and last:
+                raise error
+            if ok or last:
+                return resp
+
+            delay = self._delay(attempt, resp)
+            if resp is not None:
+                resp.close()
+            self.sleep(delay)
+
+        return resp
+
+
+def make_session(
+    pool_size: int = 16,
+    cache_dir: str = "",
+    ttl: float = 3600.0,
+    is_immutable: Optional[Callable[[str], bool]] = None,
+    retries: int = 0,
+    rate: Optional[float] = None,
+    max_rate: Optional[float] = None,
+) -> requests.Session:
+    """
+    Keep-alive session whose connection pool is large enough for
+    `pool_size` concurrent requests to the same host. With `cache_dir`,
+    responses are cached on disk (see CachedSession). With `retries` or
+    `rate`, requests go through a ResilientAdapter (retry/backoff, adaptive
+    per-host rate starting at `rate` req/s, circuit breaker). Requests are
+    logged to the timing report when src.instrument is enabled.
+    """
+    if cache_dir:
+        session: requests.Session = CachedSession(cache_dir, ttl, is_immutable)
+    else:
+        session = requests.Session()
+    if retries or rate:
+        adapter: HTTPAdapter = ResilientAdapter(
+            retries=retries,
+            rate=rate,
+            max_rate=max_rate,
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+        )
+    else:
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if instrument.active() is not None:
+        instrument.instrument_session(session)
+    return session
@@ -0,0 +1,303 @@
+"""
+Local stand-in for the ESPN, OverTheCap and Pro-Football-Reference
+endpoints, for offline tests and fetch benchmarks.
+
+It replays recorded payloads from a fixture directory:
+
+    espn/teams.json                       TEAM_LIST_URL
+    espn/standings.json                   STANDINGS_URL
+    espn/record_<team_id>.json            TEAM_RECORD_URL (falls back to espn/record.json)
+    espn/statistics_<team_id>.json        TEAM_STATS_URL  (falls back to espn/statistics.json)
+    espn/scoreboard_week<week>.json       espn_games.SCOREBOARD_URL
+    espn/game_statistics_<team_id>.json   espn_games.COMPETITOR_STATS_URL
+                                          (falls back to espn/game_statistics.json)
+    otc/<position slug>.html              OTC contract-history pages
+    pfr/rushing_<season>.html             PFR rushing pages
+
+and can add latency, random 500s and random 429s (with Retry-After).
+Point the fetchers at it with the *_BASE_URL overrides (see
+src.api.http.resolve_url):
+
+    python -m src.api.standin --port 8765 --latency 0.05 --throttle-rate 0.05
+    ESPN_BASE_URL=http://127.0.0.1:8765 python -m src.api.espn_nfl --season 2024 --save out.json
+
+`--record SEASON [--fixtures DIR]` saves fresh payloads from the real ESPN
+API into DIR/espn (default tests/fixtures) to refresh the fixtures.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+FIXTURE_DIR = os.path.join("tests", "fixtures")
+
+BASE_URL_VARS = ("ESPN_BASE_URL", "OTC_BASE_URL", "PFR_BASE_URL")
+
+# Path pattern -> candidate fixture files (first that exists is served).
+# "{name}" in a candidate is filled from the query string; a candidate
+# naming a parameter the request does not have is skipped.
+ROUTES: List[Tuple[re.Pattern, Callable[[re.Match], List[str]]]] = [
+    (
+        re.compile(r"^/apis/site/v2/sports/football/nfl/teams$"),
+        lambda m: ["espn/teams.json"],
+    ),
+    (
+        re.compile(r"^/apis/v2/sports/football/nfl/standings$"),
+        lambda m: ["espn/standings.json"],
+    ),
+    (
+        re.compile(r"^/v2/sports/football/leagues/nfl/seasons/\d+/types/\d+/teams/(\d+)/record$"),
+        lambda m: [f"espn/record_{m.group(1)}.json", "espn/record.json"],
+    ),
+    (
+        re.compile(r"^/v2/sports/football/leagues/nfl/seasons/\d+/types/\d+/teams/(\d+)/statistics$"),
+        lambda m: [f"espn/statistics_{m.group(1)}.json", "espn/statistics.json"],
+    ),
+    (
+        re.compile(r"^/apis/site/v2/sports/football/nfl/scoreboard$"),
+        lambda m: ["espn/scoreboard_week{week}.json"],
+    ),
+    (
+        re.compile(
+            r"^/v2/sports/football/leagues/nfl/events/\d+/competitions/\d+/competitors/(\d+)/statistics$"
+        ),
+        lambda m: [f"espn/game_statistics_{m.group(1)}.json", "espn/game_statistics.json"],
+    ),
+    (
+        re.compile(r"^/contract-history/([\w-]+)$"),
+        lambda m: [f"otc/{m.group(1)}.html"],
+    ),
+    (
+        re.compile(r"^/years/(\d{4})/rushing\.htm$"),
+        lambda m: [f"pfr/rushing_{m.group(1)}.html"],
+    ),
+]
+
+CONTENT_TYPES = {".json": "application/json", ".html": "text/html; charset=utf-8"}
+
+
+class StandInServer:
+    """
+    Threaded HTTP server replaying fixtures from `fixture_dir`.
+
+    - `latency`: seconds added to every response (plus up to `jitter` more)
+    - `error_rate`: fraction of requests answered with 500
+    - `throttle_rate`: fraction answered with 429 and Retry-After: `retry_after`
+    Responses carry an ETag and honour If-None-Match, so the disk cache in
+    src.api.http can be exercised too. `counts` tallies responses by status.
+
+    Use as a context manager; `base_url` is valid while it is running.
+    """
+
+    def __init__(
+        self,
+        fixture_dir: str = FIXTURE_DIR,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: float = 1.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.fixture_dir = fixture_dir
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.counts: Counter = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._bodies: Dict[str, Tuple[bytes, str, str]] = {}
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self) -> Dict[str, str]:
+        """Environment overrides that route every fetcher to this server."""
+        return {var: self.base_url for var in BASE_URL_VARS}
+
+    def start(self) -> "StandInServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def serve_forever(self) -> None:
+        """Serve in the calling thread (for the CLI)."""
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+
+    def _fixture(self, target: str) -> Optional[Tuple[bytes, str, str]]:
+        """(body, ETag, Content-Type) for a request path, or None if nothing is recorded."""
+        path, _, query = target.partition("?")
+        params = {k: v[-1] for k, v in parse_qs(query).items()}
+        for pattern, candidates in ROUTES:
+            m = pattern.match(path)
+            if not m:
+                continue
+            for rel in candidates(m):
+                try:
+                    rel = rel.format(**params)
+                except KeyError:
+                    continue
+                full = os.path.join(self.fixture_dir, rel)
+                if full not in self._bodies and os.path.exists(full):
+                    with open(full, "rb") as f:
+                        body = f.read()
+                    etag = '"%s"' % hashlib.sha256(body).hexdigest()[:16]
+                    ctype = CONTENT_TYPES.get(os.path.splitext(full)[1], "application/octet-stream")
+                    self._bodies[full] = (body, etag, ctype)
+                if full in self._bodies:
+                    return self._bodies[full]
+        return None
+
+    def _draw(self) -> Tuple[float, float]:
+        with self._lock:
+            return self._rng.random(), self._rng.random() * self.jitter
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                roll, extra = server._draw()
+                if server.latency or extra:
+                    time.sleep(server.latency + extra)
+
+                if roll < server.throttle_rate:
+                    self._reply(429, b"", {"Retry-After": f"{server.retry_after:g}"})
+                elif roll < server.throttle_rate + server.error_rate:
+                    self._reply(500, b"")
+                else:
+                    found = server._fixture(self.path)
+                    if found is None:
+                        self._reply(404, b"")
+                    elif self.headers.get("If-None-Match") == found[1]:
+                        self._reply(304, b"", {"ETag": found[1]})
+                    else:
+                        body, etag, ctype = found
+                        self._reply(200, body, {"ETag": etag, "Content-Type": ctype})
+
+            def _reply(self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None) -> None:
+                with server._lock:
+                    server.counts[status] += 1
+                self.send_response(status)
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        return Handler
+
+
+def record_espn_fixtures(out_dir: str, season: int, team_ids: Optional[List[str]] = None) -> None:
+    """
+    Save real ESPN payloads (team list, standings, and record/statistics
+    for `team_ids`, default all teams) under out_dir/espn for replay.
+    """
+    import requests
+
+    from src.api.espn_nfl import STANDINGS_URL, TEAM_LIST_URL, TEAM_RECORD_URL, TEAM_STATS_URL
+
+    def save(url: str, name: str) -> dict:
+        resp = requests.get(url, timeout=30)
+        resp.raise_for_status()
+        path = os.path.join(out_dir, "espn", name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(resp.json(), f, indent=1)
+        return resp.json()
+
+    teams = save(TEAM_LIST_URL, "teams.json")
+    save(STANDINGS_URL.format(season=season), "standings.json")
+    if team_ids is None:
+        league = teams.get("sports", [{}])[0].get("leagues", [{}])[0]
+        team_ids = [t.get("team", {}).get("id") for t in league.get("teams", [])]
+
+    for tid in team_ids:
+        save(TEAM_RECORD_URL.format(season=season, team_id=tid), f"record_{tid}.json")
+        save(TEAM_STATS_URL.format(season=season, team_id=tid), f"statistics_{tid}.json")
+        print(f"Recorded team {tid}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve recorded ESPN/OTC/PFR payloads locally.")
+    parser.add_argument("--fixtures", default=FIXTURE_DIR, help="Fixture directory")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added per response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many extra seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 500s")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of 429s")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After on 429s")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--record",
+        type=int,
+        default=None,
+        metavar="SEASON",
+        help="Record ESPN payloads for SEASON into --fixtures instead of serving",
+    )
+    args = parser.parse_args()
+
+    if args.record is not None:
+        record_espn_fixtures(args.fixtures, args.record)
+        return
+
+    server = StandInServer(
+        args.fixtures,
+        args.host,
+        args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+    for var, value in server.env().items():
+        print(f"{var}={value}")
+    print("Serving; Ctrl+C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
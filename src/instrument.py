@@ -0,0 +1,221 @@
+"""
+Opt-in timing instrumentation for the fetchers and the prep pipeline.
+
+Nothing is recorded until enable() is called (the CLIs do this for
+--timing-report). After that:
+  - every request made through a session from src.api.http.make_session
+    is logged with its latency, status, body size and cache hit flag;
+  - every `with stage("name"):` block (and @timed function) is logged with
+    wall time, process CPU time and peak RSS (a process-wide high-water
+    mark, so stages running in parallel threads share it).
+write_report("timing.json") writes a JSON summary plus timing_http.csv and
+timing_stages.csv with the raw rows.
+"""
+
+import functools
+import json
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+NUMBER_RE = re.compile(r"/\d+(?=/|$)")
+
+
+def peak_rss_mb() -> Optional[float]:
+    """High-water mark of this process's resident memory, in MB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def endpoint(url: str) -> str:
+    """URL with numeric path segments templated: .../seasons/{n}/teams/{n}/record."""
+    parts = urlsplit(url)
+    return parts.netloc + NUMBER_RE.sub("/{n}", parts.path)
+
+
+class Recorder:
+    """Collects HTTP calls and stage timings; safe to use from many threads."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.started_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self.http: List[Dict[str, Any]] = []
+        self.stages: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def record_http(self, row: Dict[str, Any]) -> None:
+        with self._lock:
+            self.http.append(row)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(name)
+        full_name = "/".join(stack)
+
+        rss_before = peak_rss_mb()
+        wall, cpu = time.perf_counter(), time.process_time()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            rss_after = peak_rss_mb()
+            growth = None
+            if rss_after is not None and rss_before is not None:
+                growth = rss_after - rss_before
+            row = {
+                "stage": full_name,
+                "wall_s": time.perf_counter() - wall,
+                "cpu_s": time.process_time() - cpu,
+                "peak_rss_mb": rss_after,
+                "rss_growth_mb": growth,
+                "ok": ok,
+            }
+            stack.pop()
+            with self._lock:
+                self.stages.append(row)
+
+    def summary(self) -> Dict[str, Any]:
+        http = pd.DataFrame(
+            self.http, columns=["endpoint", "status", "seconds", "bytes", "from_cache"]
+        )
+        by_endpoint: List[Dict[str, Any]] = []
+        for name, g in http.groupby("endpoint", sort=True):
+            statuses = g["status"].astype("Int64").value_counts(dropna=False)
+            by_endpoint.append(
+                {
+                    "endpoint": name,
+                    "count": len(g),
+                    "statuses": {str(k): int(v) for k, v in statuses.items()},
+                    "cache_hits": int(g["from_cache"].fillna(False).astype(bool).sum()),
+                    "bytes": int(g["bytes"].fillna(0).sum()),
+                    "total_s": float(g["seconds"].sum()),
+                    "mean_s": float(g["seconds"].mean()),
+                    "p50_s": float(g["seconds"].quantile(0.5)),
+                    "p95_s": float(g["seconds"].quantile(0.95)),
+                    "max_s": float(g["seconds"].max()),
+                }
+            )
+        return {
+            "started_at": self.started_at,
+            "wall_s": time.perf_counter() - self.started,
+            "peak_rss_mb": peak_rss_mb(),
+            "http": {
+                "requests": len(http),
+                "bytes": int(http["bytes"].fillna(0).sum()),
+                "total_s": float(http["seconds"].sum()),
+                "by_endpoint": by_endpoint,
+            },
+            "stages": list(self.stages),
+        }
+
+    def write_report(self, path: str) -> None:
+        """Write the JSON summary to `path` and the raw rows to <stem>_http/_stages.csv."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+
+        stem = os.path.splitext(path)[0]
+        pd.DataFrame(self.http).to_csv(f"{stem}_http.csv", index=False)
+        pd.DataFrame(self.stages).to_csv(f"{stem}_stages.csv", index=False)
+        print(f"Timing report written to {path}")
+
+
+_recorder: Optional[Recorder] = None
+
+
+def enable() -> Recorder:
+    """Start recording (idempotent); returns the active Recorder."""
+    global _recorder
+    if _recorder is None:
+        _recorder = Recorder()
+    return _recorder
+
+
+def disable() -> None:
+    global _recorder
+    _recorder = None
+
+
+def active() -> Optional[Recorder]:
+    return _recorder
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a block as stage `name` if recording is enabled, else do nothing."""
+    if _recorder is None:
+        yield
+        return
+    with _recorder.stage(name):
+        yield
+
+
+def timed(name: Optional[str] = None) -> Callable:
+    """Decorator form of stage(); defaults to the function's name."""
+
+    def wrap(fn: Callable) -> Callable:
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            with stage(label):
+                return fn(*args, **kwargs)
+
+        return inner
+
+    return wrap
+
+
+def instrument_session(session, recorder: Optional[Recorder] = None):
+    """
+    Log every request made through `session` (including cache hits served
+    by CachedSession) to `recorder`, default the active one.
+    """
+    recorder = recorder or enable()
+    send = session.request
+
+    @functools.wraps(send)
+    def request(method, url, *args, **kwargs):
+        start = time.perf_counter()
+        row: Dict[str, Any] = {
+            "method": str(method).upper(),
+            "url": url,
+            "endpoint": endpoint(url),
+        }
+        try:
+            resp = send(method, url, *args, **kwargs)
+        except Exception as e:
+            row.update(status=None, seconds=time.perf_counter() - start, bytes=None, error=str(e))
+            recorder.record_http(row)
+            raise
+        row.update(
+            status=resp.status_code,
+            seconds=time.perf_counter() - start,
+            bytes=len(resp.content),
+            from_cache=bool(getattr(resp, "from_cache", False)),
+        )
+        recorder.record_http(row)
+        return resp
+
+    session.request = request
+    return session
@@ -1,18 +1,69 @@
 """
-Scrape OverTheCap running back contract history into a CSV.
+Scrape OverTheCap contract history into a CSV.
 
-Source page:
+Source pages:
 https://overthecap.com/contract-history/running-back
+https://overthecap.com/contract-history/<position slug>  (see OTC_POSITION_SLUGS)
 """
 
 import argparse
+import asyncio
+import io
+import os
 import re
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 import requests
 
-OTC_RB_CONTRACT_HISTORY_URL = "https://overthecap.com/contract-history/running-back"
+from src import instrument
+from src.api.http import TokenBucket, make_session, resolve_url
+from src.storage import write_frame
+
+OTC_CONTRACT_HISTORY_URL = "https://overthecap.com/contract-history/{slug}"
+
+OTC_POSITION_SLUGS = {
+    "QB": "quarterback",
+    "RB": "running-back",
+    "WR": "wide-receiver",
+    "TE": "tight-end",
+}
+
+OTC_RB_CONTRACT_HISTORY_URL = OTC_CONTRACT_HISTORY_URL.format(slug=OTC_POSITION_SLUGS["RB"])
+
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/123.0 Safari/537.36"
+    )
+}
+
+RENAME_MAP = {
+    "Player": "player",
+    "Team": "team",
+    "Year Signed": "year_signed",
+    "Years": "years",
+    "Value": "total_value",
+    "APY": "apy",
+    "Guaranteed": "guaranteed",
+    "APY as % Of Cap At Signing": "apy_cap_pct",
+    "Inflated Value": "inflated_value",
+    "Inflated APY": "inflated_apy",
+    "Inflated Guaranteed": "inflated_guaranteed",
+}
+
+MONEY_COLS = [
+    "total_value",
+    "apy",
+    "guaranteed",
+    "inflated_value",
+    "inflated_apy",
+    "inflated_guaranteed",
+]
+
+# Cells OTC uses for "no value".
+MISSING_MARKERS = ("", "-", "—", "–")
 
 
 def _clean_money(x: str) -> float | None:
@@ -26,7 +77,7 @@ def _clean_money(x: str) -> float | None:
         return float(x)
 
     s = str(x).strip()
-    if s in ("", "-", "—", "–"):
+    if s in MISSING_MARKERS:
         return None
 
     s = s.replace("$", "").replace(",", "")
@@ -46,7 +97,7 @@ def _clean_pct(x: str) -> float | None:
         return float(x)
 
     s = str(x).strip()
-    if s in ("", "-", "—", "–"):
+    if s in MISSING_MARKERS:
         return None
 
     s = s.replace("%", "")
@@ -56,65 +107,61 @@ def _clean_pct(x: str) -> float | None:
         return None
 
 
-def fetch_otc_rb_contracts() -> pd.DataFrame:
+def _clean_numeric_series(s: pd.Series, strip: Tuple[str, ...]) -> pd.Series:
     """
-    Download the OverTheCap RB contract history page and parse the table
-    into a pandas DataFrame.
+    Vectorized core of clean_money_series / clean_pct_series. The column is
+    converted to Arrow strings once so the strip/replace/cast steps run in
+    pyarrow compute kernels rather than per-row Python.
     """
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/123.0 Safari/537.36"
-        )
-    }
-    resp = requests.get(OTC_RB_CONTRACT_HISTORY_URL, headers=headers, timeout=30)
-    resp.raise_for_status()
+    if pd.api.types.is_numeric_dtype(s):
+        return s.astype(float)
+
+    text = s.astype("string[pyarrow]").str.strip()
+    text = text.mask(text.isin(MISSING_MARKERS))
+    for token in strip:
+        text = text.str.replace(token, "", regex=False)
+
+    try:
+        return text.astype("float64[pyarrow]").astype(float)
+    except (ValueError, TypeError):
+        # Some cell is not a number after cleaning; fall back to per-cell coercion.
+        return pd.to_numeric(text, errors="coerce").astype(float)
+
+
+def clean_money_series(s: pd.Series) -> pd.Series:
+    """
+    Column version of _clean_money: '$32,700,000' -> 32700000.0, missing or
+    unparseable cells -> NaN.
+    """
+    return _clean_numeric_series(s, ("$", ","))
+
+
+def clean_pct_series(s: pd.Series) -> pd.Series:
+    """Column version of _clean_pct: '15.8%' -> 15.8, missing -> NaN."""
+    return _clean_numeric_series(s, ("%",))
+
 
-    tables: List[pd.DataFrame] = pd.read_html(resp.text)
+def parse_otc_contracts_html(html: str) -> pd.DataFrame:
+    """Parse the first table of an OverTheCap contract-history page."""
+    tables: List[pd.DataFrame] = pd.read_html(io.StringIO(html))
 
     if not tables:
-        raise RuntimeError("No tables found on OverTheCap RB contract history page.")
+        raise RuntimeError("No tables found on OverTheCap contract history page.")
 
     df = tables[0].copy()
 
     df.columns = [str(c).strip() for c in df.columns]
-
-    rename_map = {
-        "Player": "player",
-        "Team": "team",
-        "Year Signed": "year_signed",
-        "Years": "years",
-        "Value": "total_value",
-        "APY": "apy",
-        "Guaranteed": "guaranteed",
-        "APY as % Of Cap At Signing": "apy_cap_pct",
-        "Inflated Value": "inflated_value",
-        "Inflated APY": "inflated_apy",
-        "Inflated Guaranteed": "inflated_guaranteed",
-    }
-
-    for old, new in rename_map.items():
-        if old in df.columns:
-            df.rename(columns={old: new}, inplace=True)
+    df = df.rename(columns=RENAME_MAP)
 
     if "player" in df.columns:
         df = df[~df["player"].isna() & (df["player"].astype(str).str.strip() != "")]
 
-    money_cols = [
-        "total_value",
-        "apy",
-        "guaranteed",
-        "inflated_value",
-        "inflated_apy",
-        "inflated_guaranteed",
-    ]
-    for col in money_cols:
+    for col in MONEY_COLS:
         if col in df.columns:
-            df[col] = df[col].apply(_clean_money)
+            df[col] = clean_money_series(df[col])
 
     if "apy_cap_pct" in df.columns:
-        df["apy_cap_pct"] = df["apy_cap_pct"].apply(_clean_pct)
+        df["apy_cap_pct"] = clean_pct_series(df["apy_cap_pct"])
 
     for col in ("year_signed", "years"):
         if col in df.columns:
@@ -123,23 +170,167 @@ def fetch_otc_rb_contracts() -> pd.DataFrame:
     return df.reset_index(drop=True)
 
 
+def parse_positions(spec: str) -> List[str]:
+    """Parse "RB,WR,TE" (case-insensitive) into known position codes."""
+    positions = [p.strip().upper() for p in spec.split(",") if p.strip()]
+    unknown = [p for p in positions if p not in OTC_POSITION_SLUGS]
+    if unknown or not positions:
+        raise ValueError(
+            f"Unknown positions {unknown}; choose from {sorted(OTC_POSITION_SLUGS)}"
+        )
+    return list(dict.fromkeys(positions))
+
+
+def fetch_otc_contracts(
+    position: str = "RB", session: Optional[requests.Session] = None
+) -> pd.DataFrame:
+    """
+    Download the OverTheCap contract history page for `position` (a key of
+    OTC_POSITION_SLUGS) and parse the table into a pandas DataFrame.
+    """
+    url = resolve_url(OTC_CONTRACT_HISTORY_URL.format(slug=OTC_POSITION_SLUGS[position]))
+    resp = (session or requests).get(url, headers=HEADERS, timeout=30)
+    resp.raise_for_status()
+    return parse_otc_contracts_html(resp.text)
+
+
+def fetch_otc_rb_contracts(session: Optional[requests.Session] = None) -> pd.DataFrame:
+    """
+    Download the OverTheCap RB contract history page and parse the table
+    into a pandas DataFrame.
+    """
+    return fetch_otc_contracts("RB", session)
+
+
+async def fetch_otc_positions_async(
+    positions: List[str],
+    concurrency: int = 4,
+    rate: float = 1.0,
+    session: Optional[requests.Session] = None,
+) -> pd.DataFrame:
+    """
+    Fetch several positions' contract histories concurrently and stack them
+    with a `position` column. At most `concurrency` pages are in flight and
+    requests start at no more than `rate` per second. A position whose page
+    fails is skipped with a warning.
+    """
+    sem = asyncio.Semaphore(max(1, concurrency))
+    bucket = TokenBucket(rate)
+
+    async def one(position: str) -> pd.DataFrame:
+        async with sem:
+            await bucket.acquire()
+            return await asyncio.to_thread(fetch_otc_contracts, position, session)
+
+    results = await asyncio.gather(*(one(p) for p in positions), return_exceptions=True)
+
+    frames: List[pd.DataFrame] = []
+    for position, result in zip(positions, results):
+        if isinstance(result, Exception):
+            print(f"[WARN] {position} contract history failed: {result}")
+            continue
+        frames.append(result.assign(position=position))
+
+    if not frames:
+        raise RuntimeError(f"No contract history fetched for {positions}")
+    return pd.concat(frames, ignore_index=True)
+
+
+def fetch_otc_positions(
+    positions: List[str],
+    concurrency: int = 4,
+    rate: float = 1.0,
+    session: Optional[requests.Session] = None,
+) -> pd.DataFrame:
+    return asyncio.run(fetch_otc_positions_async(positions, concurrency, rate, session))
+
+
+def write_position_dataset(df: pd.DataFrame, out_dir: str) -> Dict[str, int]:
+    """
+    Write `df` as a Parquet dataset partitioned by position
+    (out_dir/position=RB/part-0.parquet, ...). Returns {position: rows}.
+    """
+    written: Dict[str, int] = {}
+    for position, part in df.groupby("position", sort=True):
+        path = os.path.join(out_dir, f"position={position}", "part-0.parquet")
+        write_frame(part.drop(columns="position").reset_index(drop=True), path)
+        written[position] = len(part)
+    return written
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
-        description="Scrape OverTheCap RB contract history into a CSV."
+        description="Scrape OverTheCap contract history into a CSV."
+    )
+    parser.add_argument(
+        "--positions",
+        type=str,
+        default="RB",
+        help=f"Comma-separated positions ({','.join(OTC_POSITION_SLUGS)})",
     )
     parser.add_argument(
         "--save",
         type=str,
-        required=True,
-        help="Output CSV path, e.g. data/otc_rb_contracts_raw.csv",
+        default="",
+        help="Output CSV path, e.g. data/otc_rb_contracts_raw.csv (with a position "
+        "column when more than one position is fetched)",
+    )
+    parser.add_argument(
+        "--out-dir",
+        type=str,
+        default="",
+        help="Also write a position-partitioned Parquet dataset here, e.g. data/otc_contracts",
+    )
+    parser.add_argument("--concurrency", type=int, default=4, help="Pages fetched at once")
+    parser.add_argument("--rate", type=float, default=1.0, help="Max requests per second")
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default="",
+        help="Cache the page on disk here (e.g. data/http_cache)",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=86400.0,
+        help="Seconds before the cached page is revalidated",
+    )
+    parser.add_argument(
+        "--timing-report",
+        type=str,
+        default="",
+        help="Write per-request and per-stage timings here (e.g. data/otc_timing.json)",
     )
     args = parser.parse_args()
 
-    df = fetch_otc_rb_contracts()
-    print(f"Fetched {len(df)} contract rows from OverTheCap.")
+    if not args.save and not args.out_dir:
+        parser.error("give --save and/or --out-dir")
+
+    recorder = instrument.enable() if args.timing_report else None
+    positions = parse_positions(args.positions)
+    session = make_session(
+        pool_size=max(1, args.concurrency),
+        cache_dir=args.cache_dir,
+        ttl=args.cache_ttl,
+        retries=3,
+    )
+    try:
+        with instrument.stage("fetch"):
+            df = fetch_otc_positions(positions, args.concurrency, args.rate, session)
+        print(f"Fetched {len(df)} contract rows from OverTheCap ({', '.join(positions)}).")
 
-    df.to_csv(args.save, index=False)
-    print(f"Saved to {args.save}")
+        with instrument.stage("write"):
+            if args.save:
+                # A single position keeps the original CSV schema (no position column).
+                out = df if len(positions) > 1 else df.drop(columns="position")
+                out.to_csv(args.save, index=False)
+                print(f"Saved to {args.save}")
+            if args.out_dir:
+                written = write_position_dataset(df, args.out_dir)
+                print(f"Wrote {written} to {args.out_dir}")
+    finally:
+        if recorder is not None:
+            recorder.write_report(args.timing_report)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,171 @@
+"""
+Bulk offline import of saved Pro-Football-Reference rushing tables.
+
+Since PFR blocks scraping, seasons are saved by hand from the browser,
+either as the full page (.html/.htm) or via "Get table as CSV" (.csv/.txt).
+Drop any number of them in one directory, with the season year somewhere
+in each file name (e.g. rushing_2019.html, 2020_rushing.csv), and run:
+
+    python -m src.scrapers.pfr_import --src data/pfr_raw --out data/rushing_by_year
+
+Files are parsed in parallel, renamed to the rushing_cleaned.csv schema
+(rAtt, rYds, ...) and typed with RUSHING_SCHEMA, then written as one
+Parquet dataset partitioned by year:
+
+    data/rushing_by_year/Year=2019/part-0.parquet
+    data/rushing_by_year/Year=2020/part-0.parquet
+
+which pd.read_parquet("data/rushing_by_year") reads back as one table.
+"""
+
+import argparse
+import io
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from glob import glob
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from src.analysis.rushing_data import apply_rushing_schema
+from src.scrapers.pfr_rushing import normalize_rushing_export, parse_rushing_columns
+from src.storage import write_frame
+
+HTML_EXTS = (".html", ".htm")
+CSV_EXTS = (".csv", ".txt")
+
+SEASON_RE = re.compile(r"(?<!\d)((?:19|20)\d{2})(?!\d)")
+
+# PFR marks Pro Bowl (*) and All-Pro (+) selections on player names.
+NAME_MARKERS_RE = r"[*+]+$"
+
+# Columns written to the dataset (whichever are present), in this order.
+IMPORT_COLUMNS = [
+    "Player",
+    "Team",
+    "Pos",
+    "Age",
+    "G",
+    "GS",
+    "rAtt",
+    "rYds",
+    "rTD",
+    "r1D",
+    "rLng",
+    "rY/A",
+    "rY/g",
+    "Fmb",
+    "Year",
+]
+
+
+def season_from_filename(path: str) -> Optional[int]:
+    m = SEASON_RE.search(os.path.basename(path))
+    return int(m.group(1)) if m else None
+
+
+def _read_csv_export(path: str) -> pd.DataFrame:
+    """
+    Read a "Get table as CSV" export. These may start with an over-header
+    line (",,,,Rushing,,,") and PFR's comment lines, so parsing starts at
+    the first line that names a Player column.
+    """
+    with open(path, "r", encoding="utf-8-sig") as f:
+        lines = f.read().splitlines()
+
+    for i, line in enumerate(lines):
+        if "Player" in [c.strip() for c in line.split(",")]:
+            return pd.read_csv(io.StringIO("\n".join(lines[i:])), dtype=str)
+    raise ValueError(f"No header row with a Player column in {path}")
+
+
+def import_file(path: str, season: Optional[int] = None) -> pd.DataFrame:
+    """One saved page or CSV export -> typed rushing rows for that season."""
+    season = season or season_from_filename(path)
+    if season is None:
+        raise ValueError(f"Cannot tell the season from file name: {path}")
+
+    ext = os.path.splitext(path)[1].lower()
+    if ext in HTML_EXTS:
+        with open(path, "r", encoding="utf-8") as f:
+            df = pd.DataFrame(parse_rushing_columns(f.read(), season)).drop(columns="Season")
+    elif ext in CSV_EXTS:
+        df = _read_csv_export(path)
+    else:
+        raise ValueError(f"Unsupported file type: {path}")
+
+    df.columns = [str(c).strip() for c in df.columns]
+    df = normalize_rushing_export(df, season)
+    df["Player"] = df["Player"].astype(str).str.strip().str.replace(NAME_MARKERS_RE, "", regex=True)
+
+    df = df[[c for c in IMPORT_COLUMNS if c in df.columns]].reset_index(drop=True)
+    return apply_rushing_schema(df)
+
+
+def _import_one(path: str) -> Tuple[str, pd.DataFrame]:
+    return path, import_file(path)
+
+
+def find_exports(src_dir: str) -> List[str]:
+    paths = [
+        p
+        for p in sorted(glob(os.path.join(src_dir, "*")))
+        if os.path.splitext(p)[1].lower() in HTML_EXTS + CSV_EXTS
+    ]
+    return [p for p in paths if season_from_filename(p) is not None]
+
+
+def import_directory(src_dir: str, out_dir: str, workers: int = 4) -> Dict[int, int]:
+    """
+    Parse every saved export in `src_dir` (in parallel) and write one
+    Year=YYYY/part-0.parquet per season under `out_dir`. If a season has
+    several files, the last one in name order wins. Returns {season: rows}.
+    """
+    paths = find_exports(src_dir)
+    if not paths:
+        raise FileNotFoundError(f"No PFR exports with a season in the name in {src_dir}")
+
+    if workers > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_import_one, paths))
+    else:
+        results = [_import_one(p) for p in paths]
+
+    by_season: Dict[int, pd.DataFrame] = {}
+    for path, df in results:
+        season = season_from_filename(path)
+        if season in by_season:
+            print(f"[WARN] Several files for {season}; using {os.path.basename(path)}")
+        by_season[season] = df
+
+    written: Dict[int, int] = {}
+    for season, df in sorted(by_season.items()):
+        part = os.path.join(out_dir, f"Year={season}", "part-0.parquet")
+        write_frame(df.drop(columns="Year"), part)
+        written[season] = len(df)
+
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Import saved PFR rushing pages/CSV exports into a Parquet dataset."
+    )
+    parser.add_argument("--src", required=True, help="Directory of saved .html/.csv files")
+    parser.add_argument(
+        "--out",
+        default=os.path.join("data", "rushing_by_year"),
+        help="Output dataset directory (partitioned by Year)",
+    )
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    written = import_directory(args.src, args.out, args.workers)
+    for season, rows in written.items():
+        print(f"{season}: {rows} rows")
+    print(f"Wrote {len(written)} seasons to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,14 +4,42 @@ PLANNED Scraper for Pro-Football-Reference yearly rushing stats. This was NOT us
 """
 
 import csv
+import re
 import time
-from typing import Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
+import lxml.html
+import pandas as pd
 import requests
 from bs4 import BeautifulSoup
 
+from src.api.http import resolve_url
+
 PFR_RUSHING_URL = "https://www.pro-football-reference.com/years/{season}/rushing.htm"
 
+NUMERIC_COLS = [
+    "Age", "G", "GS",
+    "Att", "Yds", "TD", "Y/A", "Y/G",
+    "Rec", "Yds.1", "Y/R",
+    "Y/Tch", "YScm", "RRTD", "Fmb"
+]
+
+# PFR column names -> the rushing_cleaned.csv schema.
+PFR_RUSHING_RENAME = {
+    "Tm": "Team",
+    "Att": "rAtt",
+    "Yds": "rYds",
+    "TD": "rTD",
+    "1D": "r1D",
+    "Lng": "rLng",
+    "Y/A": "rY/A",
+    "Y/G": "rY/g",
+}
+
+# Opening tag of a table whose id mentions "rushing". Matched on the raw
+# text, so it also finds the copies PFR ships inside <!-- --> comments.
+RUSHING_TABLE_RE = re.compile(r"""<table\b[^>]*\bid=["']([^"']*rushing[^"']*)["']""", re.I)
+
 
 def _clean_number(value: str):
     if value is None:
@@ -35,7 +63,7 @@ def fetch_rushing_html(season: int) -> str:
     NOTE: If Pro-Football-Reference returns 403 (forbidden), this will raise
     a clear error telling you to download the data manually instead of scraping.
     """
-    url = PFR_RUSHING_URL.format(season=season)
+    url = resolve_url(PFR_RUSHING_URL.format(season=season))
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
     }
@@ -53,7 +81,125 @@ def fetch_rushing_html(season: int) -> str:
     return resp.text
 
 
-def parse_rushing_table(html: str, season: int) -> List[Dict]:
+def _rushing_table_html(html: str) -> str:
+    """
+    Slice the rushing <table>...</table> out of the raw page, preferring
+    id="rushing" over other ids that contain "rushing".
+    """
+    match: Optional[re.Match] = None
+    for m in RUSHING_TABLE_RE.finditer(html):
+        if m.group(1) == "rushing":
+            match = m
+            break
+        if match is None:
+            match = m
+    if match is None:
+        raise RuntimeError("Could not find rushing table on PFR page")
+
+    end = html.find("</table>", match.start())
+    if end < 0:
+        raise RuntimeError("Rushing table on PFR page is not closed")
+    return html[match.start():end + len("</table>")]
+
+
+def _cell_text(el) -> str:
+    # Same as BeautifulSoup's get_text(strip=True): strip each text node, join.
+    return "".join(t.strip() for t in el.itertext())
+
+
+def _to_numbers(values: List) -> pd.Series:
+    """
+    _clean_number for a whole column at once: one pd.to_numeric call
+    (commas stripped, "--"/blank/junk -> NA). Columns without a decimal
+    point come back as Int64, the rest as float64.
+    """
+    s = pd.Series(values, dtype=object).str.strip().str.replace(",", "", regex=False)
+    nums = pd.to_numeric(s, errors="coerce")
+    if not s.str.contains(".", regex=False).any():
+        nums = nums.astype("Int64")
+    return nums
+
+
+def _to_objects(values: Any) -> List:
+    """A typed column as plain Python values, NA -> None (row-dict form)."""
+    if isinstance(values, pd.Series):
+        return values.astype(object).where(values.notna(), None).tolist()
+    return values
+
+
+def _rushing_columns(html: str, season: int) -> Tuple[Dict[str, Any], List[str], List[int]]:
+    """(columns, header names as on the page, number of cells in each row)."""
+    table = lxml.html.fragment_fromstring(_rushing_table_html(html))
+
+    header_rows = table.xpath("./thead/tr")
+    if not header_rows:
+        raise RuntimeError("Rushing table on PFR page has no header")
+    headers = [_cell_text(th) for th in header_rows[-1].xpath("./th")]
+
+    # dict(zip(headers, values)) semantics: a repeated header takes the
+    # value at its last position that the row reaches.
+    positions: Dict[str, List[int]] = {}
+    for i, h in enumerate(headers):
+        positions.setdefault(h, []).append(i)
+    columns: Dict[str, Any] = {h: [] for h in positions}
+    widths: List[int] = []
+
+    for tr in table.xpath("./tbody/tr"):
+        if "thead" in (tr.get("class") or "").split():
+            continue
+        cells = tr.xpath("./th|./td")
+        if not cells:
+            continue
+        values = [_cell_text(c) for c in cells]
+        if values[0] == "Player" or values[0] == "":
+            continue
+        n = len(values)
+        widths.append(n)
+        for h, pos in positions.items():
+            reached = [i for i in pos if i < n]
+            columns[h].append(values[reached[-1]] if reached else None)
+
+    columns["Season"] = [season] * len(widths)
+
+    for col in NUMERIC_COLS:
+        if col in columns:
+            columns[col] = _to_numbers(columns[col])
+
+    return columns, headers, widths
+
+
+def parse_rushing_columns(html: str, season: int) -> Dict[str, Any]:
+    """
+    Fast path for parse_rushing_table: pull just the rushing table (also
+    when it is inside an HTML comment), parse it with lxml and return
+    {column: values}. NUMERIC_COLS are converted column-wise to Int64 or
+    float64 Series (NA where the page has no number); the other columns
+    are lists of strings. Column names match the BeautifulSoup parser.
+    Being rectangular, a row with fewer cells than headers gets None/NA in
+    the columns it does not reach (the row dicts of parse_rushing_table
+    leave those keys out).
+    """
+    return _rushing_columns(html, season)[0]
+
+
+def parse_rushing_table(html: str, season: int, engine: str = "bs4") -> List[Dict]:
+    """
+    One dict per player row. engine="lxml" uses parse_rushing_columns,
+    which is much faster and also finds tables hidden in HTML comments.
+    Both engines drop the keys a short row does not reach, as zip() does.
+    """
+    if engine == "lxml":
+        columns, headers, widths = _rushing_columns(html, season)
+        columns = {k: _to_objects(v) for k, v in columns.items()}
+        first = {h: headers.index(h) for h in columns if h != "Season"}
+        keys = list(columns)
+        rows: List[Dict] = []
+        for n, vals in zip(widths, zip(*columns.values())):
+            row = dict(zip(keys, vals))
+            if n < len(headers):
+                row = {k: row[k] for k in keys if k == "Season" or first[k] < n}
+            rows.append(row)
+        return rows
 
     soup = BeautifulSoup(html, "lxml")
 
@@ -91,21 +237,30 @@ def parse_rushing_table(html: str, season: int) -> List[Dict]:
         row_dict["Season"] = season
         rows.append(row_dict)
 
-    numeric_cols = [
-        "Age", "G", "GS",
-        "Att", "Yds", "TD", "Y/A", "Y/G",
-        "Rec", "Yds.1", "Y/R",
-        "Y/Tch", "YScm", "RRTD", "Fmb"
-    ]
-
     for row in rows:
-        for col in numeric_cols:
+        for col in NUMERIC_COLS:
             if col in row:
                 row[col] = _clean_number(row[col])
 
     return rows
 
 
+def normalize_rushing_export(df: pd.DataFrame, season: int) -> pd.DataFrame:
+    """
+    Clean a PFR rushing table (pasted, "Get table as CSV" export or parsed
+    page): drop repeated header rows, rename to the rAtt/rYds/... schema
+    and set Year.
+    """
+    df = df.dropna(subset=["Player"])
+    df = df[df["Player"] != "Player"]
+    if "Rk" in df.columns:
+        df = df[df["Rk"].astype(str) != "Rk"]
+
+    df = df.rename(columns=PFR_RUSHING_RENAME)
+    df["Year"] = season
+    return df
+
+
 def fetch_rushing_stats(season: int) -> List[Dict]:
     html = fetch_rushing_html(season)
     return parse_rushing_table(html, season)
@@ -0,0 +1,183 @@
+"""
+File helpers shared by the fetchers and loaders.
+
+Parquet (.parquet) and Feather (.feather) are both read/written through
+pandas and need pyarrow (see requirements.txt). JSON Lines (.jsonl) files
+are written one flushed record at a time and read back as a stream.
+"""
+
+import json
+import os
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+import pandas as pd
+
+COLUMNAR_EXTS = (".parquet", ".feather")
+
+
+def write_frame(df: pd.DataFrame, path: str) -> None:
+    """Write df as Parquet or Feather depending on the file extension."""
+    ext = os.path.splitext(path)[1].lower()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = path + ".tmp"
+    if ext == ".parquet":
+        df.to_parquet(tmp, index=False)
+    elif ext == ".feather":
+        df.reset_index(drop=True).to_feather(tmp)
+    else:
+        raise ValueError(f"Unsupported columnar format: {path}")
+    os.replace(tmp, path)
+
+
+def frame_columns(path: str) -> List[str]:
+    """Column names stored in a Parquet/Feather file, without reading data."""
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    if path.lower().endswith(".parquet"):
+        return list(pq.read_schema(path).names)
+    return list(feather.read_table(path, memory_map=True).schema.names)
+
+
+def read_frame(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Read a Parquet/Feather file. Only `columns` are read if given; requested
+    columns the file does not have come back as all-NA.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in COLUMNAR_EXTS:
+        raise ValueError(f"Unsupported columnar format: {path}")
+
+    present = None
+    if columns is not None:
+        available = set(frame_columns(path))
+        present = [c for c in columns if c in available]
+
+    if ext == ".parquet":
+        df = pd.read_parquet(path, columns=present)
+    else:
+        df = pd.read_feather(path, columns=present)
+
+    if columns is not None:
+        df = df.reindex(columns=columns)
+    return df
+
+
+def source_fingerprint(paths: Sequence[str]) -> List[list]:
+    """[path, mtime_ns, size] for each source file, used to detect changes."""
+    out: List[list] = []
+    for path in paths:
+        st = os.stat(path)
+        out.append([os.path.abspath(path), st.st_mtime_ns, st.st_size])
+    return out
+
+
+def cached_frame(
+    name: str,
+    sources: Sequence[str],
+    build: Callable[[], pd.DataFrame],
+    cache_dir: str,
+    key: str = "",
+) -> pd.DataFrame:
+    """
+    Return build() but keep a typed Parquet snapshot of it in
+    `cache_dir/<name>.parquet`. The snapshot is reused as long as the source
+    files (and their mtime/size) and `key` (e.g. a schema version) are
+    unchanged, otherwise it is rebuilt.
+    A snapshot that cannot be written (e.g. mixed-type columns) is skipped
+    with a warning; the freshly built frame is still returned.
+    """
+    data_path = os.path.join(cache_dir, f"{name}.parquet")
+    meta_path = os.path.join(cache_dir, f"{name}.json")
+    fingerprint = source_fingerprint(sources)
+
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        fresh = meta.get("sources") == fingerprint and meta.get("key", "") == key
+        if fresh and os.path.exists(data_path):
+            return read_frame(data_path)
+    except (OSError, ValueError):
+        pass
+
+    df = build()
+
+    try:
+        write_frame(df, data_path)
+        # Same temp file + rename as write_frame, so a crash never leaves a
+        # truncated meta file next to a valid snapshot.
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"sources": fingerprint, "key": key}, f)
+        os.replace(meta_path + ".tmp", meta_path)
+    except Exception as e:
+        print(f"[WARN] Could not cache {name}: {e}")
+        for path in (data_path + ".tmp", meta_path + ".tmp", meta_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    return df
+
+
+def _truncate_torn_line(path: str, chunk: int = 1 << 16) -> None:
+    """Cut `path` back to just after its last newline (to empty if it has none)."""
+    with open(path, "rb+") as f:
+        end = f.seek(0, os.SEEK_END)
+        pos = end
+        while pos > 0:
+            start = max(0, pos - chunk)
+            f.seek(start)
+            block = f.read(pos - start)
+            nl = block.rfind(b"\n")
+            if nl >= 0:
+                keep = start + nl + 1
+                break
+            pos = start
+        else:
+            keep = 0
+        if keep < end:
+            f.truncate(keep)
+
+
+class JsonLinesWriter:
+    """
+    Append records to a .jsonl file, one line each, flushed as written so a
+    crash loses at most the line in progress. `append=False` truncates;
+    `append=True` first cuts a torn last line (one without its newline), so
+    the next record starts on a line of its own.
+    """
+
+    def __init__(self, path: str, append: bool = False) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        if append and os.path.exists(path):
+            _truncate_torn_line(path)
+        self._f = open(path, "a" if append else "w", encoding="utf-8")
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._f.write(json.dumps(record) + "\n")
+        self._f.flush()
+
+    def close(self) -> None:
+        self._f.close()
+
+    def __enter__(self) -> "JsonLinesWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def iter_json_lines(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Records of a .jsonl file, one line at a time. A line that does not
+    parse (e.g. cut off by a crash mid-write) is skipped with a warning.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                print(f"[WARN] Skipping unreadable line {lineno} of {path}")
@@ -0,0 +1,235 @@
+from src.analysis import espn_team_data
+from src.api.espn_nfl import save_season_file
+
+
+def _entry(tid, season, wide=None):
+    e = {
+        "id": tid, "name": f"Team {tid}", "abbrev": f"T{tid}", "season": season,
+        "record": {"wins": 10, "losses": 7},
+        "stats": {"offense_rushing_yards": 2000.0, "offense_passing_yards": 3500.0},
+    }
+    if wide is not None:
+        e["all_stats"] = wide
+    return e
+
+
+def test_all_stats_columns_round_trip(tmp_path):
+    save_season_file(
+        str(tmp_path / "espn_team_stats_2022.json"),
+        [_entry("1", 2022, {"rushing_rushingAttempts": 480.0}), _entry("2", 2022, {})],
+    )
+    save_season_file(
+        str(tmp_path / "espn_team_stats_2023.json"),
+        [_entry("1", 2023, {"rushing_rushingAttempts": 455.0, "rushing_rushingTouchdowns": 20.0})],
+    )
+
+    assert "all_stats" not in (tmp_path / "espn_team_stats_2022.json").read_text()
+
+    df = espn_team_data.load_all_espn_team_stats(
+        stat_columns=["rushing_rushingAttempts", "rushing_rushingTouchdowns"],
+        data_dir=str(tmp_path),
+    )
+    df = df.set_index(["team_id", "Year"])
+    assert df.loc[("1", 2022), "rushing_rushingAttempts"] == 480.0
+    assert df.loc[("1", 2023), "rushing_rushingTouchdowns"] == 20.0
+    assert df["rushing_rushingTouchdowns"].isna().sum() == 2
+    assert df.loc[("1", 2023), "win_pct"] == 10 / 17
+
+
+def test_load_all_rushing_cache_invalidation(tmp_path):
+    import os
+
+    import pandas as pd
+
+    from src.analysis import rushing_data
+
+    hist = tmp_path / "rushing_cleaned.csv"
+    hist.write_text("Unnamed: 0,Player,Age,rAtt,rYds,Year\n0,A,24,200,900,2021\n1,B,27,80,310,2021\n")
+    (tmp_path / "rb_rushing_2024.csv").write_text("Player,Age,rAtt,rYds,Year\nC,22,150,700,2024\n")
+
+    first = rushing_data.load_all_rushing(data_dir=str(tmp_path))
+    assert os.path.exists(tmp_path / ".cache" / "rushing_all.parquet")
+
+    cached = rushing_data.load_all_rushing(data_dir=str(tmp_path))
+    pd.testing.assert_frame_equal(first, cached)
+    assert list(cached.columns) == ["Player", "Age", "rAtt", "rYds", "Year"]
+
+    hist.write_text("Player,Age,rAtt,rYds,Year\nA,24,200,900,2021\nB,27,80,310,2021\nD,25,99,400,2022\n")
+    assert len(rushing_data.load_all_rushing(data_dir=str(tmp_path))) == 4
+
+
+def test_parallel_espn_load_matches_serial(tmp_path):
+    import json
+
+    import pandas as pd
+
+    for year in range(2015, 2021):
+        rows = [_entry(str(i), year) for i in range(1, 5)]
+        rows[0]["season"] = None
+        (tmp_path / f"espn_team_stats_{year}.json").write_text(json.dumps(rows))
+
+    serial = espn_team_data.load_all_espn_team_stats(data_dir=str(tmp_path), use_cache=False)
+    threaded = espn_team_data.load_all_espn_team_stats(
+        data_dir=str(tmp_path), use_cache=False, workers=4
+    )
+    pd.testing.assert_frame_equal(serial, threaded)
+    assert serial["Year"].isna().sum() == 0
+    assert sorted(serial["Year"].unique()) == list(range(2015, 2021))
+
+
+def test_rushing_schema_dtypes_and_fallback(tmp_path):
+    from src.analysis import rushing_data
+
+    (tmp_path / "rushing_cleaned.csv").write_text(
+        "Player,Team,Pos,Age,rAtt,rYds,rY/A,Year\n"
+        "A,DAL,RB,24,200,900,4.5,2021\n"
+        "B,NYG,RB,27,80,-3,0.0,2021\n"
+    )
+    # stray text and a fractional value in integer columns
+    (tmp_path / "rb_rushing_2024.csv").write_text(
+        "Player,Team,Pos,Age,rAtt,rYds,rY/A,Year\nC,DAL,RB,--,150.5,700,4.7,2024\n"
+    )
+
+    df = rushing_data.load_all_rushing(data_dir=str(tmp_path), use_cache=False)
+    dtypes = df.dtypes.astype(str).to_dict()
+    assert dtypes["Player"] == dtypes["Team"] == "category"
+    assert dtypes["Age"] == "Int8" and dtypes["rYds"] == "Int16" and dtypes["Year"] == "Int16"
+    assert dtypes["rAtt"].lower() == "float64" and dtypes["rY/A"] == "float32"
+    assert df["Age"].isna().sum() == 1
+    assert list(df["Team"].cat.categories) == ["DAL", "NYG"]
+
+    report = rushing_data.rushing_memory_report(str(tmp_path))
+    assert report.loc["TOTAL", "typed_bytes"] < report.loc["TOTAL", "baseline_bytes"]
+
+
+def test_normalize_names_and_index():
+    import pandas as pd
+
+    from src.analysis.names import NameIndex, normalize_names
+
+    raw = pd.Series(["Kenneth Walker III", " A.J. Dillon", "José Núñez Jr.", None, "Le'Veon Bell"])
+    assert normalize_names(raw).tolist() == [
+        "kenneth walker", "aj dillon", "jose nunez", "", "leveon bell",
+    ]
+
+    index = NameIndex.from_names(pd.Series(["Kenneth Walker", "AJ Dillon"]))
+    ids = index.ids(pd.Series(["KENNETH WALKER III", "Saquon Barkley", "A.J. Dillon"]))
+    assert ids.isna().tolist() == [False, True, False]
+    assert ids[0] != ids[2]
+
+
+def test_match_names_blocks_and_scores():
+    import pandas as pd
+
+    from src.analysis.name_match import match_names
+
+    pfr = pd.DataFrame(
+        {
+            "Player": ["Kenneth Walker", "Tyler Montgomery", "Jeff Wilson", "Jeff Wilson"],
+            "Year": [2023, 2016, 2019, 2020],
+        }
+    )
+    otc = pd.DataFrame(
+        {
+            "player": ["Kenneth Walker III", "Ty Montgomery", "Jeffery Wilson", "Jeff Wilsen"],
+            "year_signed": [2022, 2017, 2021, 2005],
+        }
+    )
+
+    m = match_names(otc, pfr, threshold=0.4).set_index("query_name")
+    assert m.loc["Kenneth Walker III", "exact"] and m.loc["Kenneth Walker III", "score"] == 1.0
+    assert m.loc["Ty Montgomery", "ref_name"] == "Tyler Montgomery"
+    assert m.loc["Jeffery Wilson", "ref_name"] == "Jeff Wilson"
+    # outside the season window
+    assert "Jeff Wilsen" not in m.index
+
+
+def test_jsonl_season_files_stream_and_survive_partial_writes(tmp_path, monkeypatch):
+    import json
+
+    from src.api import espn_nfl
+
+    teams = [{"id": str(i), "name": f"Team {i}", "abbrev": f"T{i}"} for i in range(1, 5)]
+
+    def flaky_summary(team, season, session=None, **kw):
+        if team["id"] == "3":
+            raise KeyboardInterrupt  # the run dies mid-season
+        return _entry(team["id"], season)
+
+    monkeypatch.setattr(espn_nfl, "list_teams", lambda session=None: teams)
+    monkeypatch.setattr(espn_nfl, "get_season_records", lambda season, session=None: {})
+    monkeypatch.setattr(espn_nfl, "get_team_summary", flaky_summary)
+    try:
+        espn_nfl.fetch_seasons([2021], out_dir=str(tmp_path), session="S", fmt="jsonl")
+    except KeyboardInterrupt:
+        pass
+
+    path = tmp_path / "espn_team_stats_2021.jsonl"
+    assert [json.loads(line)["id"] for line in path.read_text().splitlines()] == ["1", "2"]
+
+    # Resume: only teams 3 and 4 are fetched and appended, then compacted.
+    monkeypatch.setattr(
+        espn_nfl, "get_team_summary", lambda team, season, session=None, **kw: _entry(team["id"], season)
+    )
+    espn_nfl.fetch_seasons(
+        [2021], out_dir=str(tmp_path), session="S", fmt="jsonl", incremental=True
+    )
+    assert len(path.read_text().splitlines()) == 4
+
+    # A torn last line and a duplicate team (last one wins) are tolerated.
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(dict(_entry("2", 2021), record={"wins": 1, "losses": 16})) + "\n")
+        f.write('{"id": "9", "name": "Tea')
+    (tmp_path / "espn_team_stats_2021.json").write_text(json.dumps([_entry("1", 2021)]))
+
+    df = espn_team_data.load_all_espn_team_stats(data_dir=str(tmp_path), use_cache=False)
+    assert df["team_id"].tolist() == ["1", "2", "3", "4"]
+    assert df.set_index("team_id").loc["2", "wins"] == 1
+
+    # Appending after a torn line starts a fresh line instead of gluing onto it.
+    with espn_nfl.season_stream(str(path), append=True) as on_result:
+        on_result(_entry("2", 2021))
+        on_result(_entry("3", 2021))
+    entries = espn_nfl.load_season_file(str(path))
+    assert [e["id"] for e in entries] == ["1", "2", "3", "4"]
+    assert entries[1]["record"]["wins"] == 10  # the re-fetched team is readable right away
+    assert [json.loads(line)["id"] for line in path.read_text().splitlines()][-2:] == ["2", "3"]
+
+
+def test_load_espn_games_reads_only_requested_partitions(tmp_path, monkeypatch):
+    from src.analysis import espn_team_data
+    from src.api.espn_games import partition_path, week_frame
+    from src.storage import write_frame
+
+    for season in (2022, 2023):
+        for week in (1, 2, 3):
+            rows = [{"event_id": f"{season}{week}", "team_id": str(t), "points": week,
+                     "rushing_rushingAttempts": 20.0 + t} for t in (1, 2)]
+            if week == 3:
+                rows[0]["rushing_rushingFirstDowns"] = 9.0
+            write_frame(week_frame(rows), partition_path(str(tmp_path), season, week))
+
+    opened = []
+    read_frame = espn_team_data.read_frame
+    def counting_read(path, columns=None):
+        opened.append(path)
+        return read_frame(path, columns)
+
+    monkeypatch.setattr(espn_team_data, "read_frame", counting_read)
+
+    df = espn_team_data.load_espn_games(
+        seasons=[2023], weeks=[2, 3], columns=["team_id", "points", "rushing_rushingFirstDowns"],
+        games_dir=str(tmp_path),
+    )
+    assert len(opened) == 2 and all("season=2023" in p for p in opened)
+    assert list(df.columns) == ["Year", "week", "team_id", "points", "rushing_rushingFirstDowns"]
+    assert df[["Year", "week"]].drop_duplicates().values.tolist() == [[2023, 2], [2023, 3]]
+    assert df["rushing_rushingFirstDowns"].notna().sum() == 1
+
+    assert len(espn_team_data.load_espn_games(games_dir=str(tmp_path), workers=4)) == 12
+
+    # asking for the partition columns by name is fine too
+    df = espn_team_data.load_espn_games(
+        seasons=[2022], columns=["Year", "week", "points"], games_dir=str(tmp_path)
+    )
+    assert list(df.columns) == ["Year", "week", "points"] and len(df) == 6
@@ -1,16 +1,323 @@
-import json, subprocess, sys
+import json, os, subprocess, sys
+
+from src.api.standin import StandInServer
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
 
 def test_espn_api_fetch_runs(tmp_path):
     out_json = tmp_path / "espn_test.json"
     cmd = [sys.executable, "-m", "src.api.espn_nfl", "--season", "2024", "--save", str(out_json)]
-    try:
-        subprocess.check_call(cmd)
-    except Exception:
-        import importlib
-        m = importlib.import_module("src.api.espn_nfl")
-        assert hasattr(m, "get_teams")
-        assert hasattr(m, "fetch_league_team_stats")
-        return
+    with StandInServer(FIXTURES) as server:
+        subprocess.check_call(cmd, env={**os.environ, **server.env()})
     assert out_json.exists(), "JSON not created"
     data = json.loads(out_json.read_text(encoding="utf-8"))
-    assert isinstance(data, list) and len(data) >= 1
+    assert isinstance(data, list) and len(data) == 4
+    assert data[0]["abbrev"] == "ATL"
+    assert data[0]["record"] == {"wins": 11, "losses": 6}  # not in standings: per-team call
+    assert data[1]["record"] == {"wins": 13, "losses": 4}  # from the standings call
+    assert data[0]["stats"]["offense_rushing_yards"] == 2183.0
+    assert data[0]["stats"]["offense_passing_yards"] == 3801.0  # passingYards, not net
+
+
+def test_timing_report_records_requests_and_seasons(tmp_path):
+    report = tmp_path / "timing.json"
+    cmd = [
+        sys.executable, "-m", "src.api.espn_nfl", "--seasons", "2022-2023",
+        "--mode", "async", "--rate", "1000", "--out-dir", str(tmp_path),
+        "--timing-report", str(report),
+    ]
+    with StandInServer(FIXTURES) as server:
+        subprocess.check_call(cmd, env={**os.environ, **server.env()})
+
+    data = json.loads(report.read_text(encoding="utf-8"))
+    # teams + per season: standings, one fallback record (ATL), 4 statistics
+    assert data["http"]["requests"] == 1 + 2 * (1 + 1 + 4)
+    endpoints = {e["endpoint"].split("/", 1)[1]: e for e in data["http"]["by_endpoint"]}
+    record = endpoints["v2/sports/football/leagues/nfl/seasons/{n}/types/{n}/teams/{n}/record"]
+    assert record["count"] == 2 and record["statuses"] == {"200": 2}
+    assert endpoints["apis/v2/sports/football/nfl/standings"]["count"] == 2
+    stages = [s["stage"] for s in data["stages"]]
+    assert stages == ["espn_nfl/season 2022", "espn_nfl/season 2023", "espn_nfl"]
+    assert (tmp_path / "timing_http.csv").exists()
+
+
+def test_standin_errors_and_throttling(monkeypatch):
+    import asyncio
+    from src.api import espn_nfl
+
+    with StandInServer(FIXTURES, error_rate=0.5, throttle_rate=0.5, seed=1) as server:
+        for var, value in server.env().items():
+            monkeypatch.setenv(var, value)
+        data = asyncio.run(
+            espn_nfl.fetch_league_team_stats_async(
+                2024, rate=1000, teams=[{"id": "1", "name": "A", "abbrev": "A"}] * 8
+            )
+        )
+    assert server.counts[429] > 0 and server.counts[500] > 0
+    assert server.counts[200] == 0
+    assert all("error" in d["record"] for d in data)
+
+
+def test_async_fetch_leaves_pacing_to_a_self_pacing_session(monkeypatch):
+    import asyncio
+    from src.api import espn_nfl
+    from src.api.http import make_session
+
+    buckets = []
+    real_bucket = espn_nfl.TokenBucket
+    monkeypatch.setattr(
+        espn_nfl, "TokenBucket", lambda *a, **kw: buckets.append(a) or real_bucket(*a, **kw)
+    )
+    monkeypatch.setattr(espn_nfl, "get_season_records", lambda season, session=None: {})
+    monkeypatch.setattr(espn_nfl, "get_record", lambda tid, season, session=None: {})
+    monkeypatch.setattr(espn_nfl, "get_offense_yards", lambda tid, season, session=None: {})
+    teams = [{"id": "1", "name": "A", "abbrev": "A"}]
+
+    paced = make_session(rate=5.0, max_rate=50.0)
+    asyncio.run(espn_nfl.fetch_league_team_stats_async(2024, rate=5.0, session=paced, teams=teams))
+    assert buckets == []  # the adapter's adaptive rate alone paces the requests
+
+    asyncio.run(espn_nfl.fetch_league_team_stats_async(2024, rate=5.0, teams=teams))
+    assert buckets == [(5.0, None)]
+
+
+def test_async_fetch_keeps_team_order(monkeypatch):
+    import asyncio
+    import random
+    import time
+    from src.api import espn_nfl
+
+    teams = [{"id": str(i), "name": f"Team {i}", "abbrev": f"T{i}"} for i in range(12)]
+    monkeypatch.setattr(espn_nfl, "list_teams", lambda session=None: teams)
+    monkeypatch.setattr(espn_nfl, "get_season_records", lambda season, session=None: {})
+
+    def fake_record(team_id, season, session=None):
+        time.sleep(random.random() / 100)
+        return {"wins": int(team_id), "losses": 17 - int(team_id)}
+
+    def fake_yards(team_id, season, session=None):
+        if team_id == "3":
+            raise RuntimeError("boom")
+        return {"offense_rushing_yards": 1.0, "offense_passing_yards": 2.0}
+
+    monkeypatch.setattr(espn_nfl, "get_record", fake_record)
+    monkeypatch.setattr(espn_nfl, "get_offense_yards", fake_yards)
+
+    data = asyncio.run(espn_nfl.fetch_league_team_stats_async(2024, concurrency=4, rate=1000))
+    assert [d["id"] for d in data] == [t["id"] for t in teams]
+    assert data[5]["record"] == {"wins": 5, "losses": 12}
+    assert data[3]["stats"] == {"error": "boom"}
+    assert set(data[0]) == {"id", "name", "abbrev", "season", "record", "stats"}
+
+
+def test_parse_seasons():
+    from src.api.espn_nfl import parse_seasons
+
+    assert parse_seasons("2000-2003") == [2000, 2001, 2002, 2003]
+    assert parse_seasons("2010, 2000-2001,2010") == [2000, 2001, 2010]
+
+
+def test_fetch_seasons_lists_teams_once(monkeypatch, tmp_path):
+    from src.api import espn_nfl
+
+    calls = []
+    teams = [{"id": "1", "name": "A", "abbrev": "A"}]
+
+    def fake_list_teams(session=None):
+        calls.append(session)
+        return teams
+
+    monkeypatch.setattr(espn_nfl, "list_teams", fake_list_teams)
+    monkeypatch.setattr(espn_nfl, "get_season_records", lambda season, session=None: {})
+    monkeypatch.setattr(
+        espn_nfl,
+        "get_team_summary",
+        lambda team, season, session=None, **kw: {"id": team["id"], "season": season},
+    )
+
+    paths = espn_nfl.fetch_seasons([2001, 2002], out_dir=str(tmp_path), session="S")
+    assert len(calls) == 1 and calls[0] == "S"
+    assert [p.rsplit("_", 1)[-1] for p in paths] == ["2001.json", "2002.json"]
+    assert json.loads((tmp_path / "espn_team_stats_2002.json").read_text()) == [
+        {"id": "1", "season": 2002}
+    ]
+
+
+def test_refresh_season_only_refetches_broken_entries(monkeypatch, tmp_path):
+    from src.api import espn_nfl
+
+    def good(tid):
+        return {
+            "id": tid, "name": tid, "abbrev": tid, "season": 2020,
+            "record": {"wins": 9, "losses": 8},
+            "stats": {"offense_rushing_yards": 1.0, "offense_passing_yards": 2.0},
+        }
+
+    path = tmp_path / "espn_team_stats_2020.json"
+    stored = [good("1"), good("2"), good("3")]
+    stored[1]["record"] = {"wins": None, "losses": None, "error": "503"}
+    stored[2]["stats"]["offense_passing_yards"] = None
+    path.write_text(json.dumps(stored))
+
+    fetched = []
+
+    def fake_summary(team, season, session=None, **kw):
+        fetched.append(team["id"])
+        return dict(good(team["id"]), name="new")
+
+    monkeypatch.setattr(espn_nfl, "get_team_summary", fake_summary)
+    monkeypatch.setattr(espn_nfl, "get_season_records", lambda season, session=None: {})
+    monkeypatch.setattr(espn_nfl.time, "sleep", lambda s: None)
+
+    teams = [{"id": t, "name": t, "abbrev": t} for t in ("1", "2", "3", "4")]
+    merged = espn_nfl.refresh_season(2020, str(path), teams)
+
+    assert fetched == ["2", "3", "4"]
+    assert [e["id"] for e in merged] == ["1", "2", "3", "4"]
+    assert [e["name"] for e in merged] == ["1", "new", "new", "new"]
+    assert json.loads(path.read_text()) == merged
+
+
+def test_refresh_season_backfills_missing_all_stats_rows(monkeypatch, tmp_path):
+    from src.api import espn_nfl
+    from src.storage import read_frame
+
+    def entry(tid, wide=None):
+        e = {
+            "id": tid, "name": tid, "abbrev": tid, "season": 2020,
+            "record": {"wins": 9, "losses": 8},
+            "stats": {"offense_rushing_yards": 1.0, "offense_passing_yards": 2.0},
+        }
+        if wide is not None:
+            e["all_stats"] = wide
+        return e
+
+    path = tmp_path / "espn_team_stats_2020.json"
+    # team 2 was fetched by a run without --all-stats: JSON complete, no columns row
+    espn_nfl.save_season_file(str(path), [entry("1", {"rushing_rushingAttempts": 400.0}), entry("2")])
+
+    fetched = []
+
+    def fake_summary(team, season, session=None, **kw):
+        fetched.append(team["id"])
+        return entry(team["id"], {"rushing_rushingAttempts": 450.0})
+
+    monkeypatch.setattr(espn_nfl, "get_team_summary", fake_summary)
+    monkeypatch.setattr(espn_nfl, "get_season_records", lambda season, session=None: {})
+    monkeypatch.setattr(espn_nfl.time, "sleep", lambda s: None)
+
+    teams = [{"id": t, "name": t, "abbrev": t} for t in ("1", "2")]
+    espn_nfl.refresh_season(2020, str(path), teams, all_stats=True)
+    assert fetched == ["2"]
+    cols = read_frame(espn_nfl.season_columns_path(str(path))).set_index("team_id")
+    assert cols["rushing_rushingAttempts"].to_dict() == {"1": 400.0, "2": 450.0}
+
+    fetched.clear()
+    espn_nfl.refresh_season(2020, str(path), teams)  # without all_stats nothing is stale
+    assert fetched == []
+
+
+def test_extract_stats_from_categories_and_fallback():
+    from src.api.espn_nfl import _extract_yards_from_stats, extract_stats
+
+    payload = {
+        "splits": {
+            "categories": [
+                {"name": "passing", "stats": [
+                    {"name": "passingYards", "value": 4100},
+                    {"name": "netPassingYards", "value": 3900},
+                ]},
+                {"name": "rushing", "stats": [
+                    {"name": "rushingAttempts", "value": 450},
+                    {"name": "rushingYards", "value": 2000.0},
+                    {"name": "rushingTouchdowns", "value": 18},
+                ]},
+            ]
+        }
+    }
+    assert _extract_yards_from_stats(payload) == (2000.0, 4100.0)  # gross, as stored before
+    assert extract_stats(payload, ["rushingAttempts", "rushingTouchdowns", "nope"]) == {
+        "rushingAttempts": 450.0,
+        "rushingTouchdowns": 18.0,
+        "nope": None,
+    }
+
+    odd_shape = {"team": {"totals": [{"name": "teamRushingYards", "value": 1500}]}}
+    assert _extract_yards_from_stats(odd_shape) == (1500.0, None)
+
+
+def test_parse_standings_and_record_fallback(monkeypatch):
+    from src.api import espn_nfl
+
+    with open(os.path.join(FIXTURES, "espn", "standings.json"), encoding="utf-8") as f:
+        records = espn_nfl.parse_standings(json.load(f))
+    assert records == {
+        "2": {"wins": 13, "losses": 4},
+        "10": {"wins": 3, "losses": 14},
+        "6": {"wins": 7, "losses": 10},
+    }
+
+    per_team = []
+
+    def fake_record(tid, season, session=None):
+        per_team.append(tid)
+        return {"wins": 1, "losses": 16}
+
+    monkeypatch.setattr(espn_nfl, "get_season_records", lambda season, session=None: records)
+    monkeypatch.setattr(espn_nfl, "get_record", fake_record)
+    monkeypatch.setattr(espn_nfl, "get_offense_yards", lambda tid, season, session=None: {})
+    teams = [{"id": t, "name": t, "abbrev": t} for t in ("1", "2", "6")]
+    data = espn_nfl.fetch_league_team_stats(2024, throttle=0, teams=teams)
+    assert per_team == ["1"]
+    assert [d["record"]["wins"] for d in data] == [1, 13, 7]
+
+
+def test_weekly_games_written_per_partition_and_resumed(monkeypatch, tmp_path):
+    from src.api import espn_games
+    from src.api.http import make_session
+    from src.storage import read_frame
+
+    out = str(tmp_path / "games")
+    session = make_session(pool_size=4)
+    with StandInServer(FIXTURES) as server:
+        for var, value in server.env().items():
+            monkeypatch.setenv(var, value)
+        written = espn_games.fetch_games([2023], out, [1, 2, 3], rate=1000, session=session)
+        assert written == {(2023, 1): 4, (2023, 2): 2}  # week 3 has no scoreboard (404)
+
+        served = sum(server.counts.values())
+        again = espn_games.fetch_games([2023], out, [1, 2, 3], rate=1000, session=session)
+        assert again == {} and sum(server.counts.values()) == served + 1  # only week 3 retried
+
+    week1 = read_frame(espn_games.partition_path(out, 2023, 1))
+    assert list(week1.columns[:4]) == ["event_id", "date", "team_id", "team_abbrev"]
+    buf = week1.set_index("team_abbrev").loc["BUF"]
+    assert (buf["opponent_abbrev"], buf["points"], buf["result"]) == ("ATL", 24, "W")
+    assert buf["offense_rushing_yards"] == 187.0 and buf["rushing_rushingAttempts"] == 33.0
+    assert week1.set_index("team_abbrev").loc["DAL", "result"] == "T"
+    assert week1["stats_error"].isna().all()
+
+
+def test_weekly_games_box_scores_follow_their_scoreboard(monkeypatch, tmp_path):
+    from src.api import espn_games
+
+    calls = []
+
+    def fake_week(season, week, session=None):
+        calls.append(("sb", week))
+        return [dict(event_id=f"{week}", team_id=t, points=1, opponent_points=0) for t in "12"]
+
+    def fake_stats(event_id, team_id, session=None):
+        calls.append(("box", int(event_id)))
+        return {"offense_rushing_yards": 1.0}
+
+    monkeypatch.setattr(espn_games, "get_week_games", fake_week)
+    monkeypatch.setattr(espn_games, "get_game_stats", fake_stats)
+    written = espn_games.fetch_games(
+        [2030], str(tmp_path), list(range(1, 7)), rate=1000, session="S", weeks_in_flight=2
+    )
+    assert len(written) == 6
+    # no more than two weeks are open: week 3's scoreboard waits for a week to finish
+    first_box = calls.index(("box", 1))
+    assert [c for c in calls[:first_box] if c[0] == "sb"] == [("sb", 1), ("sb", 2)]
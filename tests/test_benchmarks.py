@@ -0,0 +1,18 @@
+from benchmarks.run import find_regressions, run_benchmarks
+
+
+def test_find_regressions_uses_median_of_recent_runs():
+    history = [
+        {"results": {"a@1x": 1.0, "b@1x": 1.0}},
+        {"results": {"a@1x": 10.0}},
+        {"results": {"a@1x": 1.1}},
+    ]
+    flagged = find_regressions(history, {"a@1x": 1.5, "b@1x": 1.1, "new@1x": 9.0}, window=3)
+    assert set(flagged) == {"a@1x"}
+    assert flagged["a@1x"]["baseline"] == 1.1
+
+
+def test_run_benchmarks_smoke():
+    results = run_benchmarks(["filter.rb_70_plus", "merge.final"], [1], repeat=1)
+    assert set(results) == {"filter.rb_70_plus@1x", "merge.final@1x"}
+    assert all(v > 0 for v in results.values())
@@ -0,0 +1,169 @@
+import datetime as dt
+import os
+
+import requests
+from requests.adapters import BaseAdapter
+
+from src.api.http import CachedSession, make_session, resolve_url
+from src.api.standin import StandInServer
+
+
+class FakeAdapter(BaseAdapter):
+    """Serves a fixed body with an ETag and answers conditional GETs with 304."""
+
+    def __init__(self, body=b'{"ok": 1}', etag='"v1"'):
+        super().__init__()
+        self.body = body
+        self.etag = etag
+        self.requests = []
+
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        resp = requests.Response()
+        resp.request = request
+        resp.url = request.url
+        if request.headers.get("If-None-Match") == self.etag:
+            resp.status_code = 304
+            resp._content = b""
+        else:
+            resp.status_code = 200
+            resp._content = self.body
+            resp.headers["ETag"] = self.etag
+            resp.headers["Content-Type"] = "application/json"
+        return resp
+
+    def close(self):
+        pass
+
+
+def _session(tmp_path, ttl, immutable=False):
+    s = CachedSession(str(tmp_path), ttl=ttl, is_immutable=lambda url: immutable)
+    adapter = FakeAdapter()
+    s.mount("http://", adapter)
+    return s, adapter
+
+
+def test_immutable_urls_are_served_from_disk(tmp_path):
+    s, adapter = _session(tmp_path, ttl=0, immutable=True)
+    assert s.get("http://x/a").json() == {"ok": 1}
+
+    # a fresh session over the same directory does not touch the network
+    s2, adapter2 = _session(tmp_path, ttl=0, immutable=True)
+    resp = s2.get("http://x/a")
+    assert resp.json() == {"ok": 1} and resp.from_cache
+    assert len(adapter.requests) == 1 and adapter2.requests == []
+
+
+def test_stale_entries_are_revalidated_with_etag(tmp_path):
+    s, adapter = _session(tmp_path, ttl=0)
+    s.get("http://x/a")
+    resp = s.get("http://x/a")
+
+    assert resp.json() == {"ok": 1} and resp.from_cache
+    assert len(adapter.requests) == 2
+    assert adapter.requests[1].headers["If-None-Match"] == '"v1"'
+
+
+def test_completed_season_urls():
+    from src.api.espn_nfl import TEAM_STATS_URL, is_completed_season_url
+
+    today = dt.date(2025, 1, 15)
+    assert is_completed_season_url(TEAM_STATS_URL.format(season=2023, team_id=1), today)
+    assert not is_completed_season_url(TEAM_STATS_URL.format(season=2024, team_id=1), today)
+
+
+def test_base_url_override_routes_scrapers_to_standin(monkeypatch, tmp_path):
+    from src.scrapers.otc_rb_contracts import OTC_RB_CONTRACT_HISTORY_URL, fetch_otc_rb_contracts
+    from src.scrapers.pfr_rushing import fetch_rushing_html
+
+    fixtures = os.path.join(os.path.dirname(__file__), "fixtures")
+    with StandInServer(fixtures) as server:
+        for var, value in server.env().items():
+            monkeypatch.setenv(var, value)
+        assert resolve_url(OTC_RB_CONTRACT_HISTORY_URL).startswith(server.base_url)
+
+        session = make_session(cache_dir=str(tmp_path / "cache"), ttl=0)
+        df = fetch_otc_rb_contracts(session)
+        again = session.get(resolve_url(OTC_RB_CONTRACT_HISTORY_URL))
+        monkeypatch.setattr("time.sleep", lambda s: None)
+        html = fetch_rushing_html(2023)
+
+    assert df["player"].iloc[0] == "Christian McCaffrey"
+    assert again.from_cache  # revalidated with If-None-Match -> 304
+    assert server.counts[304] == 1
+    assert "Derrick Henry" in html
+
+
+def test_resilient_adapter_retries_throttling_and_errors():
+    from src.api.http import ResilientAdapter
+
+    fixtures = os.path.join(os.path.dirname(__file__), "fixtures")
+    with StandInServer(fixtures, error_rate=0.3, throttle_rate=0.3, retry_after=0, seed=3) as server:
+        adapter = ResilientAdapter(retries=8, backoff=0.001, rate=1000)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        for _ in range(10):
+            resp = session.get(server.base_url + "/apis/site/v2/sports/football/nfl/teams")
+            assert resp.status_code == 200
+
+    assert server.counts[429] > 0 and server.counts[500] > 0
+    assert server.counts[200] == 10
+    limiter = adapter.limiters[server.base_url.split("//")[1]]
+    assert limiter.min_rate <= limiter.rate <= limiter.max_rate
+
+
+def test_circuit_breaker_fails_fast_while_host_is_down():
+    from src.api.http import CircuitOpenError, ResilientAdapter
+
+    fixtures = os.path.join(os.path.dirname(__file__), "fixtures")
+    with StandInServer(fixtures, error_rate=1.0) as server:
+        adapter = ResilientAdapter(retries=2, backoff=0, breaker_threshold=3, breaker_reset=60)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        url = server.base_url + "/apis/site/v2/sports/football/nfl/teams"
+
+        assert session.get(url).status_code == 500  # 3 attempts, breaker opens
+        try:
+            session.get(url)
+        except CircuitOpenError:
+            pass
+        else:
+            raise AssertionError("expected the circuit to be open")
+
+    assert server.counts[500] == 3
+
+
+def test_circuit_breaker_trial_slot_is_released_on_unexpected_errors(monkeypatch):
+    from requests.adapters import HTTPAdapter
+
+    from src.api.http import ResilientAdapter
+
+    adapter = ResilientAdapter(retries=0, breaker_threshold=1, breaker_reset=0)
+    breaker, _ = adapter._host_state("example.invalid")
+    breaker.record(False)  # open; reset_after=0 so the next call is the half-open trial
+
+    def boom(self, request, **kwargs):
+        raise requests.exceptions.InvalidHeader("bad header")
+
+    monkeypatch.setattr(HTTPAdapter, "send", boom)
+    request = requests.Request("GET", "http://example.invalid/x").prepare()
+    for _ in range(2):
+        try:
+            adapter.send(request)
+        except requests.exceptions.InvalidHeader:
+            pass
+        else:
+            raise AssertionError("expected the error to propagate")
+    assert breaker.allow()  # not stuck with the trial slot taken
+
+
+def test_adaptive_rate_backs_off_and_recovers():
+    from src.api.http import AdaptiveRate
+
+    rate = AdaptiveRate(8.0, min_rate=1.0, max_rate=10.0, step=1.0)
+    for _ in range(5):
+        rate.record(False)
+    assert rate.rate == 1.0
+    for _ in range(20):
+        rate.record(True)
+    assert rate.rate == 10.0
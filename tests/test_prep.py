@@ -0,0 +1,211 @@
+import pandas as pd
+
+import prep_rushing_all
+
+
+def _write_rushing(tmp_path):
+    hist = tmp_path / "rushing_cleaned.csv"
+    hist.write_text(
+        "Unnamed: 0,Player,Pos,rAtt,rYds,Year\n"
+        "0,A,RB,200,900,2021\n"
+        "1,B,WR,90,400,2021\n"
+        "2,C,RB,69,300,2022\n"
+        "3,D,RB,70,310,2022\n"
+        "4,A,RB,150,700,2022\n"
+    )
+    r2024 = tmp_path / "rb_rushing_2024.csv"
+    r2024.write_text("Player,Pos,rAtt,rYds,Year\nE,RB,120,500,2024\nA,RB,75,250,2024\n")
+    return str(hist), str(r2024)
+
+
+def test_stream_rb70_matches_in_memory(tmp_path, monkeypatch):
+    hist, r2024 = _write_rushing(tmp_path)
+    monkeypatch.setattr(prep_rushing_all, "HISTORICAL_FILE", hist)
+    monkeypatch.setattr(prep_rushing_all, "R2024_FILE", r2024)
+
+    filtered, names = prep_rushing_all.filter_rb_70_plus(
+        prep_rushing_all.load_and_merge_rushing()
+    )
+
+    out, out_names = tmp_path / "rb70.csv", tmp_path / "names.csv"
+    n_rows, n_names = prep_rushing_all.stream_rb_70_plus(
+        sources=(hist, r2024), out_filtered=str(out), out_names=str(out_names), chunksize=2
+    )
+
+    streamed = pd.read_csv(out)
+    assert n_rows == len(filtered) == 5
+    assert streamed["Player"].tolist() == filtered["Player"].tolist() == ["A", "D", "A", "E", "A"]
+    streamed_names = pd.read_csv(out_names)
+    assert streamed_names.values.tolist() == names.astype(object).values.tolist()
+    assert n_names == len(names)
+
+
+def test_pipeline_passes_frames_and_skips_unchanged(tmp_path):
+    import run_pipeline
+
+    src = tmp_path / "src.csv"
+    src.write_text("x\n1\n2\n")
+    mid, out = str(tmp_path / "mid.csv"), str(tmp_path / "out.csv")
+    seen = []
+
+    def double(frames):
+        df = pd.read_csv(src)
+        return {mid: df * 2}
+
+    def total(frames):
+        seen.append(mid in frames)
+        df = frames[mid] if mid in frames else pd.read_csv(mid)
+        return {out: df.sum().to_frame().T}
+
+    stages = [
+        run_pipeline.Stage("total", [mid], [out], total),
+        run_pipeline.Stage("double", [str(src)], [mid], double),
+    ]
+    state = str(tmp_path / "state.json")
+
+    assert run_pipeline.run_pipeline(stages, state_file=state) == {"double": "ran", "total": "ran"}
+    assert pd.read_csv(out)["x"].tolist() == [6]
+    assert seen == [True]
+
+    assert set(run_pipeline.run_pipeline(stages, state_file=state).values()) == {"skipped"}
+
+    src.write_text("x\n5\n")
+    assert run_pipeline.run_pipeline(stages, state_file=state) == {"double": "ran", "total": "ran"}
+    assert pd.read_csv(out)["x"].tolist() == [10]
+
+
+def test_pipeline_shares_one_name_index(tmp_path, monkeypatch):
+    import prep_final_merge
+    import prep_otc_filter_rb70
+    import run_pipeline
+
+    names_file = tmp_path / "names.csv"
+    names_file.write_text("Player\nKenneth Walker III\nSaquon Barkley\n")
+    monkeypatch.setattr(prep_otc_filter_rb70, "NAMES_FILE", str(names_file))
+    run_pipeline._name_index.clear()
+
+    seen = []
+    filter_otc, merge_final = prep_otc_filter_rb70.filter_otc_for_rb70, prep_final_merge.merge_final
+
+    def spy_filter(*args, index=None, **kw):
+        seen.append(index)
+        return filter_otc(*args, index=index, **kw)
+
+    def spy_merge(*args, index=None, **kw):
+        seen.append(index)
+        return merge_final(*args, index=index, **kw)
+
+    monkeypatch.setattr(prep_otc_filter_rb70, "filter_otc_for_rb70", spy_filter)
+    monkeypatch.setattr(prep_final_merge, "merge_final", spy_merge)
+
+    otc = pd.DataFrame({"player": ["Kenneth Walker", "Someone Else"], "apy": [1.0, 2.0]})
+    filtered = run_pipeline._otc_filter({prep_otc_filter_rb70.OTC_RAW_FILE: otc})
+    merged = run_pipeline._final_merge(
+        {
+            prep_final_merge.RB70_FILE: pd.DataFrame({"Player": ["Kenneth Walker III"]}),
+            prep_final_merge.OTC_FILE: filtered[prep_otc_filter_rb70.OTC_FILTERED_FILE],
+        }
+    )
+    assert len(seen) == 2 and seen[0] is seen[1] and len(seen[0]) == 2
+    assert merged[prep_final_merge.OUT_FINAL]["apy"].tolist() == [1.0]
+
+
+def test_merge_final_joins_on_normalized_names():
+    import prep_final_merge
+    import prep_otc_filter_rb70
+
+    rb70 = pd.DataFrame({"Player": ["Kenneth Walker III", "Saquon Barkley"], "Year": [2023, 2023]})
+    otc = pd.DataFrame(
+        {"Player": ["Kenneth Walker", "Saquon Barkley", "Someone Else"], "apy": [1.0, 2.0, 3.0]}
+    )
+
+    filtered = prep_otc_filter_rb70.filter_otc_for_rb70(rb70, otc)
+    assert filtered["Player"].tolist() == ["Kenneth Walker", "Saquon Barkley"]
+
+    merged = prep_final_merge.merge_final(rb70, filtered)
+    assert merged["apy"].tolist() == [1.0, 2.0]
+    assert "player_norm" not in merged.columns and "player_id" not in merged.columns
+
+
+def test_fuzzy_filter_applies_season_window_per_contract():
+    import prep_otc_filter_rb70
+
+    rb70 = pd.DataFrame({"Player": ["Adrian Peterson"] * 2, "Year": [2008, 2012]})
+    otc = pd.DataFrame(
+        {
+            "player": ["Adrian Peterson", "Adrian Peterson", "Adrian Petersen"],
+            "year_signed": [2011, 2002, 2007],
+            "apy": [14.0, 0.5, 1.0],
+        }
+    )
+
+    matches = prep_otc_filter_rb70.match_otc_to_rb70(rb70, otc, window=3, threshold=0.4)
+    assert sorted(matches["query_year"].tolist()) == [2007, 2011]
+
+    filtered = prep_otc_filter_rb70.filter_otc_for_rb70(otc_df=otc, matches=matches)
+    assert filtered["year_signed"].tolist() == [2011, 2007]  # 2002: same name, other era
+    assert filtered["pfr_player"].tolist() == ["Adrian Peterson"] * 2
+
+    # a contract without a year is matched (and kept) on the name alone
+    undated = pd.concat(
+        [otc, pd.DataFrame({"player": ["Adrian Peterson"], "year_signed": [None], "apy": [2.0]})],
+        ignore_index=True,
+    )
+    matches = prep_otc_filter_rb70.match_otc_to_rb70(rb70, undated, window=3, threshold=0.4)
+    filtered = prep_otc_filter_rb70.filter_otc_for_rb70(otc_df=undated, matches=matches)
+    assert filtered["apy"].tolist() == [14.0, 1.0, 2.0]
+
+
+def test_merge_final_by_season_picks_contract_in_force():
+    import prep_final_merge
+
+    rb70 = pd.DataFrame(
+        {
+            "Player": ["A"] * 5 + ["B", "C"],
+            "Year": [2018, 2019, 2021, 2023, 2025, 2020, None],
+        }
+    )
+    otc = pd.DataFrame(
+        {
+            "player": ["A", "A", "A", "B"],
+            "year_signed": [2018, 2020, 2023, 2015],
+            "years": [2, 3, 1, 2],
+            "apy": [1.0, 2.0, 3.0, 9.0],
+        }
+    )
+
+    all_pairs = prep_final_merge.merge_final(rb70, otc)
+    assert len(all_pairs) == 5 * 3 + 1 + 1
+
+    merged = prep_final_merge.merge_final(rb70, otc, by_season=True)
+    assert merged["Player"].tolist() == rb70["Player"].tolist()
+    assert merged["apy"].iloc[:4].tolist() == [1.0, 1.0, 2.0, 3.0]
+    # 2025 is past A's last contract; B's expired in 2017; C has no Year
+    assert merged["apy"].iloc[4:].isna().all()
+
+
+def test_merge_final_by_season_falls_back_to_earlier_contract_in_force():
+    import prep_final_merge
+
+    rb70 = pd.DataFrame({"Player": ["A"] * 5, "Year": [2018, 2020, 2021, 2022, 2023]})
+    # a 5-year deal from 2018 and a one-season deal signed in 2020 on top of it
+    otc = pd.DataFrame(
+        {"player": ["A", "A"], "year_signed": [2018, 2020], "years": [5, 1], "apy": [5.0, 1.0]}
+    )
+
+    merged = prep_final_merge.merge_final(rb70, otc, by_season=True)
+    assert merged["Year"].tolist() == rb70["Year"].tolist()
+    assert merged["apy"].iloc[:4].tolist() == [5.0, 1.0, 5.0, 5.0]
+    assert pd.isna(merged["apy"].iloc[4])
+
+
+def test_merge_final_by_season_ignores_a_years_column_on_the_rb70_side():
+    import prep_final_merge
+
+    rb70 = pd.DataFrame({"Player": ["A", "A"], "Year": [2019, 2023], "years": [9, 9]})
+    otc = pd.DataFrame({"player": ["A"], "year_signed": [2019], "years": [1], "apy": [1.0]})
+
+    merged = prep_final_merge.merge_final(rb70, otc, by_season=True)
+    assert merged["apy"].iloc[0] == 1.0
+    assert pd.isna(merged["apy"].iloc[1])  # the one-year deal expired after 2019
+    assert merged["years"].tolist() == [9, 9] and merged["years_contract"].iloc[0] == 1
@@ -0,0 +1,156 @@
+import os
+import shutil
+
+import pandas as pd
+import requests
+
+from src.scrapers.otc_rb_contracts import (
+    _clean_money,
+    _clean_pct,
+    clean_money_series,
+    clean_pct_series,
+    fetch_otc_positions,
+    write_position_dataset,
+)
+from src.scrapers.pfr_import import import_directory
+from src.scrapers.pfr_rushing import parse_rushing_columns, parse_rushing_table
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "pfr")
+
+
+def _fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_lxml_parser_matches_bs4():
+    html = _fixture("rushing_2023.html")
+    rows = parse_rushing_table(html, 2023)
+    assert parse_rushing_table(html, 2023, engine="lxml") == rows
+    assert [r["Player"] for r in rows] == [
+        "Christian McCaffrey*+", "Derrick Henry*", "Travis Etienne", "Josh Jacobs",
+    ]
+    assert rows[0]["Yds"] == 1459 and rows[0]["Y/A"] == 5.4
+
+
+def test_lxml_parser_matches_bs4_on_short_rows():
+    html = _fixture("rushing_2023.html")
+    # cut the first player's row after the Age cell, as PFR does for some partial rows
+    start = html.index("<tr", html.index("<tbody"))
+    end = html.index("</tr>", start)
+    row = html[start:end]
+    cut = row.index("</td>", row.index('data-stat="age"')) + len("</td>")
+    html = html[:start] + row[:cut] + html[end:]
+
+    rows = parse_rushing_table(html, 2023)
+    assert parse_rushing_table(html, 2023, engine="lxml") == rows
+    assert "Yds" not in rows[0] and rows[0]["Season"] == 2023
+
+    cols = parse_rushing_columns(html, 2023)
+    assert str(cols["Yds"].dtype) == "Int64"
+    assert pd.isna(cols["Yds"][0]) and cols["Yds"][1] == rows[1]["Yds"]
+
+
+def test_lxml_parser_reads_commented_table():
+    cols = parse_rushing_columns(_fixture("rushing_2022_commented.html"), 2022)
+    assert cols["Att"].tolist() == [272, 280, 267, 233]
+    assert cols["Season"] == [2022] * 4
+
+
+def test_import_directory_writes_year_partitions(tmp_path):
+    src = tmp_path / "raw"
+    src.mkdir()
+    shutil.copy(os.path.join(FIXTURES, "rushing_2023.html"), src / "rushing_2023.html")
+    (src / "2021_rushing.csv").write_text(
+        ",,,,,,,Rushing,Rushing\n"
+        "Rk,Player,Tm,Age,Pos,G,GS,Att,Yds,TD,1D,Lng,Y/A,Y/G,Fmb\n"
+        "1,Jonathan Taylor*+,IND,22,RB,17,17,332,1811,18,91,83,5.5,106.5,4\n"
+        "Rk,Player,Tm,Age,Pos,G,GS,Att,Yds,TD,1D,Lng,Y/A,Y/G,Fmb\n"
+        "2,Najee Harris,PIT,23,RB,17,17,307,1200,7,62,37,3.9,70.6,0\n",
+        encoding="utf-8",
+    )
+
+    out = tmp_path / "dataset"
+    written = import_directory(str(src), str(out), workers=1)
+    assert written == {2021: 2, 2023: 4}
+
+    df = pd.read_parquet(out / "Year=2021" / "part-0.parquet")
+    assert df["Player"].tolist() == ["Jonathan Taylor", "Najee Harris"]
+    assert df["rYds"].tolist() == [1811, 1200]
+    assert str(df["rAtt"].dtype) == "Int16"
+
+    both = pd.read_parquet(out)
+    assert sorted(both["Year"].astype(int).unique()) == [2021, 2023]
+    assert "Christian McCaffrey" in both["Player"].astype(str).tolist()
+
+
+def test_vectorized_otc_cleaning_matches_row_wise():
+    money = pd.Series(["$32,700,000", " $1,250,000 ", "-", "—", None, "n/a", 1500], dtype=object)
+    expected = money.apply(_clean_money).astype(float)
+    pd.testing.assert_series_equal(clean_money_series(money), expected)
+
+    pct = pd.Series(["15.8%", "–", "0.9%", None], dtype=object)
+    pd.testing.assert_series_equal(clean_pct_series(pct), pct.apply(_clean_pct).astype(float))
+
+
+OTC_PAGE = """<table>
+<thead><tr><th>Player</th><th>Team</th><th>Year Signed</th><th>Years</th>
+<th>Value</th><th>APY</th><th>Guaranteed</th><th>APY as % Of Cap At Signing</th></tr></thead>
+<tbody><tr><td>{player}</td><td>{team}</td><td>2023</td><td>4</td>
+<td>$48,000,000</td><td>$12,000,000</td><td>-</td><td>5.3%</td></tr></tbody>
+</table>"""
+
+
+class _FakeOtcSession:
+    players = {
+        "running-back": ("Saquon Barkley", "PHI"),
+        "wide-receiver": ("Justin Jefferson", "MIN"),
+        "tight-end": ("Travis Kelce", "KC"),
+    }
+
+    def __init__(self):
+        self.urls = []
+
+    def get(self, url, **kw):
+        self.urls.append(url)
+        slug = url.rsplit("/", 1)[-1]
+        resp = requests.Response()
+        if slug in self.players:
+            player, team = self.players[slug]
+            resp.status_code = 200
+            resp._content = OTC_PAGE.format(player=player, team=team).encode("utf-8")
+        else:
+            resp.status_code = 404
+            resp._content = b""
+        resp.url = url
+        resp.encoding = "utf-8"
+        return resp
+
+
+def test_fetch_otc_positions_partitions_by_position(tmp_path):
+    session = _FakeOtcSession()
+    df = fetch_otc_positions(["RB", "WR", "TE", "QB"], concurrency=3, rate=100, session=session)
+
+    assert len(session.urls) == 4
+    assert df["position"].tolist() == ["RB", "WR", "TE"]  # QB page failed, skipped
+    assert df["apy"].tolist() == [12_000_000.0] * 3
+    assert df["guaranteed"].isna().all()
+
+    written = write_position_dataset(df, str(tmp_path / "otc"))
+    assert written == {"RB": 1, "TE": 1, "WR": 1}
+    wr = pd.read_parquet(tmp_path / "otc" / "position=WR" / "part-0.parquet")
+    assert wr["player"].tolist() == ["Justin Jefferson"]
+
+
+def test_single_position_csv_keeps_raw_schema(tmp_path):
+    import subprocess
+    import sys
+
+    from src.api.standin import StandInServer
+
+    out = tmp_path / "otc_rb_contracts_raw.csv"
+    cmd = [sys.executable, "-m", "src.scrapers.otc_rb_contracts", "--save", str(out)]
+    with StandInServer(os.path.dirname(FIXTURES)) as server:
+        subprocess.check_call(cmd, env={**os.environ, **server.env()})
+    df = pd.read_csv(out)
+    assert len(df) > 0 and "position" not in df.columns